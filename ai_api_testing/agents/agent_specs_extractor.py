@@ -1,5 +1,6 @@
 import asyncio
 from dataclasses import dataclass
+from functools import lru_cache
 
 from fastapi import FastAPI
 from pydantic_settings import BaseSettings
@@ -8,10 +9,10 @@ from ai_api_testing.agents.api_specs_agents.fastapi_extractor import (
     APIEndpoint,
     FastAPISpecsExtractor,
 )
+from ai_api_testing.agents.api_specs_agents.spec_cache import SpecCache
 from ai_api_testing.agents.api_specs_agents.swagger_extractor import SwaggerExtractor
 from ai_api_testing.utils.logger import logger
 from pydantic_ai import Agent, RunContext
-from pydantic_ai.models.openai import OpenAIModel
 
 
 class Settings(BaseSettings):
@@ -32,20 +33,39 @@ class Deps:
     app: FastAPI
 
 
-model = OpenAIModel("gpt-4o-mini", api_key=Settings().OPENAI_API_KEY)
+@lru_cache
+def get_settings() -> Settings:
+    """Environment settings, read on first use rather than at import time."""
+    return Settings()
 
-agent_specs_extractor = Agent(
-    model,
-    system_prompt=(
-        "You are an agent that extracts and analyzes API specifications"
-        "from a FastAPI app or from Swagger/OpenAPI specification. First try to find the json one time, and if not parse the docs available on the root path."
-    ),
-    deps_type=Deps,
-    retries=3,
-)
+
+@lru_cache
+def get_agent_specs_extractor() -> Agent:
+    """Build the specs extractor agent on first use, so importing this module needs no credentials."""
+    from pydantic_ai.models.openai import OpenAIModel
+
+    model = OpenAIModel("gpt-4o-mini", api_key=get_settings().OPENAI_API_KEY)
+    agent = Agent(
+        model,
+        system_prompt=(
+            "You are an agent that extracts and analyzes API specifications"
+            "from a FastAPI app or from Swagger/OpenAPI specification. First try to find the json one time, and if not parse the docs available on the root path."
+        ),
+        deps_type=Deps,
+        retries=3,
+    )
+    agent.tool(extract_fastapi_specs)
+    agent.tool(extract_swagger_specs)
+    return agent
+
+
+def __getattr__(name: str) -> Agent:
+    """Keep `agent_specs_extractor` importable, built on first access rather than at import time."""
+    if name == "agent_specs_extractor":
+        return get_agent_specs_extractor()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
-@agent_specs_extractor.tool
 async def extract_fastapi_specs(ctx: RunContext[Deps]) -> list[APIEndpoint]:
     """Extract the API specifications from a FastAPI application.
 
@@ -60,7 +80,6 @@ async def extract_fastapi_specs(ctx: RunContext[Deps]) -> list[APIEndpoint]:
     return FastAPISpecsExtractor().extract_specs(app=ctx.deps.app)
 
 
-@agent_specs_extractor.tool
 async def extract_swagger_specs(
     ctx: RunContext[Deps], url: str, endpoint_list: list[str] | None = None
 ) -> list[APIEndpoint]:
@@ -72,7 +91,7 @@ async def extract_swagger_specs(
         endpoint_list: The list of endpoints to extract. If None, all endpoints are extracted.
     """
     logger.info(f"Extracting Swagger/OpenAPI specification from {url}, endpoint_list: {endpoint_list}")
-    return await SwaggerExtractor().extract_endpoints(url, endpoint_list)
+    return await SwaggerExtractor(cache=SpecCache()).extract_endpoints(url, endpoint_list)
 
 
 async def main(url: str):
@@ -80,7 +99,7 @@ async def main(url: str):
     app = FastAPI()
 
     deps = Deps(app=app)
-    result = await agent_specs_extractor.run(
+    result = await get_agent_specs_extractor().run(
         f"""What is the request body for {url} endpoints?
         Try with the json and if not parse the docs available on {url} root path""",
         deps=deps,
@@ -1,3 +1,5 @@
+import hashlib
+import json
 from typing import Any
 
 from pydantic import BaseModel
@@ -10,3 +12,18 @@ class APIEndpoint(BaseModel):
     method: str
     request_body: dict[str, Any] | None = None
     response_schema: dict[str, Any] | None = None
+
+    @property
+    def key(self) -> str:
+        """Identifier of the operation, e.g. `GET /pets/{petId}`."""
+        return f"{self.method.upper()} {self.path}"
+
+    def content_hash(self) -> str:
+        """Hash of the path, method and schemas, stable across runs and key orderings."""
+        canonical = json.dumps(
+            [self.path, self.method.upper(), self.request_body, self.response_schema],
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str,
+        )
+        return hashlib.sha256(canonical.encode()).hexdigest()
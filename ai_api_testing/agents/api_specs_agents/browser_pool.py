@@ -0,0 +1,107 @@
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+from pydantic import BaseModel
+from typing_extensions import Self
+
+from ai_api_testing.utils.logger import logger
+
+# Resolves once the Swagger UI store holds the loaded spec, or reports a failed load
+SWAGGER_UI_SPEC_READY = """
+() => {
+    const ui = window.ui;
+    if (!ui || typeof ui.getState !== "function") return null;
+    const spec = ui.getState().get("spec");
+    if (!spec) return null;
+    if (spec.get("loadingStatus") === "failed") return {failed: true};
+    const json = spec.get("json");
+    if (!json || !json.size) return null;
+    return {spec: json.toJS()};
+}
+"""
+
+
+class BrowserPool(BaseModel):
+    """A headless Chromium shared across scrapes, with a limit on the pages open at once.
+
+    The browser is launched on first use and kept until `close`. Each page gets its own browser
+    context, which is cheap compared to a browser launch and keeps cookies and storage isolated.
+
+    Attributes:
+        max_pages: Maximum number of pages scraped concurrently.
+        ready_timeout: Timeout in seconds for a page to load its spec.
+    """
+
+    max_pages: int = 4
+    ready_timeout: float = 30.0
+
+    _playwright: Any = None
+    _browser: Any = None
+    _semaphore: asyncio.Semaphore | None = None
+    _launch_lock: asyncio.Lock | None = None
+
+    async def _launch(self) -> Any:
+        from playwright.async_api import async_playwright
+
+        self._playwright = await async_playwright().start()
+        return await self._playwright.chromium.launch()
+
+    async def _get_browser(self) -> Any:
+        if self._launch_lock is None:
+            self._launch_lock = asyncio.Lock()
+        async with self._launch_lock:
+            if self._browser is None or not self._browser.is_connected():
+                logger.info("Launching Chromium")
+                self._browser = await self._launch()
+        return self._browser
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[Any]:
+        """Yield a fresh page once one of the `max_pages` slots is free."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_pages)
+        async with self._semaphore:
+            browser = await self._get_browser()
+            context = await browser.new_context()
+            try:
+                yield await context.new_page()
+            finally:
+                await context.close()
+
+    async def scrape_swagger_ui_spec(self, url: str) -> dict[str, Any] | None:
+        """Return the spec loaded by the Swagger UI page at `url`, or None if it failed to load one.
+
+        Waits on the spec being present in the Swagger UI store rather than for a fixed delay.
+        """
+        from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+        async with self.page() as page:
+            await page.goto(url, wait_until="domcontentloaded")
+            try:
+                handle = await page.wait_for_function(SWAGGER_UI_SPEC_READY, timeout=self.ready_timeout * 1000)
+            except PlaywrightTimeoutError:
+                logger.error(f"No Swagger UI spec loaded at {url} after {self.ready_timeout}s")
+                return None
+            result = await handle.json_value()
+
+        if result.get("failed"):
+            logger.error(f"Swagger UI at {url} failed to load its spec")
+            return None
+        return result["spec"]
+
+    async def close(self) -> None:
+        """Close the browser, it is launched again on next use."""
+        browser, self._browser = self._browser, None
+        playwright, self._playwright = self._playwright, None
+        if browser is not None:
+            await browser.close()
+        if playwright is not None:
+            await playwright.stop()
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
@@ -0,0 +1,107 @@
+import asyncio
+import json
+import re
+import sys
+import time
+from collections.abc import Iterable
+from pathlib import Path
+from typing import IO
+
+from pydantic import BaseModel
+
+from ai_api_testing.agents.api_specs_agents.browser_pool import BrowserPool
+from ai_api_testing.agents.api_specs_agents.spec_cache import SpecCache
+from ai_api_testing.agents.api_specs_agents.swagger_extractor import SwaggerExtractor
+from ai_api_testing.utils.logger import logger
+
+# A `#` starts a comment at the start of a line or after whitespace, not within a URL fragment
+_COMMENT = re.compile(r"(?:^|\s)#.*")
+
+
+class ServiceReport(BaseModel):
+    """Outcome of the extraction of one service."""
+
+    source: str
+    endpoints: int = 0
+    seconds: float = 0.0
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def read_sources(path: str | Path) -> list[str]:
+    """Read the URLs or spec files to extract, one per line. Blank lines and `#` comments are skipped."""
+    text = sys.stdin.read() if str(path) == "-" else Path(path).read_text()
+    sources = (_COMMENT.sub("", line).strip() for line in text.splitlines())
+    return list(dict.fromkeys(source for source in sources if source))
+
+
+async def extract_many(
+    sources: Iterable[str],
+    output: IO[str],
+    concurrency: int = 8,
+    timeout: float = 120.0,
+    endpoint_list: list[str] | None = None,
+    cache: SpecCache | None = None,
+) -> list[ServiceReport]:
+    """Extract the endpoints of many services concurrently, streaming them to `output` as JSON lines.
+
+    All the extractions share one HTTP connection pool and one browser for the Swagger UI fallback. Each
+    endpoint is written as soon as its service is extracted, as `{"service": <source>, **endpoint}`.
+
+    Args:
+        sources: URLs, local spec files or `file://` URIs.
+        output: Text stream the JSON lines are written to.
+        concurrency: Maximum number of services extracted at once.
+        timeout: Timeout in seconds for each service.
+        endpoint_list: Optional endpoint selection applied to every service.
+        cache: Optional spec cache shared by all the services.
+
+    Returns:
+        One report per source, in the order of `sources`.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def extract(template: SwaggerExtractor, source: str) -> ServiceReport:
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                # Copies share the pooled session, browser and cache but keep their own parsed spec
+                endpoints = await asyncio.wait_for(
+                    template.model_copy().extract_endpoints(source, endpoint_list), timeout=timeout
+                )
+            except asyncio.TimeoutError:
+                return ServiceReport(
+                    source=source, seconds=time.perf_counter() - start, error=f"Timed out after {timeout}s"
+                )
+            except Exception as e:  # noqa: BLE001
+                return ServiceReport(
+                    source=source, seconds=time.perf_counter() - start, error=f"{type(e).__name__}: {e}"
+                )
+
+            for endpoint in endpoints:
+                output.write(json.dumps({"service": source, **endpoint.model_dump()}) + "\n")
+            output.flush()
+            report = ServiceReport(source=source, endpoints=len(endpoints), seconds=time.perf_counter() - start)
+            logger.info(f"Extracted {report.endpoints} endpoints from {source} in {report.seconds:.2f}s")
+            return report
+
+    pool = BrowserPool(max_pages=min(concurrency, 4))
+    async with pool, SwaggerExtractor(cache=cache, browser_pool=pool) as template:
+        return await asyncio.gather(*(extract(template, source) for source in sources))
+
+
+def log_summary(reports: list[ServiceReport]) -> None:
+    """Log the per-service timings, slowest first, and the failures."""
+    failed = [report for report in reports if not report.ok]
+    for report in sorted(reports, key=lambda report: report.seconds, reverse=True):
+        status = "ok" if report.ok else "FAILED"
+        logger.info(f"{report.seconds:8.2f}s {status:<6} {report.endpoints:>5} endpoints  {report.source}")
+    for report in failed:
+        logger.error(f"{report.source}: {report.error}")
+    logger.info(
+        f"{len(reports) - len(failed)}/{len(reports)} services extracted, "
+        f"{sum(report.endpoints for report in reports)} endpoints, {len(failed)} failures"
+    )
@@ -1,53 +1,170 @@
-from typing import Any
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Literal
+from weakref import WeakKeyDictionary
 
 from fastapi import FastAPI
-from pydantic import BaseModel
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, TypeAdapter
 
 from ai_api_testing.agents.api_specs_agents.base_extractor import APIEndpoint
+from ai_api_testing.agents.api_specs_agents.path_index import PathIndex
+from ai_api_testing.agents.api_specs_agents.ref_resolver import RefResolver
+from ai_api_testing.utils.logger import logger
+from ai_api_testing.utils.profiling import profile_region
+
+
+@dataclass
+class _AppSnapshot:
+    """The OpenAPI document of an app for a given route set, with its endpoints once parsed."""
+
+    routes: tuple
+    schema: dict[str, Any]
+    resolver: RefResolver
+    endpoints: list[APIEndpoint] | None = None
+
+
+# One snapshot per app, dropped with the app
+_SNAPSHOTS: WeakKeyDictionary[FastAPI, _AppSnapshot] = WeakKeyDictionary()
+
+
+def route_signature(app: FastAPI) -> tuple:
+    """Identify the route set of an app, cheap compared to generating its OpenAPI document."""
+    return tuple(
+        (type(route), getattr(route, "path", None), frozenset(getattr(route, "methods", None) or ()), id(route))
+        for route in app.routes
+    )
+
+
+def _build_model_schema(annotation: Any, mode: Literal["validation", "serialization"]) -> dict[str, Any]:
+    schema = TypeAdapter(annotation).json_schema(mode=mode)
+    defs = schema.pop("$defs", None)
+    return RefResolver({"$defs": defs}).resolve(schema) if defs else schema
+
+
+_cached_model_schema = lru_cache(maxsize=None)(_build_model_schema)
+
+
+def model_schema(annotation: Any, mode: Literal["validation", "serialization"] = "validation") -> dict[str, Any]:
+    """JSON schema of a body or response model with its `$defs` inlined, generated once per model."""
+    try:
+        return _cached_model_schema(annotation, mode)
+    except TypeError:
+        # Unhashable annotations cannot be cached
+        return _build_model_schema(annotation, mode)
+
+
+def _select_paths(paths: list[str], endpoint_list: list[str]) -> set[str]:
+    selected, missing = PathIndex.from_paths(paths).select_many(endpoint_list)
+    for pattern in missing:
+        logger.warning(f"Path {pattern} not found in the FastAPI app")
+    return set(selected)
 
 
 class FastAPISpecsExtractor(BaseModel):
-    """Agent for extracting OpenAPI specifications from FastAPI endpoints."""
+    """Agent for extracting OpenAPI specifications from FastAPI endpoints.
 
-    def extract_specs(self, app: FastAPI) -> list[APIEndpoint]:
-        """Extract API specifications from the FastAPI application."""
-        openapi_schema = app.openapi()
-        if not openapi_schema or "paths" not in openapi_schema:
-            return []
-        paths: dict[str, dict[str, Any]] = openapi_schema.get("paths")
+    The OpenAPI document of an app is generated once and kept, with its parsed endpoints, until the
+    app route set changes.
 
+    Attributes:
+        mode: `openapi` parses the app OpenAPI document. `routes` walks `app.routes` instead and only
+            generates the schemas of the selected routes models, so its cost does not depend on the
+            size of the app.
+    """
+
+    mode: Literal["openapi", "routes"] = "openapi"
+
+    @profile_region("spec.extract_fastapi")
+    def extract_specs(self, app: FastAPI, endpoint_list: list[str] | None = None) -> list[APIEndpoint]:
+        """Extract API specifications from the FastAPI application.
+
+        Args:
+            app: The FastAPI application.
+            endpoint_list: Optional selection of paths, as templates, concrete paths or globs.
+        """
+        if self.mode == "routes":
+            return self._extract_from_routes(app, endpoint_list)
+
+        endpoints = self._extract_from_openapi(app)
+        if endpoint_list:
+            selected = _select_paths(list(dict.fromkeys(endpoint.path for endpoint in endpoints)), endpoint_list)
+            endpoints = [endpoint for endpoint in endpoints if endpoint.path in selected]
+        return endpoints
+
+    def _extract_from_routes(self, app: FastAPI, endpoint_list: list[str] | None) -> list[APIEndpoint]:
+        """Build the endpoints from the route definitions, generating only the schemas of their models."""
+        routes = [route for route in app.routes if isinstance(route, APIRoute) and route.include_in_schema]
+        if endpoint_list:
+            selected = _select_paths([route.path_format for route in routes], endpoint_list)
+            routes = [route for route in routes if route.path_format in selected]
+
+        endpoints = []
+        for route in routes:
+            request_body = model_schema(route.body_field.type_, "validation") if route.body_field else None
+            if route.response_field is not None:
+                response_schema = model_schema(route.response_field.type_, "serialization")
+            else:
+                # Like in the OpenAPI document, a JSON response without model has an empty schema
+                response_schema = {} if route.status_code in (None, 200) else None
+            for method in sorted(route.methods):
+                endpoints.append(
+                    APIEndpoint(
+                        path=route.path_format,
+                        method=method,
+                        request_body=request_body,
+                        response_schema=response_schema,
+                    )
+                )
+        return endpoints
+
+    def _extract_from_openapi(self, app: FastAPI) -> list[APIEndpoint]:
+        snapshot = self._get_snapshot(app)
+        if snapshot.endpoints is not None:
+            return list(snapshot.endpoints)
+
+        paths: dict[str, dict[str, Any]] = snapshot.schema.get("paths") or {}
         endpoints: list[APIEndpoint] = []
         for path, path_info in paths.items():
             for method, operation in path_info.items():
                 endpoint = APIEndpoint(
                     path=path,
                     method=method.upper(),
-                    request_body=self._extract_request_body(operation, app),
-                    response_schema=self._extract_response_schema(operation),
+                    request_body=self._extract_request_body(operation, snapshot.resolver),
+                    response_schema=self._extract_response_schema(operation, snapshot.resolver),
                 )
                 endpoints.append(endpoint)
 
-        return endpoints
+        snapshot.endpoints = endpoints
+        return list(endpoints)
+
+    def _get_snapshot(self, app: FastAPI) -> _AppSnapshot:
+        """Return the OpenAPI snapshot of the app, regenerating it if its routes changed."""
+        routes = route_signature(app)
+        snapshot = _SNAPSHOTS.get(app)
+        if snapshot is None or snapshot.routes != routes:
+            if snapshot is not None:
+                logger.info("FastAPI routes changed, regenerating the OpenAPI schema")
+                # FastAPI caches the document on the app and would otherwise return the stale one
+                app.openapi_schema = None
+            schema = app.openapi() or {}
+            snapshot = _SNAPSHOTS[app] = _AppSnapshot(routes=routes, schema=schema, resolver=RefResolver(schema))
+        return snapshot
 
-    def _extract_request_body(self, operation: dict[str, Any], app: FastAPI) -> dict[str, Any] | None:
+    def _extract_request_body(self, operation: dict[str, Any], resolver: RefResolver) -> dict[str, Any] | None:
         """Extract request body schema from operation details."""
         try:
-            request_body = operation.get("requestBody", {})
+            request_body = resolver.resolve(operation.get("requestBody", {}))
             content = request_body.get("content", {}).get("application/json", {})
-            schema = content.get("schema", {})
-
-            if "$ref" in schema:
-                components = app.openapi()["components"]["schemas"]
-                return components[schema["$ref"].split("/")[-1]]
-            return schema or None
-        except (KeyError, AttributeError):
+            return resolver.resolve(content.get("schema", {})) or None
+        except (KeyError, AttributeError, ValueError):
             return None
 
-    def _extract_response_schema(self, operation: dict[str, Any]) -> dict[str, Any] | None:
+    def _extract_response_schema(self, operation: dict[str, Any], resolver: RefResolver) -> dict[str, Any] | None:
         """Extract response schema from operation details."""
         responses = operation.get("responses", {})
         if "200" in responses:
-            content = responses["200"].get("content", {})
+            content = resolver.resolve(responses["200"]).get("content", {})
             if "application/json" in content:
-                return content["application/json"].get("schema", {})
+                return resolver.resolve(content["application/json"].get("schema", {}))
         return None
@@ -0,0 +1,242 @@
+import json
+import mmap
+import os
+import re
+from collections.abc import Iterator, Mapping
+from pathlib import Path
+from typing import Any
+
+# Bytes of an in-memory document or the memory map of a file, indexed without decoding it as a whole
+Buffer = bytes | mmap.mmap
+
+_WHITESPACE = re.compile(rb"[ \t\n\r]*")
+_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_DECODER = json.JSONDecoder()
+# Bytes decoded to find the end of a value, grown until the value fits
+_MIN_WINDOW = 1024
+
+# Bumped when the persisted index format changes, e.g. from text to byte offsets
+INDEX_VERSION = 2
+
+# Which values of a spec are indexed (and decoded per entry on access) instead of decoded as a whole.
+# `paths` entries are operations, `components`/`definitions` entries are what `$ref`s point to.
+SPEC_LAYOUT: dict[str, Any] = {
+    "paths": {},
+    "components": {"*": {}},
+    "definitions": {},
+    "parameters": {},
+    "responses": {},
+}
+
+# A span is the [start, end) byte offsets of a value in the document, a nested dict is an indexed object
+Index = dict[str, Any]
+
+
+def _skip_whitespace(data: Buffer, pos: int) -> int:
+    return _WHITESPACE.match(data, pos).end()
+
+
+def _string_end(data: Buffer, pos: int) -> int:
+    found = _STRING.match(data, pos)
+    if found is None:
+        raise ValueError(f"Unterminated string at offset {pos}")
+    return found.end()
+
+
+def _decode_window(window: bytes) -> str:
+    try:
+        return window.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # The window may end within a multi-byte character
+        if e.start < len(window) - 3:
+            raise ValueError(f"Invalid UTF-8 in the JSON document: {e}") from e
+        return window[: e.start].decode("utf-8")
+
+
+def _skip_value(data: Buffer, pos: int) -> int:
+    """End offset of the JSON value starting at `pos`.
+
+    The value is parsed by the C decoder from a window of the document, grown until it holds the whole
+    value, so only that window is ever decoded.
+    """
+    size = _MIN_WINDOW
+    while True:
+        window = data[pos : pos + size]
+        text = _decode_window(window)
+        truncated = pos + size < len(data)
+        try:
+            end = _DECODER.raw_decode(text)[1]
+        except json.JSONDecodeError as e:
+            if not truncated:
+                raise ValueError(f"Invalid JSON value at offset {pos}: {e.msg}") from e
+            size *= 4
+            continue
+        # A number may continue past the window
+        if truncated and end == len(text):
+            size *= 4
+            continue
+        return pos + (end if window.isascii() else len(text[:end].encode("utf-8")))
+
+
+def _decode_key(data: Buffer, start: int, end: int) -> str:
+    raw = data[start:end]
+    return json.loads(raw) if b"\\" in raw else raw[1:-1].decode("utf-8")
+
+
+def _index_object(data: Buffer, pos: int, layout: Mapping[str, Any]) -> tuple[Index, int]:
+    """Index the members of the JSON object starting at `pos`, returning the index and the end offset.
+
+    Values are skipped one at a time, so only a single member is ever materialized.
+    """
+    if data[pos] != ord("{"):
+        raise ValueError(f"Expected a JSON object at offset {pos}")
+
+    entries: Index = {}
+    pos = _skip_whitespace(data, pos + 1)
+    if data[pos] == ord("}"):
+        return entries, pos + 1
+
+    while True:
+        if data[pos] != ord('"'):
+            raise ValueError(f"Expected a property name at offset {pos}")
+        end = _string_end(data, pos)
+        key = _decode_key(data, pos, end)
+        pos = _skip_whitespace(data, end)
+        if data[pos] != ord(":"):
+            raise ValueError(f"Expected ':' at offset {pos}")
+        pos = _skip_whitespace(data, pos + 1)
+
+        child_layout = layout.get(key, layout.get("*"))
+        if child_layout is not None and data[pos] == ord("{"):
+            child, end = _index_object(data, pos, child_layout)
+            entries[key] = {"span": [pos, end], "entries": child}
+        else:
+            end = _skip_value(data, pos)
+            entries[key] = [pos, end]
+
+        pos = _skip_whitespace(data, end)
+        if data[pos] == ord(","):
+            pos = _skip_whitespace(data, pos + 1)
+        elif data[pos] == ord("}"):
+            return entries, pos + 1
+        else:
+            raise ValueError(f"Expected ',' or '}}' at offset {pos}")
+
+
+class LazyJSONObject(Mapping[str, Any]):
+    """Read-only mapping over a JSON object of a document, decoding each member only when accessed.
+
+    Decoded members are kept, so repeated lookups (e.g. from the `$ref` resolver) share one object.
+
+    Args:
+        data: The whole document, as bytes or the memory map of its file.
+        entries: The offset index of this object members.
+    """
+
+    def __init__(self, data: Buffer, entries: Index):
+        self._data = data
+        self._entries = entries
+        self._values: dict[str, Any] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._values:
+            return self._values[key]
+        entry = self._entries[key]
+        if isinstance(entry, dict):
+            value = LazyJSONObject(self._data, entry["entries"])
+        else:
+            # Only the member span is copied out of the document
+            value = json.loads(self._data[entry[0] : entry[1]])
+        self._values[key] = value
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self._entries)!r})"
+
+    @property
+    def source(self) -> Buffer:
+        """The raw document this object is part of, e.g. to hash its content without decoding it."""
+        return self._data
+
+    @property
+    def materialized(self) -> int:
+        """Number of members decoded so far, nested indexed objects included."""
+        return sum(value.materialized if isinstance(value, LazyJSONObject) else 1 for value in self._values.values())
+
+
+def build_index(data: Buffer, layout: Mapping[str, Any] = SPEC_LAYOUT) -> Index:
+    """Build the byte offset index of a JSON spec document."""
+    start = _skip_whitespace(data, 0)
+    try:
+        entries, end = _index_object(data, start, layout)
+    except IndexError as e:
+        raise ValueError("Truncated JSON document") from e
+    if _skip_whitespace(data, end) != len(data):
+        raise ValueError(f"Extra data after the JSON document at offset {end}")
+    return entries
+
+
+def load_lazy_json(data: str | Buffer, index: Index | None = None) -> LazyJSONObject:
+    """Open a JSON spec document lazily.
+
+    Args:
+        data: The JSON document. Text is encoded to UTF-8, the offsets are byte offsets.
+        index: A previously built index of the same document, skipping the indexing pass.
+
+    Raises:
+        ValueError: If the document is not a JSON object.
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return LazyJSONObject(data, build_index(data) if index is None else index)
+
+
+def _map_file(path: Path) -> Buffer:
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        # The map outlives the file object and stays open as long as the spec references it
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def load_lazy_json_file(path: str | Path, index_path: str | Path | None = None) -> LazyJSONObject:
+    """Open a local JSON spec file lazily, through a memory map.
+
+    The document is never read as a whole: indexing scans the mapped pages, and only the members
+    accessed afterwards are copied and decoded, so the memory used grows with the selected endpoints
+    rather than with the size of the spec.
+
+    Args:
+        path: The JSON document.
+        index_path: Where to persist the offset index. It is reused while the file size and
+            modification time are unchanged, so reopening a large spec skips the indexing pass.
+    """
+    path = Path(path)
+    stat = path.stat()
+    fingerprint = [stat.st_size, stat.st_mtime_ns]
+    data = _map_file(path)
+
+    if index_path is not None:
+        index_path = Path(index_path)
+        try:
+            stored = json.loads(index_path.read_bytes())
+            if stored["fingerprint"] == fingerprint and stored.get("version") == INDEX_VERSION:
+                return load_lazy_json(data, stored["entries"])
+        except (OSError, ValueError, KeyError):
+            pass
+
+    spec = load_lazy_json(data)
+    if index_path is not None:
+        index_path.write_text(
+            json.dumps({"version": INDEX_VERSION, "fingerprint": fingerprint, "entries": spec._entries})
+        )
+    return spec
@@ -0,0 +1,255 @@
+import re
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from fnmatch import fnmatchcase
+from typing import Any
+from urllib.parse import unquote, urlparse
+
+from pydantic import BaseModel
+
+from ai_api_testing.agents.api_specs_agents.base_extractor import APIEndpoint
+
+_PARAM = re.compile(r"\{([^{}/]+)\}")
+_GLOB_CHARS = frozenset("*?[")
+
+
+def split_path(path: str) -> list[str]:
+    """Split a path or path template into its segments, keeping a trailing empty segment."""
+    return path.split("/")[1:] if path.startswith("/") else path.split("/")
+
+
+class _Node:
+    """Trie node, one per distinct template segment."""
+
+    __slots__ = ("children", "params", "patterns", "template")
+
+    def __init__(self):
+        # Keyed by the raw template segment, e.g. `pets` or `{petId}`, used by the glob selection
+        self.children: dict[str, _Node] = {}
+        # Segments that are a single parameter, tried after the literal ones when matching
+        self.params: list[tuple[str, _Node]] = []
+        # Segments mixing text and parameters such as `{name}.{ext}`, matched with a regex
+        self.patterns: list[tuple[re.Pattern[str], _Node]] = []
+        self.template: str | None = None
+
+
+@dataclass(slots=True)
+class PathMatch:
+    """A concrete request path matched to a spec path template."""
+
+    template: str
+    method: str | None
+    params: dict[str, str] = field(default_factory=dict)
+    value: Any = None
+
+
+class EndpointCoverage(BaseModel):
+    """How many times each spec operation was hit by a set of requests.
+
+    Attributes:
+        hits: Number of requests per operation, keyed as `METHOD /template`, including the ones never hit.
+        unmatched: Requests that do not correspond to any operation of the spec.
+    """
+
+    hits: dict[str, int]
+    unmatched: list[str] = []
+
+    @property
+    def covered(self) -> list[str]:
+        return [operation for operation, count in self.hits.items() if count]
+
+    @property
+    def uncovered(self) -> list[str]:
+        return [operation for operation, count in self.hits.items() if not count]
+
+    @property
+    def ratio(self) -> float:
+        return len(self.covered) / len(self.hits) if self.hits else 0.0
+
+
+class PathIndex:
+    """Trie over the path templates of a spec, built once and queried per request.
+
+    Templates are split into segments: literal ones are looked up by key, `{param}` ones capture any
+    segment. Concrete paths such as `/pets/42` are matched in time proportional to their number of
+    segments rather than to the number of paths of the spec. Literal segments win over parameters, so
+    `/pets/mine` matches `/pets/mine` before `/pets/{petId}`.
+
+    Each template can hold a value per HTTP method, e.g. the `APIEndpoint` parsed for the operation.
+    """
+
+    def __init__(self):
+        self._root = _Node()
+        self._operations: dict[str, dict[str, Any]] = {}
+
+    @classmethod
+    def from_paths(cls, paths: Iterable[str]) -> "PathIndex":
+        """Index path templates, e.g. the keys of a spec `paths` object, without their operations."""
+        index = cls()
+        for template in paths:
+            index.add(template)
+        return index
+
+    @classmethod
+    def from_endpoints(cls, endpoints: Iterable[APIEndpoint]) -> "PathIndex":
+        """Index parsed endpoints, each one stored as the value of its operation."""
+        index = cls()
+        for endpoint in endpoints:
+            index.add(endpoint.path, endpoint.method, endpoint)
+        return index
+
+    @property
+    def templates(self) -> list[str]:
+        """The indexed templates, in insertion order."""
+        return list(self._operations)
+
+    def operations(self, template: str) -> Mapping[str, Any]:
+        """The values of a template, keyed by upper-case method."""
+        return self._operations[template]
+
+    def add(self, template: str, method: str | None = None, value: Any = None) -> None:
+        """Add a path template, optionally with the value of one of its operations."""
+        if template not in self._operations:
+            node = self._root
+            for segment in split_path(template):
+                node = self._child(node, segment)
+            node.template = template
+            self._operations[template] = {}
+        if method is not None:
+            self._operations[template][method.upper()] = value
+
+    @staticmethod
+    def _child(node: _Node, segment: str) -> _Node:
+        if segment in node.children:
+            return node.children[segment]
+        child = node.children[segment] = _Node()
+
+        names = _PARAM.findall(segment)
+        if names and _PARAM.fullmatch(segment):
+            node.params.append((names[0], child))
+        elif names:
+            parts = _PARAM.split(segment)
+            # Odd parts are the parameter names, even ones the literal text around them
+            regex = "".join(f"(?P<{_group(part)}>.+?)" if i % 2 else re.escape(part) for i, part in enumerate(parts))
+            node.patterns.append((re.compile(regex), child))
+        return child
+
+    def match(self, path: str, method: str | None = None) -> PathMatch | None:
+        """Match a concrete path or URL to its template.
+
+        Args:
+            path: A request path such as `/pets/42?limit=1`, or a full URL.
+            method: If set, only templates with this operation match, and its value is returned.
+
+        Returns:
+            The matched template with its path parameters, or None if no template matches.
+        """
+        segments = [unquote(segment) for segment in split_path(urlparse(path).path or "/")]
+        method = method.upper() if method else None
+        found = self._match(self._root, segments, 0, {}, method)
+        if found is None and len(segments) > 1 and segments[-1] == "":
+            found = self._match(self._root, segments[:-1], 0, {}, method)
+        if found is None:
+            return None
+
+        template, params = found
+        value = self._operations[template].get(method) if method else None
+        return PathMatch(template=template, method=method, params=params, value=value)
+
+    def _match(
+        self, node: _Node, segments: list[str], position: int, params: dict[str, str], method: str | None
+    ) -> tuple[str, dict[str, str]] | None:
+        if position == len(segments):
+            if node.template is not None and (method is None or method in self._operations[node.template]):
+                return node.template, dict(params)
+            return None
+
+        segment = segments[position]
+        child = node.children.get(segment)
+        # Only backtrack into parameters when the literal branch does not lead to a template
+        if child is not None and (found := self._match(child, segments, position + 1, params, method)):
+            return found
+
+        for regex, child in node.patterns:
+            if groups := regex.fullmatch(segment):
+                captured = {_name(group): value for group, value in groups.groupdict().items()}
+                if found := self._match(child, segments, position + 1, {**params, **captured}, method):
+                    return found
+
+        if segment:
+            for name, child in node.params:
+                if found := self._match(child, segments, position + 1, {**params, name: segment}, method):
+                    return found
+        return None
+
+    def select(self, pattern: str) -> list[str]:
+        """Return the templates selected by a pattern, in insertion order.
+
+        The pattern can be a template (`/pets/{petId}`), a concrete path (`/pets/42`) or a glob where
+        `*` matches within a segment and `**` any number of segments, so `/pets/**` selects every path
+        under `/pets` (prefix selection) and `/*/{id}` every item path.
+        """
+        if pattern in self._operations:
+            return [pattern]
+        if not _GLOB_CHARS.intersection(pattern):
+            found = self.match(pattern)
+            return [found.template] if found else []
+
+        selected: set[str] = set()
+        self._glob(self._root, split_path(pattern), 0, selected)
+        return [template for template in self._operations if template in selected]
+
+    def select_many(self, patterns: Iterable[str]) -> tuple[list[str], list[str]]:
+        """Select the templates matched by any of the patterns.
+
+        Returns:
+            The selected templates in insertion order, and the patterns that selected nothing.
+        """
+        selected: set[str] = set()
+        missing = []
+        for pattern in patterns:
+            templates = self.select(pattern)
+            if not templates:
+                missing.append(pattern)
+            selected.update(templates)
+        return [template for template in self._operations if template in selected], missing
+
+    def _glob(self, node: _Node, pattern: list[str], position: int, selected: set[str]) -> None:
+        if position == len(pattern):
+            if node.template is not None:
+                selected.add(node.template)
+            return
+
+        segment = pattern[position]
+        if segment == "**":
+            self._glob(node, pattern, position + 1, selected)
+            for child in node.children.values():
+                self._glob(child, pattern, position, selected)
+        elif not _GLOB_CHARS.intersection(segment):
+            if segment in node.children:
+                self._glob(node.children[segment], pattern, position + 1, selected)
+        else:
+            for key, child in node.children.items():
+                if fnmatchcase(key, segment):
+                    self._glob(child, pattern, position + 1, selected)
+
+    def coverage(self, requests: Iterable[tuple[str, str]]) -> EndpointCoverage:
+        """Account which operations a set of `(method, path)` requests exercised."""
+        hits = {f"{method} {template}": 0 for template, operations in self._operations.items() for method in operations}
+        unmatched = []
+        for method, path in requests:
+            found = self.match(path, method)
+            if found is None:
+                unmatched.append(f"{method.upper()} {path}")
+            else:
+                hits[f"{found.method} {found.template}"] += 1
+        return EndpointCoverage(hits=hits, unmatched=unmatched)
+
+
+def _group(name: str) -> str:
+    # Regex group names must be identifiers, parameter names may contain `-` or `.`
+    return "p" + name.encode().hex()
+
+
+def _name(group: str) -> str:
+    return bytes.fromhex(group[1:]).decode()
@@ -0,0 +1,149 @@
+from collections.abc import Callable, Iterable, Mapping
+from pathlib import Path
+from typing import Any
+from urllib.parse import unquote, urljoin, urlparse
+
+from ai_api_testing.agents.api_specs_agents.spec_decoding import load_document_source
+from ai_api_testing.utils.logger import logger
+from ai_api_testing.utils.profiling import profile_region
+
+
+def load_local_document(uri: str) -> Any:
+    """Load a JSON/YAML document from a local path or `file://` URI."""
+    parsed = urlparse(uri)
+    if parsed.scheme not in ("", "file"):
+        raise ValueError(f"External reference to {uri} is not supported without a document loader")
+    try:
+        return load_document_source(Path(unquote(parsed.path)))
+    except OSError as e:
+        raise ValueError(f"Could not load the referenced document {uri}: {e}") from e
+
+
+def split_ref(ref: str) -> tuple[str, list[str]]:
+    """Split a reference into its document URI and its unescaped JSON pointer tokens."""
+    uri, _, fragment = ref.partition("#")
+    tokens = [unquote(token).replace("~1", "/").replace("~0", "~") for token in fragment.split("/")[1:]]
+    return uri, tokens
+
+
+def join_pointer(tokens: list[str]) -> str:
+    """JSON pointer fragment of unescaped tokens, the inverse of the fragment part of `split_ref`."""
+    return "".join(f"/{token.replace('~', '~0').replace('/', '~1')}" for token in tokens)
+
+
+class RefResolver:
+    """Resolve the `$ref`s of an OpenAPI/JSON schema document.
+
+    Each reference is resolved once and memoized, so a component reused across many operations is
+    shared instead of being resolved and copied again. Pointers of any depth are supported, as well as
+    references to other documents (`common.yaml#/components/schemas/Pet`), which are loaded once.
+    Subtrees without references are returned as is. A reference met again while it is still being
+    resolved (a self-referencing schema) is left as a `$ref` so the result stays finite. That placeholder
+    is relative (`#/...`) for the root document and absolute for other documents, so `lookup` resolves it.
+    A result is only memoized, and only reused, where none of the references it expands is being
+    resolved, so the result of a reference does not depend on the order references are resolved in.
+
+    Args:
+        document: The root document.
+        base_uri: Location of the root document, used to resolve references to other documents.
+        loader: Callable loading an external document from its absolute URI.
+    """
+
+    def __init__(
+        self,
+        document: Mapping[str, Any],
+        base_uri: str = "",
+        loader: Callable[[str], Any] = load_local_document,
+    ):
+        self.document = document
+        self.base_uri = base_uri
+        self.loader = loader
+        self._documents: dict[str, Any] = {base_uri: document}
+        # Resolved references by key, with the keys of all the references their resolution expanded
+        self._resolved: dict[str, tuple[Any, frozenset[str]]] = {}
+        # Keys of the references being resolved, outermost first, and of the references each one expanded
+        self._in_progress: list[str] = []
+        self._expanded: list[set[str]] = []
+
+    def lookup(self, ref: str, base_uri: str | None = None) -> Any:
+        """Return the target of a reference as is, without resolving the references it contains."""
+        uri, tokens = split_ref(ref)
+        base_uri = self.base_uri if base_uri is None else base_uri
+        return self._lookup(urljoin(base_uri, uri) if uri else base_uri, tokens, ref)
+
+    def resolve_ref(self, ref: str, base_uri: str | None = None) -> Any:
+        """Return the fully resolved target of a reference."""
+        base_uri = self.base_uri if base_uri is None else base_uri
+        uri, tokens = split_ref(ref)
+        document_uri = urljoin(base_uri, uri) if uri else base_uri
+        key = f"{'' if document_uri == self.base_uri else document_uri}#{join_pointer(tokens)}"
+
+        if key in self._in_progress:
+            logger.debug(f"Circular reference {ref} left unresolved")
+            self._note_expanded({key})
+            return {"$ref": key}
+        memoized = self._resolved.get(key)
+        # A memoized result expanding a reference being resolved would cut that cycle elsewhere
+        if memoized is not None and memoized[1].isdisjoint(self._in_progress):
+            self._note_expanded(memoized[1])
+            return memoized[0]
+
+        self._in_progress.append(key)
+        self._expanded.append({key})
+        try:
+            resolved = self._resolve_node(self._lookup(document_uri, tokens, ref), document_uri)
+        finally:
+            self._in_progress.pop()
+            expanded = frozenset(self._expanded.pop())
+        self._note_expanded(expanded)
+        if expanded.isdisjoint(self._in_progress):
+            self._resolved[key] = (resolved, expanded)
+        return resolved
+
+    def _note_expanded(self, keys: Iterable[str]) -> None:
+        if self._expanded:
+            self._expanded[-1].update(keys)
+
+    @profile_region("spec.resolve_refs")
+    def resolve(self, schema: Any, base_uri: str | None = None) -> Any:
+        """Return `schema` with all the nested references resolved."""
+        return self._resolve_node(schema, self.base_uri if base_uri is None else base_uri)
+
+    def _document(self, uri: str) -> Any:
+        if uri not in self._documents:
+            logger.info(f"Loading external document {uri}")
+            self._documents[uri] = self.loader(uri)
+        return self._documents[uri]
+
+    def _lookup(self, document_uri: str, tokens: list[str], ref: str) -> Any:
+        node = self._document(document_uri)
+        for token in tokens:
+            try:
+                node = node[int(token)] if isinstance(node, list) else node[token]
+            except (KeyError, IndexError, ValueError, TypeError) as e:
+                raise ValueError(f"Unresolvable reference: {ref}") from e
+        return node
+
+    def _resolve_node(self, node: Any, base_uri: str) -> Any:
+        if isinstance(node, Mapping):
+            if isinstance(node.get("$ref"), str):
+                target = self.resolve_ref(node["$ref"], base_uri)
+                if len(node) == 1:
+                    return target
+                # Sibling keywords (OpenAPI 3.1) refine the referenced schema
+                siblings = {k: self._resolve_node(v, base_uri) for k, v in node.items() if k != "$ref"}
+                return {**target, **siblings} if isinstance(target, Mapping) else target
+
+            resolved = {key: self._resolve_node(value, base_uri) for key, value in node.items()}
+            # Only copy the subtrees that actually contained references
+            if isinstance(node, dict) and all(resolved[key] is value for key, value in node.items()):
+                return node
+            return resolved
+
+        if isinstance(node, list):
+            resolved_items = [self._resolve_node(item, base_uri) for item in node]
+            if all(new is old for new, old in zip(resolved_items, node)):
+                return node
+            return resolved_items
+
+        return node
@@ -0,0 +1,119 @@
+import hashlib
+import json
+import os
+import tempfile
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+from ai_api_testing.agents.api_specs_agents.base_extractor import APIEndpoint
+from ai_api_testing.agents.api_specs_agents.spec_decoding import load_spec_source
+
+CACHE_DIR_ENV = "AI_API_TESTING_CACHE_DIR"
+
+
+def default_cache_dir() -> Path:
+    """Cache directory, overridable with the `AI_API_TESTING_CACHE_DIR` environment variable."""
+    if CACHE_DIR_ENV in os.environ:
+        return Path(os.environ[CACHE_DIR_ENV])
+    return Path.home() / ".cache" / "ai-api-testing" / "specs"
+
+
+class CachedSpec(BaseModel):
+    """Metadata of a cached OpenAPI document."""
+
+    url: str = Field(description="The URL the extraction was requested for")
+    spec_url: str = Field(description="The URL the spec document was actually downloaded from")
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Headers to revalidate the cached document with a conditional GET."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class SpecCache(BaseModel):
+    """Persistent on-disk cache of OpenAPI documents and their parsed endpoints, keyed by URL.
+
+    Each entry is stored as files named after the URL hash: the metadata (`.json`), the raw document
+    (`.spec`), its offset index (`.index.json`) and the parsed endpoints per endpoint selection
+    (`.endpoints.json`).
+
+    Attributes:
+        directory: Directory holding the cache entries.
+    """
+
+    directory: Path = Field(default_factory=default_cache_dir)
+
+    def _path(self, url: str, suffix: str) -> Path:
+        return self.directory / f"{hashlib.sha256(url.encode()).hexdigest()[:32]}{suffix}"
+
+    @staticmethod
+    def _selection_key(endpoint_list: list[str] | None) -> str:
+        return json.dumps(sorted(endpoint_list)) if endpoint_list else "*"
+
+    def _write(self, path: Path, data: bytes) -> None:
+        # Write to a temporary file unique to this writer, then rename, so that neither readers nor
+        # concurrent writers of the same entry ever see a partial file
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, prefix=f"{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    def load(self, url: str) -> CachedSpec | None:
+        """Return the cache entry metadata for a URL, if any and its document is still cached."""
+        try:
+            entry = CachedSpec.model_validate_json(self._path(url, ".json").read_bytes())
+        except (OSError, ValueError):
+            return None
+        # A document removed from the cache directory, e.g. by a partial cleanup, is a cache miss
+        return entry if self._path(url, ".spec").exists() else None
+
+    def store(self, entry: CachedSpec, raw: bytes) -> None:
+        """Store a freshly downloaded document, dropping the endpoints parsed from the previous one."""
+        self._write(self._path(entry.url, ".spec"), raw)
+        self._path(entry.url, ".endpoints.json").unlink(missing_ok=True)
+        self._path(entry.url, ".index.json").unlink(missing_ok=True)
+        self._write(self._path(entry.url, ".json"), entry.model_dump_json().encode())
+
+    def raw(self, url: str) -> bytes:
+        return self._path(url, ".spec").read_bytes()
+
+    def spec(self, url: str) -> Mapping[str, Any]:
+        """Load the cached document, lazily for JSON documents.
+
+        The offset index of a JSON document is persisted next to it, so parsing a new endpoint
+        selection only decodes the selected operations and the components they reference.
+        """
+        return load_spec_source(self._path(url, ".spec"), lazy_threshold=0, index_path=self._path(url, ".index.json"))
+
+    def _load_endpoints(self, url: str) -> dict[str, Any]:
+        try:
+            return json.loads(self._path(url, ".endpoints.json").read_bytes())
+        except (OSError, ValueError):
+            return {}
+
+    def endpoints(self, url: str, endpoint_list: list[str] | None = None) -> list[APIEndpoint] | None:
+        """Return the endpoints parsed for this selection from the cached document, if any."""
+        stored = self._load_endpoints(url).get(self._selection_key(endpoint_list))
+        if stored is None:
+            return None
+        return [APIEndpoint.model_validate(endpoint) for endpoint in stored]
+
+    def store_endpoints(self, url: str, endpoint_list: list[str] | None, endpoints: list[APIEndpoint]) -> None:
+        """Store the endpoints parsed for this selection next to the cached document."""
+        stored = self._load_endpoints(url)
+        stored[self._selection_key(endpoint_list)] = [endpoint.model_dump() for endpoint in endpoints]
+        self._write(self._path(url, ".endpoints.json"), json.dumps(stored).encode())
@@ -0,0 +1,131 @@
+import json
+import mmap
+import sys
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Literal
+from urllib.parse import unquote, urlparse
+
+import yaml
+
+from ai_api_testing.agents.api_specs_agents.lazy_spec import load_lazy_json, load_lazy_json_file
+
+try:  # Optional fast JSON decoder
+    import orjson
+
+    _json_loads = orjson.loads
+    JSON_BACKEND = "orjson"
+except ImportError:  # pragma: no cover
+    _json_loads = json.loads
+    JSON_BACKEND = "json"
+
+# LibYAML bindings are only available when PyYAML was built against libyaml
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Documents above this size are indexed lazily instead of fully decoded
+DEFAULT_LAZY_THRESHOLD = 1_000_000
+
+SpecFormat = Literal["json", "yaml"]
+
+STDIN_SOURCE = "-"
+
+
+def sniff_format(data: bytes | str) -> SpecFormat:
+    """Guess the spec format from the first significant character of the document."""
+    head = data[:64].decode("utf-8", errors="ignore") if isinstance(data, bytes | bytearray) else data[:64]
+    head = head.lstrip("\ufeff \t\r\n")
+    return "json" if head.startswith(("{", "[")) else "yaml"
+
+
+def _as_document(document: Any) -> Mapping[str, Any]:
+    if isinstance(document, Mapping):
+        return document
+    raise ValueError("The document is not a JSON or YAML mapping")
+
+
+def _as_spec(spec: Any) -> Mapping[str, Any]:
+    """Check a decoded document is a spec: a mapping with an `openapi` or `swagger` version and `paths`."""
+    if isinstance(spec, Mapping) and ("openapi" in spec or "swagger" in spec) and "paths" in spec:
+        return spec
+    raise ValueError("The document is not an OpenAPI/Swagger specification")
+
+
+def decode_spec(data: bytes | str, lazy: bool = False) -> Mapping[str, Any]:
+    """Decode an OpenAPI document, whatever the content type it was served with.
+
+    Args:
+        data: The raw document.
+        lazy: Index a JSON document instead of decoding it, see `load_lazy_json`.
+
+    Raises:
+        ValueError: If the document is not a JSON or YAML OpenAPI/Swagger specification.
+    """
+    try:
+        if sniff_format(data) == "json":
+            if lazy:
+                return _as_spec(load_lazy_json(bytes(data) if isinstance(data, bytearray) else data))
+            return _as_spec(_json_loads(data))
+        return _as_spec(yaml.load(data, Loader=YAML_LOADER))
+    except (yaml.YAMLError, UnicodeDecodeError) as e:
+        raise ValueError(f"Could not decode the specification: {e}") from e
+
+
+def is_local_source(source: str) -> bool:
+    """Whether `source` is stdin, a `file://` URI or an existing local path rather than a URL."""
+    if source == STDIN_SOURCE or source.startswith("file://"):
+        return True
+    return urlparse(source).scheme in ("", "file") and Path(source).exists()
+
+
+def local_source_path(source: str | Path) -> Path:
+    """Path of a local spec source given as a path or a `file://` URI."""
+    return Path(unquote(urlparse(str(source)).path)) if str(source).startswith("file://") else Path(source)
+
+
+def local_source_uri(source: str | Path) -> str:
+    """Absolute `file://` URI of a local spec source, the base of its relative `$ref`s. Empty for stdin."""
+    return "" if source == STDIN_SOURCE else local_source_path(source).resolve().as_uri()
+
+
+def load_spec_source(
+    source: str | Path,
+    lazy_threshold: int = DEFAULT_LAZY_THRESHOLD,
+    index_path: str | Path | None = None,
+) -> Mapping[str, Any]:
+    """Load a spec from a local path, a `file://` URI or stdin (`-`).
+
+    Files are read through a memory map. JSON files larger than `lazy_threshold` bytes are indexed
+    lazily, optionally persisting the index to `index_path`.
+
+    Raises:
+        ValueError: If the document is not a JSON or YAML OpenAPI/Swagger specification.
+    """
+    if source == STDIN_SOURCE:
+        return decode_spec(sys.stdin.buffer.read())
+    return _as_spec(load_document_source(source, lazy_threshold, index_path))
+
+
+def load_document_source(
+    source: str | Path,
+    lazy_threshold: int = DEFAULT_LAZY_THRESHOLD,
+    index_path: str | Path | None = None,
+) -> Mapping[str, Any]:
+    """Load a JSON or YAML mapping from a local path or `file://` URI, e.g. a document `$ref`s point to.
+
+    Same as `load_spec_source`, without requiring the document to be a whole specification.
+    """
+    path = local_source_path(source)
+    size = path.stat().st_size
+    if size == 0:
+        raise ValueError(f"Empty specification file: {path}")
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        spec_format = sniff_format(mapped[:64])
+        if spec_format == "json" and size > lazy_threshold:
+            return load_lazy_json_file(path, index_path=index_path)
+        try:
+            if spec_format == "json":
+                return _as_document(_json_loads(memoryview(mapped) if JSON_BACKEND == "orjson" else mapped[:]))
+            return _as_document(yaml.load(mapped, Loader=YAML_LOADER))
+        except yaml.YAMLError as e:
+            raise ValueError(f"Could not decode the specification {path}: {e}") from e
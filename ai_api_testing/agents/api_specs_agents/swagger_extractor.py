@@ -1,20 +1,79 @@
 import argparse
 import asyncio
-import json
+from collections.abc import AsyncIterator, Mapping
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from typing import Any
 
 import aiohttp
-import yaml
 from pydantic import BaseModel
+from typing_extensions import Self
 
 from ai_api_testing.agents.api_specs_agents.base_extractor import APIEndpoint
+from ai_api_testing.agents.api_specs_agents.browser_pool import BrowserPool
+from ai_api_testing.agents.api_specs_agents.path_index import PathIndex
+from ai_api_testing.agents.api_specs_agents.ref_resolver import RefResolver
+from ai_api_testing.agents.api_specs_agents.spec_cache import CachedSpec, SpecCache
+from ai_api_testing.agents.api_specs_agents.spec_decoding import (
+    DEFAULT_LAZY_THRESHOLD,
+    decode_spec,
+    is_local_source,
+    load_spec_source,
+    local_source_uri,
+)
 from ai_api_testing.utils.logger import logger
+from ai_api_testing.utils.profiling import profile_region
 
 
-class SwaggerExtractor(BaseModel):
-    """Extract API endpoints from a Swagger/OpenAPI specification."""
+@dataclass
+class FetchedSpec:
+    """A spec document downloaded over HTTP, with its cache validators."""
+
+    url: str
+    spec: Mapping[str, Any]
+    raw: bytes
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+COMMON_SPEC_PATHS = [
+    "",
+    "/openapi.json",
+    "/swagger.json",
+    "/api-docs",
+    "/api-docs.json",
+    "/swagger/v1/swagger.json",
+]
 
-    _spec: dict | None = None
+
+class SwaggerExtractor(BaseModel):
+    """Extract API endpoints from a Swagger/OpenAPI specification.
+
+    Attributes:
+        probe_timeout: Timeout in seconds for each candidate spec path request.
+        discovery_timeout: Overall timeout in seconds for the spec discovery.
+        cache: Optional on-disk spec cache. When set, a previously downloaded spec is revalidated with a
+            single conditional GET instead of being downloaded and parsed again.
+        lazy_threshold: JSON documents larger than this many bytes are indexed and decoded per
+            operation instead of decoded as a whole.
+        browser_pool: Optional browser pool for the Swagger UI scraping fallback, shared across
+            extractions. Without it each scrape launches and closes its own browser.
+    """
+
+    probe_timeout: float = 10.0
+    discovery_timeout: float = 30.0
+    cache: SpecCache | None = None
+    lazy_threshold: int = DEFAULT_LAZY_THRESHOLD
+    browser_pool: BrowserPool | None = None
+
+    _spec: Mapping[str, Any] | None = None
+    _fetched: FetchedSpec | None = None
+    # Location of a spec not fetched over HTTP, relative references resolve against it
+    _base_uri: str = ""
+    _resolver: RefResolver | None = None
+    _path_index: PathIndex | None = None
+    _path_index_spec: Mapping[str, Any] | None = None
+    _session: aiohttp.ClientSession | None = None
 
     async def extract_endpoints(
         self,
@@ -25,74 +84,229 @@ class SwaggerExtractor(BaseModel):
         """Extract API endpoints from an OpenAPI documentation URL.
 
         Args:
-            url: URL to the OpenAPI documentation
-            endpoint_list: List of endpoints to extract. If None, all endpoints are extracted.
+            url: URL to the OpenAPI documentation, or a local spec file, `file://` URI or `-` for stdin
+            endpoint_list: List of endpoints to extract: path templates, concrete paths (`/pets/42`) or globs
+                (`/pets/**`). If None, all endpoints are extracted.
             try_direct_access: If True, try to directly access the OpenAPI spec from common paths.
 
         Returns:
             List of APIEndpoint objects containing endpoint information
         """
-        if try_direct_access and await self._try_direct_spec_access(url):
-            logger.info("Direct access successful, reading the JSON/YAML spec")
-            return self._parse_spec(endpoint_list)
+        if is_local_source(url):
+            logger.info(f"Loading local spec {url}")
+            # Decoding and parsing a large spec would block the event loop, and the other extractions
+            return await asyncio.to_thread(self._extract_from_local_source, url, endpoint_list)
+
+        async with self._session_scope() as session:
+            if self.cache is not None:
+                endpoints = await self._extract_from_cache(url, endpoint_list, session)
+                if endpoints is not None:
+                    return endpoints
+
+            if try_direct_access and await self._try_direct_spec_access(url, session):
+                logger.info("Direct access successful, reading the JSON/YAML spec")
+                if self.cache is not None:
+                    return self._store_in_cache(url, endpoint_list, self._fetched)
+                return self._parse_spec(endpoint_list)
 
         logger.info("Direct access failed, trying scraping")
         return await self._scrape_and_parse_spec(url, endpoint_list)
 
-    async def _try_direct_spec_access(self, url: str) -> bool:
-        """Try to directly access OpenAPI spec from common paths."""
-        common_paths = [
-            "",
-            "/openapi.json",
-            "/swagger.json",
-            "/api-docs",
-            "/api-docs.json",
-            "/swagger/v1/swagger.json",
-        ]
-
-        async with aiohttp.ClientSession() as session:
-            for path in common_paths:
-                full_url = f"{url.rstrip('/')}{path}"
-
-                try:
-                    response = await session.get(full_url)  # TODO: fix. It was easier mocking this vs nested context
-                    logger.info(f"Response status: {response.status}")
-                    logger.info(f"Response text: {response.text}")
-                except aiohttp.ClientError as e:
-                    logger.error(f"Error fetching {full_url}: {e}")
-                    continue
+    def _extract_from_local_source(self, source: str, endpoint_list: list[str] | None) -> list[APIEndpoint]:
+        self._spec = load_spec_source(source, lazy_threshold=self.lazy_threshold)
+        self._fetched = None
+        self._base_uri = local_source_uri(source)
+        return self._parse_spec(endpoint_list)
 
-                if response.status != 200:
-                    logger.error(f"Received non-200 status code {response.status} from {full_url}")
-                    response.close()
-                    continue
-
-                if response.content_type != "application/json":
-                    logger.info("Content type is not application/json")
-                    response.close()
-                    continue
-
-                # Try to parse as JSON
-                try:
-                    logger.info(f"Parsing JSON from {full_url}")
-                    self._spec = await response.json()
-                    logger.info(f"Parsed JSON from {full_url}")
-                    response.close()
-                    return True
-                except (json.JSONDecodeError, aiohttp.ContentTypeError):
-                    # If JSON fails, try YAML
-                    try:
-                        text = await response.text()
-                        logger.info(f"Parsing YAML from {full_url}")
-                        self._spec = yaml.safe_load(text)
-                        response.close()
-                        return True
-                    except (yaml.YAMLError, aiohttp.ContentTypeError) as e:
-                        response.close()
-                        logger.error(f"Error parsing YAML from {full_url}: {e}")
+    async def _try_direct_spec_access(self, url: str, session: aiohttp.ClientSession | None = None) -> bool:
+        """Try to directly access OpenAPI spec from common paths.
+
+        All the candidate paths are probed concurrently, but the valid spec of the earliest candidate in
+        `COMMON_SPEC_PATHS` order wins: a later one is only accepted once every earlier probe failed.
+        The remaining probes are then cancelled.
+        """
+        candidates = [f"{url.rstrip('/')}{path}" for path in COMMON_SPEC_PATHS]
+
+        async with self._session_scope(session) as scoped:
+            probes = [asyncio.create_task(self._probe_spec(scoped, full_url)) for full_url in candidates]
+            deadline = asyncio.get_running_loop().time() + self.discovery_timeout
+            try:
+                # Index of the earliest candidate that did not fail yet
+                first = 0
+                while first < len(probes):
+                    if not probes[first].done():
+                        remaining = deadline - asyncio.get_running_loop().time()
+                        pending = [probe for probe in probes[first:] if not probe.done()]
+                        done, _ = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                        if not done:
+                            logger.error(f"Spec discovery timed out after {self.discovery_timeout}s for {url}")
+                            return False
                         continue
-            return False
+                    fetched = probes[first].result()
+                    if fetched is not None:
+                        self._spec = fetched.spec
+                        self._fetched = fetched
+                        return True
+                    first += 1
+            finally:
+                for probe in probes:
+                    probe.cancel()
+                await asyncio.gather(*probes, return_exceptions=True)
+        return False
+
+    async def _probe_spec(self, session: aiohttp.ClientSession, full_url: str) -> FetchedSpec | None:
+        """Fetch and parse a candidate spec URL, returning None if it is not a valid spec."""
+        try:
+            return await asyncio.wait_for(self._fetch_spec(session, full_url), timeout=self.probe_timeout)
+        except asyncio.TimeoutError:
+            logger.error("Timed out fetching {} after {}s", full_url, self.probe_timeout)
+        except aiohttp.ClientError as e:
+            logger.error("Error fetching {}: {}", full_url, e)
+        return None
+
+    async def _fetch_spec(self, session: aiohttp.ClientSession, full_url: str) -> FetchedSpec | None:
+        response = await session.get(full_url)  # TODO: fix. It was easier mocking this vs nested context
+        try:
+            logger.info("Response status: {} from {}", response.status, full_url)
+
+            if response.status != 200:
+                logger.error("Received non-200 status code {} from {}", response.status, full_url)
+                return None
+
+            data = await self._read_spec(response, full_url)
+            if data is None:
+                return None
+            spec, raw = data
+            return FetchedSpec(
+                url=full_url,
+                spec=spec,
+                raw=raw,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+        finally:
+            response.close()
+
+    async def _read_spec(
+        self, response: aiohttp.ClientResponse, full_url: str
+    ) -> tuple[Mapping[str, Any], bytes] | None:
+        """Decode the body of a spec response, returning the spec and the raw document.
+
+        The format is sniffed from the body rather than trusted from the content type, as specs are
+        often served as `text/plain` or `application/octet-stream`.
+        """
+        try:
+            raw = await response.read()
+        except aiohttp.ClientError as e:
+            logger.error("Error reading {}: {}", full_url, e)
+            return None
+
+        try:
+            return decode_spec(raw, lazy=len(raw) > self.lazy_threshold), raw
+        except ValueError as e:
+            logger.error("Error decoding the spec from {}: {}", full_url, e)
+            return None
+
+    async def _extract_from_cache(
+        self, url: str, endpoint_list: list[str] | None, session: aiohttp.ClientSession | None = None
+    ) -> list[APIEndpoint] | None:
+        """Revalidate the cached spec for `url` with a conditional GET.
+
+        Returns the cached endpoints on a 304, the freshly parsed ones on a 200 and None when the cache
+        cannot be used, so the caller falls back to a full discovery.
+        """
+        entry = self.cache.load(url)
+        if entry is None:
+            return None
+
+        async with self._session_scope(session) as scoped:
+            try:
+                response = await asyncio.wait_for(
+                    scoped.get(entry.spec_url, headers=entry.conditional_headers()), timeout=self.probe_timeout
+                )
+            except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+                logger.warning(f"Could not revalidate cached spec {entry.spec_url}: {e}")
+                return None
 
+            try:
+                if response.status == 304:
+                    logger.info(f"Cached spec for {url} is up to date")
+                    endpoints = self.cache.endpoints(url, endpoint_list)
+                    if endpoints is None:
+                        try:
+                            self._spec = self.cache.spec(url)
+                        except (OSError, ValueError) as e:
+                            logger.warning(f"Could not load the cached spec for {url}: {e}")
+                            return None
+                        endpoints = self._parse_spec(endpoint_list)
+                        self.cache.store_endpoints(url, endpoint_list, endpoints)
+                    return endpoints
+
+                if response.status != 200:
+                    logger.warning(f"Received status code {response.status} revalidating {entry.spec_url}")
+                    return None
+
+                data = await self._read_spec(response, entry.spec_url)
+                if data is None:
+                    return None
+                self._spec, raw = data
+                return self._store_in_cache(
+                    url,
+                    endpoint_list,
+                    FetchedSpec(
+                        url=entry.spec_url,
+                        spec=self._spec,
+                        raw=raw,
+                        etag=response.headers.get("ETag"),
+                        last_modified=response.headers.get("Last-Modified"),
+                    ),
+                )
+            finally:
+                response.close()
+
+    def _store_in_cache(self, url: str, endpoint_list: list[str] | None, fetched: FetchedSpec) -> list[APIEndpoint]:
+        """Parse the loaded spec and store both the raw document and the endpoints in the cache."""
+        endpoints = self._parse_spec(endpoint_list)
+        self.cache.store(
+            CachedSpec(url=url, spec_url=fetched.url, etag=fetched.etag, last_modified=fetched.last_modified),
+            fetched.raw,
+        )
+        self.cache.store_endpoints(url, endpoint_list, endpoints)
+        return endpoints
+
+    @asynccontextmanager
+    async def _session_scope(
+        self, session: aiohttp.ClientSession | None = None
+    ) -> AsyncIterator[aiohttp.ClientSession]:
+        """Yield `session`, else the pooled session opened by `__aenter__`, else a session owned by the scope.
+
+        The scope's own session is never stored on the extractor, so concurrent extractions on an extractor
+        that was not entered do not close each other's session.
+        """
+        if session is not None:
+            yield session
+            return
+        if self._session is not None:
+            yield self._session
+            return
+
+        session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.discovery_timeout))
+        try:
+            yield session
+        finally:
+            await session.close()
+
+    async def __aenter__(self) -> Self:
+        """Keep a single pooled session open across several extractions."""
+        self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.discovery_timeout))
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        if self._session is not None:
+            session, self._session = self._session, None
+            await session.close()
+
+    @profile_region("spec.parse")
     def _parse_spec(self, endpoint_list: list[str] | None = None) -> list[APIEndpoint]:
         """Parse loaded OpenAPI spec into endpoints."""
         if not self._spec:
@@ -104,12 +318,10 @@ class SwaggerExtractor(BaseModel):
 
         paths_to_parse = paths
         if endpoint_list:
-            paths_to_parse: dict[str, dict[str, Any]] = {}
-            for i in endpoint_list:
-                if i in paths:
-                    paths_to_parse[i] = paths[i]
-                else:
-                    logger.warning(f"Path {i} not found in OpenAPI specification")
+            selected, missing = self._get_path_index().select_many(endpoint_list)
+            for pattern in missing:
+                logger.warning(f"Path {pattern} not found in OpenAPI specification")
+            paths_to_parse = {path: paths[path] for path in selected}
 
         endpoints = []
         for path, path_info in paths_to_parse.items():
@@ -127,36 +339,18 @@ class SwaggerExtractor(BaseModel):
 
     async def _scrape_and_parse_spec(self, url: str, endpoint_list: list[str] | None = None) -> list[APIEndpoint]:
         """Scrape and parse OpenAPI spec from Swagger UI page using browser automation."""
-        from playwright.async_api import async_playwright
-
-        async with async_playwright() as p:
-            browser = await p.chromium.launch()
-            try:
-                page = await browser.new_page()
-                await page.goto(url)
-                await page.wait_for_selector("#swagger-ui")
-                # Wait a bit more to ensure the spec is fully loaded
-                await page.wait_for_timeout(2000)
-
-                # Extract the spec from the window object
-                spec_json = await page.evaluate(
-                    """
-                    () => {
-                        const dom = document.querySelector('.swagger-ui')
-                        if (!dom) return null;
-                        // Access the spec from the Swagger UI's Redux store
-                        const specSelectors = window.ui.getState().get('spec').toJS();
-                        return specSelectors.json;
-                    }
-                """
-                )
-
-                if spec_json:
-                    self._spec = spec_json
-                    return self._parse_spec(endpoint_list)
-
-            finally:
-                await browser.close()
+        pool = self.browser_pool or BrowserPool(max_pages=1)
+        try:
+            spec_json = await pool.scrape_swagger_ui_spec(url)
+        finally:
+            if pool is not self.browser_pool:
+                await pool.close()
+
+        if spec_json:
+            self._spec = spec_json
+            self._fetched = None
+            self._base_uri = ""
+            return self._parse_spec(endpoint_list)
 
         raise ValueError("Could not extract OpenAPI specification from Swagger UI")
 
@@ -165,21 +359,16 @@ class SwaggerExtractor(BaseModel):
         try:
             # Handle OpenAPI 3.0 style requestBody
             if "requestBody" in operation:
-                request_body = operation["requestBody"]
+                request_body = self._get_resolver().resolve(operation["requestBody"])
                 content = request_body.get("content", {}).get("application/json", {})
                 schema = content.get("schema", {})
-                if "$ref" in schema:
-                    return self._resolve_reference(schema["$ref"])
-                return schema or None
+                return self._get_resolver().resolve(schema) or None
 
             # Handle Swagger/OpenAPI 2.0 style parameters
-            parameters = operation.get("parameters", [])
+            parameters = self._get_resolver().resolve(operation.get("parameters", []))
             for param in parameters:
                 if param.get("in") == "body":
-                    schema = param.get("schema", {})
-                    if "$ref" in schema:
-                        return self._resolve_reference(schema["$ref"])
-                    return schema
+                    return self._get_resolver().resolve(param.get("schema", {}))
                 elif param.get("in") == "query":
                     query_params = {}
                     for p in parameters:
@@ -208,43 +397,29 @@ class SwaggerExtractor(BaseModel):
 
             return None
 
+        except ValueError as e:
+            logger.warning(f"Could not resolve the request body: {e}")
+            return None
         except (KeyError, AttributeError):
             return None
 
-    def _resolve_reference(self, ref: str) -> dict[str, Any]:
-        """Resolve a JSON reference in the OpenAPI spec recursively."""
-
-        def _resolve_nested_refs(schema: dict[str, Any]) -> dict[str, Any]:
-            if not isinstance(schema, dict):
-                return schema
-
-            resolved = schema.copy()
-
-            # Handle direct reference
-            if "$ref" in resolved:
-                ref_parts = resolved["$ref"].split("/")
-                if ref_parts[1] == "definitions":
-                    resolved = self._spec["definitions"][ref_parts[2]].copy()
-                elif ref_parts[1] == "components":
-                    resolved = self._spec["components"]["schemas"][ref_parts[2]].copy()
+    def _get_path_index(self) -> PathIndex:
+        """Return the path template index of the loaded spec, built once per spec."""
+        if self._path_index is None or self._path_index_spec is not self._spec:
+            self._path_index = PathIndex.from_paths(self._spec.get("paths", {}))
+            self._path_index_spec = self._spec
+        return self._path_index
 
-            # Recursively resolve nested references
-            for key, value in resolved.items():
-                if isinstance(value, dict):
-                    resolved[key] = _resolve_nested_refs(value)
-                elif isinstance(value, list):
-                    resolved[key] = [_resolve_nested_refs(item) if isinstance(item, dict) else item for item in value]
+    def _get_resolver(self) -> RefResolver:
+        """Return the reference resolver of the loaded spec, shared by all its operations."""
+        if self._resolver is None or self._resolver.document is not self._spec:
+            base_uri = self._fetched.url if self._fetched is not None else self._base_uri
+            self._resolver = RefResolver(self._spec, base_uri=base_uri)
+        return self._resolver
 
-            return resolved
-
-        parts = ref.split("/")
-        if parts[1] == "definitions":  # OpenAPI 2.0
-            initial_schema = self._spec["definitions"][parts[2]]
-        elif parts[1] == "components":  # OpenAPI 3.0
-            initial_schema = self._spec["components"]["schemas"][parts[2]]
-        else:
-            raise ValueError(f"Unsupported reference format: {ref}")
-        return _resolve_nested_refs(initial_schema)
+    def _resolve_reference(self, ref: str) -> dict[str, Any]:
+        """Resolve a JSON reference in the OpenAPI spec recursively."""
+        return self._get_resolver().resolve_ref(ref)
 
 
 if __name__ == "__main__":
@@ -252,7 +427,7 @@ if __name__ == "__main__":
     parser.add_argument(
         "--url",
         default="https://petstore.swagger.io",
-        help="URL to the OpenAPI documentation",
+        help="URL to the OpenAPI documentation, or a local spec file, file:// URI or - for stdin",
     )
     parser.add_argument("--endpoints", nargs="+", help="Optional list of specific endpoints to extract")
     parser.add_argument(
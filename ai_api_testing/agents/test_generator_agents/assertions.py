@@ -0,0 +1,146 @@
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+import numpy as np
+
+from ai_api_testing.core.models import TestCase
+from ai_api_testing.utils.logger import logger
+
+# Keys of `TestCase.expected_output_json` holding the expected class
+CLASS_KEYS = ("class", "prediction", "label")
+CHECKS = ("class", "probability", "range", "monotonic")
+
+
+class CompiledAssertions:
+    """The expectations of a batch of test cases compiled into one array per parameter.
+
+    Rows follow the model input rows, a case with a list `input_json` spanning several of them. Supported
+    `expected_output_json` keys:
+
+    - `class` (or `prediction`, `label`): the exact expected prediction.
+    - `min_probability` / `max_probability`: bounds of the probability of `probability_class`, by default
+      the expected class when its index is known, else the last (positive) class.
+    - `min` / `max`: bounds of the prediction value, e.g. of a regression.
+    - `greater_than_case` / `less_than_case`: the name of another case whose prediction this one must be
+      at least / at most, for monotonic relations between cases.
+
+    Unknown keys are ignored, so free-form expected outputs are simply not checked.
+    """
+
+    def __init__(self, expectations: Sequence[Mapping[str, Any] | None], case_rows: Mapping[str, int] | None = None):
+        n = len(expectations)
+        self.n_rows = n
+        self.expected_class = np.full(n, None, dtype=object)
+        self.has_class = np.zeros(n, dtype=bool)
+        self.probability_class = np.full(n, -1, dtype=np.int64)
+        self.min_probability = np.full(n, np.nan)
+        self.max_probability = np.full(n, np.nan)
+        self.min_value = np.full(n, np.nan)
+        self.max_value = np.full(n, np.nan)
+        self.reference_row = np.full(n, -1, dtype=np.int64)
+        self.direction = np.zeros(n, dtype=np.int8)
+
+        case_rows = case_rows or {}
+        for i, expected in enumerate(expectations):
+            if expected:
+                self._compile_row(i, expected, case_rows)
+
+    def _compile_row(self, i: int, expected: Mapping[str, Any], case_rows: Mapping[str, int]) -> None:
+        for key in CLASS_KEYS:
+            if expected.get(key) is not None:
+                self.expected_class[i] = expected[key]
+                self.has_class[i] = True
+                break
+
+        probability_class = expected.get("probability_class")
+        if probability_class is None and self.has_class[i] and isinstance(self.expected_class[i], int | np.integer):
+            probability_class = self.expected_class[i]
+        if probability_class is not None:
+            self.probability_class[i] = int(probability_class)
+        for key, array in (
+            ("min_probability", self.min_probability),
+            ("max_probability", self.max_probability),
+            ("min", self.min_value),
+            ("max", self.max_value),
+        ):
+            if isinstance(expected.get(key), int | float):
+                array[i] = expected[key]
+
+        for key, direction in (("greater_than_case", 1), ("less_than_case", -1)):
+            reference = expected.get(key)
+            if reference is None:
+                continue
+            if reference not in case_rows:
+                logger.warning(f"Expected output refers to unknown case {reference}")
+                continue
+            self.reference_row[i] = case_rows[reference]
+            self.direction[i] = direction
+
+    @property
+    def has_probability(self) -> np.ndarray:
+        return ~(np.isnan(self.min_probability) & np.isnan(self.max_probability))
+
+    def evaluate(self, predictions: np.ndarray, probabilities: np.ndarray | None = None) -> dict[str, np.ndarray]:
+        """Grade every row at once.
+
+        Args:
+            predictions: The `predict` output, one value per row.
+            probabilities: The `(n_rows, n_classes)` `predict_proba` output, needed by probability checks.
+
+        Returns:
+            A boolean pass column per check, True when the row has no such expectation, and `passed`.
+        """
+        predictions = np.asarray(predictions).reshape(self.n_rows)
+        columns: dict[str, np.ndarray] = {}
+
+        # Object comparison, so string labels and numbers are both supported
+        columns["class_passed"] = ~self.has_class | (predictions.astype(object) == self.expected_class)
+
+        if probabilities is not None and self.n_rows:
+            probabilities = np.asarray(probabilities, dtype=float).reshape(self.n_rows, -1)
+            column = np.where(self.probability_class < 0, probabilities.shape[1] - 1, self.probability_class)
+            p = probabilities[np.arange(self.n_rows), np.clip(column, 0, probabilities.shape[1] - 1)]
+            columns["probability_passed"] = _within(p, self.min_probability, self.max_probability)
+        else:
+            if self.has_probability.any():
+                logger.warning("Probability expectations are not checked without predict_proba outputs")
+            columns["probability_passed"] = np.ones(self.n_rows, dtype=bool)
+
+        values = _as_float(predictions)
+        columns["range_passed"] = _within(values, self.min_value, self.max_value)
+
+        has_reference = self.reference_row >= 0
+        reference_values = values[np.where(has_reference, self.reference_row, 0)] if self.n_rows else values
+        with np.errstate(invalid="ignore"):
+            columns["monotonic_passed"] = ~has_reference | (self.direction * (values - reference_values) >= 0)
+
+        columns["passed"] = np.logical_and.reduce([columns[f"{check}_passed"] for check in CHECKS])
+        return columns
+
+
+def _within(values: np.ndarray, low: np.ndarray, high: np.ndarray) -> np.ndarray:
+    with np.errstate(invalid="ignore"):
+        return (np.isnan(low) | (values >= low)) & (np.isnan(high) | (values <= high))
+
+
+def _as_float(values: np.ndarray) -> np.ndarray:
+    try:
+        return values.astype(float)
+    except (TypeError, ValueError):
+        # Non numeric predictions (e.g. string labels) have no range nor order
+        return np.full(len(values), np.nan)
+
+
+def compile_assertions(test_cases: Sequence[TestCase]) -> CompiledAssertions:
+    """Compile the `expected_output_json` of test cases, one row per input row."""
+    expectations: list[Mapping[str, Any] | None] = []
+    case_rows: dict[str, int] = {}
+    for test_case in test_cases:
+        case_rows.setdefault(test_case.name, len(expectations))
+        n_rows = len(test_case.input_rows())
+        expected = test_case.expected_output_json
+        if isinstance(expected, list) and len(expected) == n_rows:
+            expectations.extend(expected)
+        else:
+            expectations.extend([expected if isinstance(expected, Mapping) else None] * n_rows)
+    return CompiledAssertions(expectations, case_rows)
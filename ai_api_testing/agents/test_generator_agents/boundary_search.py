@@ -0,0 +1,272 @@
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass
+
+import numpy as np
+
+from ai_api_testing.agents.test_generator_agents.executor import Predictable
+from ai_api_testing.core.models import TestCase
+from ai_api_testing.utils.logger import logger
+
+
+@dataclass
+class BoundaryResult:
+    """Decision boundary crossings, each bracketed by a point on either side.
+
+    Attributes:
+        feature_names: The input columns.
+        lower: `(m, n_features)` points on the side of the starting point of each crossing.
+        upper: `(m, n_features)` points on the other side.
+        feature: Index of the feature each crossing was searched along, -1 for multi-feature directions.
+        label_lower: The label (class, or score above the threshold) of the lower points.
+        label_upper: The label of the upper points.
+        calls: Number of model calls the search took.
+    """
+
+    feature_names: list[str]
+    lower: np.ndarray
+    upper: np.ndarray
+    feature: np.ndarray
+    label_lower: np.ndarray
+    label_upper: np.ndarray
+    calls: int = 0
+
+    def __len__(self) -> int:
+        return len(self.lower)
+
+    @property
+    def points(self) -> np.ndarray:
+        """The boundary points, halfway between both sides."""
+        return (self.lower + self.upper) / 2
+
+    @property
+    def width(self) -> np.ndarray:
+        """Distance between both sides of each crossing."""
+        return np.linalg.norm(self.upper - self.lower, axis=1)
+
+
+class BoundarySearch:
+    """Finds where a model decision changes with batched bisection.
+
+    Every round evaluates all the open brackets in one model call, so the number of calls depends on
+    the precision, not on the number of points or features searched.
+
+    Args:
+        model: The model under test.
+        feature_names: The input columns, in the order the model expects them.
+        predict_proba: Use `predict_proba` scores instead of `predict` classes.
+        threshold: Decision threshold on the score. If None, boundaries are changes of the predicted class.
+        output_column: Column of a 2D output the threshold applies to, by default the last one.
+        seed: Seed of the random directions of `explore`.
+    """
+
+    def __init__(
+        self,
+        model: Predictable,
+        feature_names: list[str],
+        predict_proba: bool = False,
+        threshold: float | None = None,
+        output_column: int = -1,
+        seed: int | None = None,
+    ):
+        if predict_proba and threshold is None:
+            raise ValueError("A threshold is needed to find boundaries of predict_proba scores")
+        self.model = model
+        self.feature_names = feature_names
+        self.predict_proba = predict_proba
+        self.threshold = threshold
+        self.output_column = output_column
+        self.rng = np.random.default_rng(seed)
+        self.calls = 0
+
+    def labels(self, x: np.ndarray) -> np.ndarray:
+        """The label of every row, in a single model call."""
+        self.calls += 1
+        func = self.model.predict_proba if self.predict_proba else self.model.predict
+        y = np.asarray(func(x))
+        if y.ndim == 2:
+            y = y[:, self.output_column]
+        return y >= self.threshold if self.threshold is not None else y
+
+    def bisect(
+        self,
+        lower: np.ndarray,
+        upper: np.ndarray,
+        label_lower: np.ndarray,
+        label_upper: np.ndarray,
+        rounds: int = 20,
+        tol: float = 0.0,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Shrink brackets whose ends have different labels, all of them in one call per round.
+
+        Args:
+            lower: Points with label `label_lower`.
+            upper: Points with label `label_upper`, a different one.
+            label_lower: The labels of `lower`.
+            label_upper: The labels of `upper`.
+            rounds: Maximum number of halvings.
+            tol: Stop once every bracket is shorter than this.
+
+        Returns:
+            The shrunk brackets and the labels of their upper ends.
+        """
+        lower, upper, label_upper = lower.copy(), upper.copy(), label_upper.copy()
+        for _ in range(rounds):
+            if not len(lower) or np.linalg.norm(upper - lower, axis=1).max() <= tol:
+                break
+            middle = (lower + upper) / 2
+            labels = self.labels(middle)
+            same = labels == label_lower
+            lower[same] = middle[same]
+            upper[~same] = middle[~same]
+            label_upper[~same] = labels[~same]
+        return lower, upper, label_upper
+
+    def scan(
+        self,
+        anchors: np.ndarray,
+        ranges: Mapping[str, tuple[float, float]] | None = None,
+        features: list[str] | None = None,
+        grid: int = 32,
+        rounds: int = 20,
+        tol: float = 0.0,
+    ) -> BoundaryResult:
+        """Find the crossings along each feature, starting from every anchor point.
+
+        Each feature of each anchor is first swept over a grid of its range in a single call, then the
+        grid cells where the label changes are bisected.
+
+        Args:
+            anchors: `(n, n_features)` starting points, e.g. sampled with `PopulationSampler`.
+            ranges: `(min, max)` per feature, by default the range of the anchors.
+            features: The features to search along, by default all of them.
+            grid: Points of the initial sweep per feature.
+            rounds: Bisection rounds.
+            tol: Bracket length at which the bisection stops.
+        """
+        if not len(anchors):
+            return self._empty_result()
+        start_calls = self.calls
+        columns = [self.feature_names.index(name) for name in features or self.feature_names]
+        low, high = self._ranges(anchors, ranges)
+
+        # (n anchors, k features, grid) sweep, flattened into one matrix
+        n, k = len(anchors), len(columns)
+        steps = np.linspace(0, 1, grid)
+        sweep = np.repeat(anchors[:, None, None, :], k, axis=1).repeat(grid, axis=2)
+        for f, column in enumerate(columns):
+            sweep[:, f, :, column] = low[column] + steps * (high[column] - low[column])
+        labels = self.labels(sweep.reshape(-1, anchors.shape[1])).reshape(n, k, grid)
+
+        anchor, f, t = np.nonzero(labels[:, :, :-1] != labels[:, :, 1:])
+        lower, upper, label_upper = self.bisect(
+            sweep[anchor, f, t], sweep[anchor, f, t + 1], labels[anchor, f, t], labels[anchor, f, t + 1], rounds, tol
+        )
+        result = BoundaryResult(
+            feature_names=self.feature_names,
+            lower=lower,
+            upper=upper,
+            feature=np.asarray(columns, dtype=int)[f],
+            label_lower=labels[anchor, f, t],
+            label_upper=label_upper,
+            calls=self.calls - start_calls,
+        )
+        logger.info(f"Found {len(result)} boundary crossings in {result.calls} model calls")
+        return result
+
+    def explore(
+        self,
+        points: np.ndarray,
+        ranges: Mapping[str, tuple[float, float]] | None = None,
+        directions: int = 8,
+        radius: float = 0.1,
+        rounds: int = 20,
+        tol: float = 0.0,
+    ) -> BoundaryResult:
+        """Find more crossings around known boundary points, along random multi-feature directions.
+
+        Args:
+            points: Points near the boundary, e.g. `BoundaryResult.points`.
+            ranges: `(min, max)` per feature, also the scale of the directions.
+            directions: Random directions per point.
+            radius: Half length of each segment, as a fraction of the feature ranges.
+            rounds: Bisection rounds.
+            tol: Bracket length at which the bisection stops.
+        """
+        if not len(points):
+            # e.g. `scan` found no crossing, with a constant model or a range narrower than the boundary
+            logger.info("No boundary points to explore around")
+            return self._empty_result()
+        start_calls = self.calls
+        low, high = self._ranges(points, ranges)
+        offsets = self.rng.normal(size=(len(points) * directions, points.shape[1]))
+        offsets *= radius * (high - low) / np.linalg.norm(offsets, axis=1, keepdims=True)
+        centers = np.repeat(points, directions, axis=0)
+        ends = np.clip(np.concatenate([centers - offsets, centers + offsets]), low, high)
+
+        labels = self.labels(ends)
+        m = len(centers)
+        crossing = labels[:m] != labels[m:]
+        lower, upper, label_upper = self.bisect(
+            ends[:m][crossing], ends[m:][crossing], labels[:m][crossing], labels[m:][crossing], rounds, tol
+        )
+        return BoundaryResult(
+            feature_names=self.feature_names,
+            lower=lower,
+            upper=upper,
+            feature=np.full(len(lower), -1),
+            label_lower=labels[:m][crossing],
+            label_upper=label_upper,
+            calls=self.calls - start_calls,
+        )
+
+    def _empty_result(self) -> BoundaryResult:
+        empty = np.empty((0, len(self.feature_names)))
+        return BoundaryResult(
+            feature_names=self.feature_names,
+            lower=empty,
+            upper=empty.copy(),
+            feature=np.empty(0, dtype=int),
+            label_lower=np.empty(0),
+            label_upper=np.empty(0),
+        )
+
+    def _ranges(self, x: np.ndarray, ranges: Mapping[str, tuple[float, float]] | None) -> tuple[np.ndarray, np.ndarray]:
+        low, high = x.min(axis=0).astype(float), x.max(axis=0).astype(float)
+        for name, (feature_low, feature_high) in (ranges or {}).items():
+            column = self.feature_names.index(name)
+            low[column], high[column] = feature_low, feature_high
+        return low, high
+
+    def iter_test_cases(
+        self, result: BoundaryResult, path: str = "/predict", method: str = "POST"
+    ) -> Iterator[TestCase]:
+        """Turn every crossing into a pair of test cases, one on each side, expecting their labels."""
+        for i in range(len(result)):
+            name = self.feature_names[result.feature[i]] if result.feature[i] >= 0 else "multi-feature"
+            for side, x, label in (
+                ("below", result.lower[i], result.label_lower[i]),
+                ("above", result.upper[i], result.label_upper[i]),
+            ):
+                yield TestCase(
+                    name=f"boundary {name} {i} {side}",
+                    description=f"Input just {side} a decision boundary along {name}",
+                    path=path,
+                    method=method,
+                    input_json=dict(zip(self.feature_names, x.tolist())),
+                    expected_output_prompt=None,
+                    expected_output_json=self._expected(label),
+                    preconditions=None,
+                )
+
+    def _expected(self, label: object) -> dict[str, object]:
+        """The expected output of a side, in the format `CompiledAssertions` grades."""
+        label = label.item() if isinstance(label, np.generic) else label
+        if self.threshold is None:
+            return {"class": label}
+        bound = "min" if label else "max"
+        if not self.predict_proba:
+            return {bound: self.threshold}
+        expected: dict[str, object] = {f"{bound}_probability": self.threshold}
+        if self.output_column >= 0:
+            expected["probability_class"] = self.output_column
+        return expected
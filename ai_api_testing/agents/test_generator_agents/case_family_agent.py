@@ -18,6 +18,7 @@ def create_test_case_family_agent(name: str) -> Agent:
     """Create a test case family agent."""
     return Agent(
         "openai:gpt-4o-mini",
+        defer_model_check=True,
         name=name,
         retries=1,
         result_type=list[TestCaseFami],
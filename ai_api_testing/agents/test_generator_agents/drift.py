@@ -0,0 +1,200 @@
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+import numpy as np
+from pydantic import BaseModel
+
+from ai_api_testing.agents.test_generator_agents.executor import encode_inputs
+from ai_api_testing.agents.test_generator_agents.sampler import FeatureSpec, features_from_stats
+from ai_api_testing.core.models import TestCase
+from ai_api_testing.utils.logger import logger
+
+# Conventional PSI level above which a distribution is considered shifted
+PSI_DRIFT_THRESHOLD = 0.2
+# Smallest probability used in the PSI logarithms, for empty bins
+_PSI_EPSILON = 1e-4
+
+
+class FeatureSketch:
+    """Mergeable one-pass summary of a numeric feature.
+
+    Values are counted in a histogram over fixed edges, with one underflow and one overflow bin, along
+    with moments and extremes. Sketches built over the same edges merge by adding their counts, so
+    shards summarized by parallel workers combine exactly.
+    """
+
+    __slots__ = ("counts", "edges", "max", "min", "missing", "n", "sum", "sum_sq")
+
+    def __init__(self, edges: np.ndarray):
+        self.edges = np.asarray(edges, dtype=float)
+        self.counts = np.zeros(len(self.edges) + 1, dtype=np.int64)
+        self.n = 0
+        self.missing = 0
+        self.sum = 0.0
+        self.sum_sq = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values: np.ndarray) -> None:
+        """Add a batch of values, NaNs are counted as missing."""
+        values = np.asarray(values, dtype=float)
+        nan = np.isnan(values)
+        self.missing += int(nan.sum())
+        values = values[~nan]
+        if not len(values):
+            return
+        bins = np.searchsorted(self.edges, values, side="right")
+        # The upper edge closes the last bin
+        bins[values == self.edges[-1]] = len(self.edges) - 1
+        self.counts += np.bincount(bins, minlength=len(self.counts))
+        self.n += len(values)
+        self.sum += float(values.sum())
+        self.sum_sq += float(np.square(values).sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+    def merge(self, other: "FeatureSketch") -> "FeatureSketch":
+        """Add the counts of a sketch over the same edges into this one."""
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("Only sketches over the same edges can be merged")
+        self.counts += other.counts
+        self.n += other.n
+        self.missing += other.missing
+        self.sum += other.sum
+        self.sum_sq += other.sum_sq
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def mean(self) -> float | None:
+        return self.sum / self.n if self.n else None
+
+    @property
+    def std(self) -> float | None:
+        if not self.n:
+            return None
+        return float(np.sqrt(max(self.sum_sq / self.n - (self.sum / self.n) ** 2, 0.0)))
+
+    def quantile(self, q: float) -> float | None:
+        """Approximate quantile, interpolated within the histogram bins."""
+        if not self.n:
+            return None
+        inner = self.counts[1:-1]
+        cumulative = np.concatenate([[self.counts[0]], self.counts[0] + np.cumsum(inner)]) / self.n
+        return float(np.clip(np.interp(q, cumulative, self.edges), self.min, self.max))
+
+
+class FeatureDrift(BaseModel):
+    """Comparison of a sketched feature with its training distribution."""
+
+    feature: str
+    n: int
+    missing: int
+    mean: float | None
+    std: float | None
+    min: float | None
+    max: float | None
+    psi: float
+    ks: float
+    out_of_range: float
+    bin_coverage: float
+
+    @property
+    def drifted(self) -> bool:
+        return self.psi > PSI_DRIFT_THRESHOLD
+
+
+class DriftSketch:
+    """Streaming coverage and drift check of model inputs against training statistics.
+
+    The histogram edges of every feature are the training quantiles, so each bin holds the same
+    training mass and the comparison only needs the sketch counts.
+
+    Args:
+        features: The training marginals, e.g. from `features_from_stats`.
+        bins: Histogram bins per feature within the training range.
+    """
+
+    def __init__(self, features: list[FeatureSpec], bins: int = 20):
+        self.features = features
+        self.names = [feature.name for feature in features]
+        self.sketches = {feature.name: FeatureSketch(_edges(feature, bins)) for feature in features}
+
+    @classmethod
+    def from_stats(cls, stats: Mapping[str, Mapping[str, Any]], **kwargs) -> "DriftSketch":
+        return cls(features_from_stats(stats), **kwargs)
+
+    def update(self, x: np.ndarray) -> None:
+        """Add a batch of inputs, columns in the order of `features`."""
+        for j, name in enumerate(self.names):
+            self.sketches[name].update(x[:, j])
+
+    def update_cases(self, test_cases: Iterable[TestCase], chunk_size: int = 10_000) -> None:
+        """Add the inputs of a stream of test cases, encoded `chunk_size` cases at a time."""
+        chunk: list[TestCase] = []
+        for test_case in test_cases:
+            chunk.append(test_case)
+            if len(chunk) >= chunk_size:
+                self.update(encode_inputs(chunk, self.names)[1])
+                chunk = []
+        if chunk:
+            self.update(encode_inputs(chunk, self.names)[1])
+
+    def merge(self, other: "DriftSketch") -> "DriftSketch":
+        """Add the counts of another shard, summarized over the same training statistics."""
+        if self.names != other.names:
+            raise ValueError("Only sketches of the same features can be merged")
+        for name, sketch in self.sketches.items():
+            sketch.merge(other.sketches[name])
+        return self
+
+    def report(self) -> list[FeatureDrift]:
+        """Compare every feature with its training distribution."""
+        reports = []
+        for feature in self.features:
+            sketch = self.sketches[feature.name]
+            cdf = feature.cdf(sketch.edges[1:-1])
+            expected = np.diff(np.concatenate([[0.0], cdf, [1.0]]))
+            # Reference mass outside of the training range is zero
+            expected = np.concatenate([[0.0], expected, [0.0]])
+            observed = sketch.counts / sketch.n if sketch.n else np.zeros_like(expected)
+
+            reports.append(
+                FeatureDrift(
+                    feature=feature.name,
+                    n=sketch.n,
+                    missing=sketch.missing,
+                    mean=sketch.mean,
+                    std=sketch.std,
+                    min=sketch.min if sketch.n else None,
+                    max=sketch.max if sketch.n else None,
+                    psi=_psi(observed, expected) if sketch.n else 0.0,
+                    ks=float(np.abs(np.cumsum(observed) - np.cumsum(expected)).max()) if sketch.n else 0.0,
+                    out_of_range=float(observed[0] + observed[-1]),
+                    bin_coverage=float((sketch.counts[1:-1] > 0).mean()),
+                )
+            )
+
+        drifted = [report.feature for report in reports if report.drifted]
+        if drifted:
+            logger.warning(f"Inputs drifted from the training distribution on: {', '.join(drifted)}")
+        return reports
+
+
+def _edges(feature: FeatureSpec, bins: int) -> np.ndarray:
+    """Equal training mass edges, deduplicated for discrete or degenerate features."""
+    edges = np.unique(feature.ppf(np.linspace(0, 1, bins + 1)))
+    edges[0], edges[-1] = feature.low, feature.high
+    if feature.integer:
+        # Edges between the integers, where the continuous CDF gives the mass of the rounded values
+        edges = np.append(np.unique(np.rint(edges)) - 0.5, feature.high + 0.5)
+    if len(edges) < 2:
+        edges = np.array([feature.low, feature.high if feature.high > feature.low else feature.low + 1])
+    return np.unique(edges)
+
+
+def _psi(observed: np.ndarray, expected: np.ndarray) -> float:
+    observed = np.maximum(observed, _PSI_EPSILON)
+    expected = np.maximum(expected, _PSI_EPSILON)
+    return float(((observed - expected) * np.log(observed / expected)).sum())
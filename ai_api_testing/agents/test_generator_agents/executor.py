@@ -1,11 +1,19 @@
 import warnings
-from typing import Any, Protocol
+from collections.abc import Iterable, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Protocol
 
 import numpy as np
 from pydantic import BaseModel
 
-from ai_api_testing.agents.test_generator_agents.orchestrator import AgentResult
+from ai_api_testing.agents.test_generator_agents.assertions import CompiledAssertions, compile_assertions
 from ai_api_testing.core.models import TestCase
+from ai_api_testing.utils.logger import logger
+from ai_api_testing.utils.profiling import profile_region
+
+if TYPE_CHECKING:
+    from ai_api_testing.agents.test_generator_agents.orchestrator import AgentResult
 
 # TODO: decide if include pandas/polars/NamedArrays...
 warnings.filterwarnings("ignore", category=UserWarning, module="sklearn")
@@ -23,6 +31,64 @@ class Predictable(Protocol):
     def predict_proba(self, *args, **kwargs) -> Any: ...
 
 
+@profile_region("executor.encode")
+def encode_inputs(
+    test_cases: Iterable[TestCase], feature_names: list[str] | None = None
+) -> tuple[list[str], np.ndarray]:
+    """Stack the inputs of many test cases into a single model input matrix.
+
+    Args:
+        test_cases: The test cases, a list `input_json` adds one row per item.
+        feature_names: Column order. Defaults to the keys of the first input, missing values are NaN.
+
+    Returns:
+        The feature names and the `(n_rows, n_features)` matrix.
+    """
+    rows = [row for test_case in test_cases for row in test_case.input_rows()]
+    if feature_names is None:
+        feature_names = list(rows[0]) if rows else []
+    x = np.array([[row.get(name, np.nan) for name in feature_names] for row in rows], dtype=float)
+    return feature_names, x.reshape(len(rows), len(feature_names))
+
+
+@dataclass
+class ComparisonReport:
+    """Predictions of several models over the same inputs, compared with a baseline model.
+
+    Attributes:
+        baseline: The name of the model the others are compared with.
+        rows: One value per input row: `case`, `family`, `prediction_<model>`, `probability_<model>`
+            (the last class probability, with `predict_proba`), and for every other model
+            `disagrees_<model>` and `probability_delta_<model>`.
+        families: One value per family and challenger: `family`, `model`, `n_rows`, `disagreement_rate`,
+            `mean_abs_probability_delta` and `max_abs_probability_delta`.
+    """
+
+    baseline: str
+    rows: dict[str, np.ndarray]
+    families: dict[str, np.ndarray]
+
+    def disagreement_rate(self, model: str) -> float:
+        """Fraction of all the rows where `model` and the baseline predictions differ."""
+        disagrees = self.rows[f"disagrees_{model}"]
+        return float(disagrees.mean()) if len(disagrees) else 0.0
+
+
+def flatten_cases(
+    cases: "Mapping[str, AgentResult[TestCase] | Sequence[TestCase]] | Sequence[TestCase]",
+) -> tuple[list[TestCase], list[str]]:
+    """Flatten test cases grouped by family (e.g. the results of an agent, keyed by task) with their family."""
+    if not isinstance(cases, Mapping):
+        return list(cases), ["all"] * len(cases)
+    flat, families = [], []
+    for family, group in cases.items():
+        data = getattr(group, "data", group) or []
+        for test_case in data if isinstance(data, list) else [data]:
+            flat.append(test_case)
+            families.append(family)
+    return flat, families
+
+
 class Executor(BaseModel):
     """Executes test cases against a model to get predictions.
 
@@ -36,11 +102,13 @@ class Executor(BaseModel):
     Methods:
         execute_results: Executes multiple test cases from agent results against a model
         execute: Executes a single test case against a model
+        execute_batch: Executes and grades many test cases with batched model calls
+        compare: Runs several models over the same test cases and compares them with a baseline
     """
 
     def execute_results(
         self,
-        results_dict: dict[str, AgentResult[TestCase]] | list[TestCase],
+        results_dict: "dict[str, AgentResult[TestCase]] | list[TestCase]",
         model: Any,
         predict_proba: bool = False,
     ) -> dict[str, int | float]:
@@ -65,13 +133,158 @@ class Executor(BaseModel):
         test: TestCase,
         model: Predictable,
         predict_proba: bool = False,
-        assertion: Any | None = None,
+        assertion: Mapping[str, Any] | bool | None = None,
     ) -> np.ndarray:
-        if assertion:
-            raise NotImplementedError("Assertion not available yet.")
+        """Execute a single test case.
+
+        Args:
+            test: The test case.
+            model: The model.
+            predict_proba: Return `predict_proba` instead of `predict`.
+            assertion: Expected output to check the prediction against, in the `expected_output_json`
+                format of `CompiledAssertions`. True checks the test case own `expected_output_json`.
 
+        Raises:
+            AssertionError: If the prediction does not meet the assertion.
+        """
         func = model.predict
         if predict_proba:
             func = model.predict_proba
 
-        return func(np.array(list(test.input_json.values())).reshape(1, -1))
+        x = np.array(list(test.input_json.values())).reshape(1, -1)
+        output = func(x)
+        if assertion:
+            expected = test.expected_output_json if assertion is True else assertion
+            columns = CompiledAssertions([expected if isinstance(expected, Mapping) else None]).evaluate(
+                model.predict(x) if predict_proba else output, output if predict_proba else None
+            )
+            failed = [
+                key.removesuffix("_passed") for key, passed in columns.items() if key != "passed" and not passed[0]
+            ]
+            if failed:
+                raise AssertionError(f"Test case {test.name} failed the {', '.join(failed)} checks")
+        return output
+
+    def execute_batch(
+        self,
+        test_cases: Sequence[TestCase],
+        model: Predictable,
+        predict_proba: bool = False,
+        feature_names: list[str] | None = None,
+        batch_size: int = 100_000,
+    ) -> dict[str, np.ndarray]:
+        """Execute test cases with batched model calls and grade them against their expected outputs.
+
+        Args:
+            test_cases: The test cases, a list `input_json` adds one row per item.
+            model: The model.
+            predict_proba: Also call `predict_proba`, needed by probability expectations.
+            feature_names: Model input column order, by default the keys of the first input.
+            batch_size: Rows per model call.
+
+        Returns:
+            Columns with one value per input row: `case`, `prediction`, `probability` (with
+            `predict_proba`) and the pass/fail columns of `CompiledAssertions.evaluate`.
+        """
+        feature_names, x = encode_inputs(test_cases, feature_names)
+        columns: dict[str, np.ndarray] = {
+            "case": np.array([case.name for case in test_cases for _ in case.input_rows()], dtype=object),
+            "prediction": _predict_in_batches(model.predict, x, batch_size),
+        }
+        if predict_proba:
+            columns["probability"] = _predict_in_batches(model.predict_proba, x, batch_size)
+
+        with profile_region("executor.assert"):
+            assertions = compile_assertions(test_cases)
+            columns.update(assertions.evaluate(columns["prediction"], columns.get("probability")))
+        logger.info(f"Executed {len(x)} rows of {len(test_cases)} test cases, {int(columns['passed'].sum())} passed")
+        return columns
+
+    def compare(
+        self,
+        cases: "Mapping[str, AgentResult[TestCase] | Sequence[TestCase]] | Sequence[TestCase]",
+        models: Mapping[str, Predictable],
+        baseline: str | None = None,
+        predict_proba: bool = False,
+        feature_names: list[str] | None = None,
+        batch_size: int = 100_000,
+        max_workers: int | None = None,
+    ) -> ComparisonReport:
+        """Run several models (e.g. champion and challengers) over the same encoded inputs.
+
+        The inputs are encoded once and the models run concurrently in threads, which overlap for
+        models releasing the GIL while predicting (numpy, scikit-learn, ...).
+
+        Args:
+            cases: The test cases, grouped by family in a mapping (like the results of an agent).
+            models: The models, by name.
+            baseline: The model the others are compared with, by default the first one.
+            predict_proba: Also compare the last class probabilities.
+            feature_names: Model input column order, by default the keys of the first input.
+            batch_size: Rows per model call.
+            max_workers: Threads running the models, by default one per model.
+        """
+        baseline = baseline or next(iter(models))
+        if baseline not in models:
+            raise ValueError(f"Baseline model {baseline} is not one of the compared models")
+        test_cases, case_families = flatten_cases(cases)
+        feature_names, x = encode_inputs(test_cases, feature_names)
+        row_cases = [(case.name, family) for case, family in zip(test_cases, case_families) for _ in case.input_rows()]
+
+        def run(model: Predictable) -> tuple[np.ndarray, np.ndarray | None]:
+            predictions = _predict_in_batches(model.predict, x, batch_size)
+            if not predict_proba:
+                return predictions, None
+            probabilities = _predict_in_batches(model.predict_proba, x, batch_size)
+            return predictions, probabilities.reshape(len(x), -1)[:, -1] if len(x) else probabilities
+
+        with ThreadPoolExecutor(max_workers=max_workers or len(models)) as pool:
+            outputs = dict(zip(models, pool.map(run, models.values())))
+
+        rows: dict[str, np.ndarray] = {
+            "case": np.array([name for name, _ in row_cases], dtype=object),
+            "family": np.array([family for _, family in row_cases], dtype=object),
+        }
+        for name, (predictions, probabilities) in outputs.items():
+            rows[f"prediction_{name}"] = predictions
+            if probabilities is not None:
+                rows[f"probability_{name}"] = probabilities
+
+        family_names, family_codes = np.unique(rows["family"].astype(str), return_inverse=True)
+        n_rows = np.bincount(family_codes, minlength=len(family_names))
+        families: dict[str, list] = {key: [] for key in ("family", "model", "n_rows", "disagreement_rate")}
+        if predict_proba:
+            families.update(mean_abs_probability_delta=[], max_abs_probability_delta=[])
+
+        base_predictions, base_probabilities = outputs[baseline]
+        for name, (predictions, probabilities) in outputs.items():
+            if name == baseline:
+                continue
+            disagrees = predictions != base_predictions
+            rows[f"disagrees_{name}"] = disagrees
+            disagreements = np.bincount(family_codes, weights=disagrees, minlength=len(family_names))
+            families["family"].extend(family_names)
+            families["model"].extend([name] * len(family_names))
+            families["n_rows"].extend(n_rows)
+            families["disagreement_rate"].extend(disagreements / np.maximum(n_rows, 1))
+            if probabilities is not None:
+                delta = probabilities - base_probabilities
+                rows[f"probability_delta_{name}"] = delta
+                abs_delta = np.abs(delta)
+                totals = np.bincount(family_codes, weights=abs_delta, minlength=len(family_names))
+                maxima = np.zeros(len(family_names))
+                np.maximum.at(maxima, family_codes, abs_delta)
+                families["mean_abs_probability_delta"].extend(totals / np.maximum(n_rows, 1))
+                families["max_abs_probability_delta"].extend(maxima)
+            logger.info(f"Model {name} disagrees with {baseline} on {int(disagrees.sum())}/{len(x)} rows")
+
+        return ComparisonReport(
+            baseline=baseline, rows=rows, families={key: np.asarray(values) for key, values in families.items()}
+        )
+
+
+@profile_region("executor.predict")
+def _predict_in_batches(func: Any, x: np.ndarray, batch_size: int) -> np.ndarray:
+    if not len(x):
+        return np.empty(0)
+    return np.concatenate([np.asarray(func(x[i : i + batch_size])) for i in range(0, len(x), batch_size)])
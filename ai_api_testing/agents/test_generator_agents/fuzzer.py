@@ -0,0 +1,647 @@
+import math
+import random
+import string
+import uuid
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from dataclasses import dataclass, field
+from typing import Any, Literal
+
+from ai_api_testing.agents.api_specs_agents.base_extractor import APIEndpoint
+from ai_api_testing.agents.api_specs_agents.path_index import PathIndex
+from ai_api_testing.agents.test_generator_agents.validator import (
+    CompiledSchema,
+    LRUCache,
+    compile_schema,
+    document_hash,
+    local_ref_resolver,
+    lookup_schema,
+    required_properties,
+    schema_hash,
+)
+from ai_api_testing.core.models import TestCase
+from ai_api_testing.utils.logger import logger
+
+Kind = Literal["valid", "boundary", "invalid"]
+
+# A mutation turns the value at a payload location into one the schema should reject
+Mutation = Callable[[random.Random, Any], Any]
+
+_ALPHABET = string.ascii_letters + string.digits
+_NUMERIC = ("integer", "number")
+# A sample of every JSON type, used for type confusion
+_TYPE_SAMPLES: dict[str, Any] = {
+    "string": "fuzz",
+    "integer": 7,
+    "number": 0.5,
+    "boolean": True,
+    "object": {},
+    "array": [],
+    "null": None,
+}
+_EXTREME_NUMBERS = (1e308, -1e308, 2**63, -(2**63) - 1, 2**53 + 1, 1e-308)
+_UNBOUNDED_INTEGERS = (0, -1, 1, 2**31 - 1, -(2**31), 2**53)
+_UNBOUNDED_NUMBERS = (0.0, -0.0, 1e-9, -1e-9, 1.7976931348623157e308, -1.7976931348623157e308)
+
+# Optional fields and object sites are only generated down to this nesting level
+_MAX_DEPTH = 4
+_MAX_BOUNDARY_ITEMS = 100
+_LONG_STRING = 10_000
+_LONG_VALID_STRING = 1_000
+
+# Compiled generators by (root document hash, schema hash)
+_GENERATOR_CACHE: LRUCache[tuple[str, str], "CompiledGenerator"] = LRUCache(maxsize=4096)
+
+
+class _Node:
+    """A schema compiled into the generators of its valid and boundary values and its mutations."""
+
+    __slots__ = (
+        "additional",
+        "choices",
+        "const",
+        "enum",
+        "examples",
+        "format",
+        "items",
+        "max_items",
+        "max_length",
+        "maximum",
+        "min_items",
+        "min_length",
+        "minimum",
+        "multiple_of",
+        "mutations",
+        "nullable",
+        "properties",
+        "required",
+        "types",
+        "unsatisfiable",
+    )
+
+    def __init__(self):
+        self.types: tuple[str, ...] = ()
+        self.nullable = False
+        self.enum: list[Any] | None = None
+        self.const: list[Any] | None = None
+        self.examples: list[Any] = []
+        self.choices: list[_Node] = []
+        self.properties: dict[str, _Node] = {}
+        self.required: tuple[str, ...] = ()
+        self.additional = True
+        self.items: _Node | None = None
+        self.min_items, self.max_items = 0, None
+        self.min_length, self.max_length = 0, None
+        self.minimum: float | None = None
+        self.maximum: float | None = None
+        self.multiple_of: float | None = None
+        self.format: str | None = None
+        self.mutations: dict[str, Mutation] = {}
+        # Numeric schema whose bounds exclude every value, only its (invalid) edges are generated
+        self.unsatisfiable = False
+
+    def valid(self, rng: random.Random, depth: int) -> Any:
+        if self.unsatisfiable:
+            return self.boundary(rng, depth)
+        if self.const is not None:
+            return self.const[0]
+        if self.enum:
+            return rng.choice(self.enum)
+        if self.choices:
+            return rng.choice(self.choices).valid(rng, depth)
+        if self.examples and rng.random() < 0.5:
+            return rng.choice(self.examples)
+        kind = rng.choice(self.types) if self.types else "string"
+        if kind == "object":
+            return {
+                name: node.valid(rng, depth + 1)
+                for name, node in self.properties.items()
+                if name in self.required or (depth < _MAX_DEPTH and rng.random() < 0.5)
+            }
+        if kind == "array":
+            high = self.min_items if depth >= _MAX_DEPTH else self.min_items + 3
+            if self.max_items is not None:
+                high = min(high, self.max_items)
+            items = self.items or _ANY
+            return [items.valid(rng, depth + 1) for _ in range(rng.randint(self.min_items, max(high, self.min_items)))]
+        if kind in _NUMERIC:
+            return self._number(rng, kind)
+        if kind == "string":
+            return self._string(rng)
+        if kind == "boolean":
+            return rng.random() < 0.5
+        return None
+
+    def boundary(self, rng: random.Random, depth: int) -> Any:
+        if self.unsatisfiable:
+            return rng.choice(self._number_edges(rng.choice(self.types)))
+        if self.const is not None or self.enum:
+            # Every enum value is its own edge case
+            return self.valid(rng, depth)
+        if self.choices:
+            return rng.choice(self.choices).boundary(rng, depth)
+        kind = rng.choice(self.types) if self.types else "string"
+        if kind == "object":
+            # Either the bare required fields or every known field
+            full = depth < _MAX_DEPTH and rng.random() < 0.5
+            return {
+                name: node.boundary(rng, depth + 1)
+                for name, node in self.properties.items()
+                if full or name in self.required
+            }
+        if kind == "array":
+            count = self.min_items
+            if depth < _MAX_DEPTH and rng.random() < 0.5:
+                count = self.max_items if self.max_items is not None else self.min_items + 8
+            items = self.items or _ANY
+            return [items.boundary(rng, depth + 1) for _ in range(min(count, _MAX_BOUNDARY_ITEMS))]
+        if kind in _NUMERIC:
+            return rng.choice(self._number_edges(kind))
+        if kind == "string":
+            return rng.choice(self._string_edges(rng))
+        if kind == "boolean":
+            return rng.random() < 0.5
+        return None
+
+    def _bounds(self, kind: str) -> tuple[float | None, float | None]:
+        low, high = self.minimum, self.maximum
+        if kind == "integer":
+            # Exclusive bounds are stored already shifted for floats, round them inwards for integers
+            low = None if low is None else int(-(-low // 1))
+            high = None if high is None else int(high // 1)
+        return low, high
+
+    def _number(self, rng: random.Random, kind: str) -> int | float:
+        low, high = self._bounds(kind)
+        if low is None:
+            low = min(-1000, high - 1000) if high is not None else -1000
+        if high is None:
+            high = max(1000, low + 1000)
+        value: int | float = rng.randint(low, high) if kind == "integer" else rng.uniform(low, high)
+        if self.multiple_of:
+            value = round(value / self.multiple_of) * self.multiple_of
+        return value
+
+    def _number_edges(self, kind: str) -> list[int | float]:
+        low, high = self._bounds(kind)
+        edges = [value for value in (low, high) if value is not None]
+        if not edges:
+            return list(_UNBOUNDED_INTEGERS if kind == "integer" else _UNBOUNDED_NUMBERS)
+        if low is not None and high is not None and low <= 0 <= high:
+            edges.append(0)
+        return edges
+
+    def _string(self, rng: random.Random) -> str:
+        if self.format in _FORMATS:
+            return _FORMATS[self.format](rng)
+        high = self.min_length + 12 if self.max_length is None else min(self.max_length, self.min_length + 12)
+        return "".join(rng.choices(_ALPHABET, k=rng.randint(self.min_length, max(high, self.min_length))))
+
+    def _string_edges(self, rng: random.Random) -> list[str]:
+        if self.format in _FORMATS:
+            return [_FORMATS[self.format](rng)]
+        lengths = {self.min_length, self.max_length if self.max_length is not None else _LONG_VALID_STRING}
+        edges = ["x" * length for length in sorted(lengths)]
+        # Non-ASCII and blank strings of an accepted length
+        width = max(self.min_length, 1)
+        if self.max_length is None or width <= self.max_length:
+            edges += ["é" * width, " " * width]
+        return edges
+
+
+class CompiledGenerator:
+    """A JSON schema compiled once into payload generators.
+
+    The compiled tree holds no random state, so a single instance is shared by every fuzzer of a schema.
+    """
+
+    __slots__ = ("_root", "schema_hash", "sites")
+
+    def __init__(self, schema_hash: str, root: _Node, sites: list[tuple[tuple[str, ...], _Node]]):
+        self.schema_hash = schema_hash
+        self._root = root
+        self.sites = sites
+
+    def valid(self, rng: random.Random) -> Any:
+        return self._root.valid(rng, 0)
+
+    def boundary(self, rng: random.Random) -> Any:
+        return self._root.boundary(rng, 0)
+
+    def mutate(self, rng: random.Random, payload: Any) -> tuple[str, Any] | None:
+        """Apply one mutation at a random location of `payload`, returning its name and the mutated copy."""
+        present = [(path, node) for path, node in self.sites if node.mutations and _has_path(payload, path)]
+        if not present:
+            return None
+        path, node = rng.choice(present)
+        name = rng.choice(list(node.mutations))
+        return name, _replace_at(payload, path, lambda current: node.mutations[name](rng, current))
+
+
+class _GeneratorCompiler:
+    """Compile JSON schema dicts into generator nodes, resolving `$ref`s against a root document."""
+
+    def __init__(self, root: Mapping[str, Any] | None):
+        self._resolver = local_ref_resolver(root)
+        self._refs: dict[str, _Node] = {}
+
+    def compile(self, schema: Any) -> _Node:
+        if isinstance(schema, dict) and "$ref" in schema:
+            ref = schema["$ref"]
+            if ref not in self._refs:
+                # Registered before being filled, so self-referencing schemas compile
+                self._refs[ref] = node = _Node()
+                self._fill(node, lookup_schema(self._resolver, ref))
+            return self._refs[ref]
+        node = _Node()
+        self._fill(node, schema)
+        return node
+
+    def _merge_all_of(self, schema: dict[str, Any]) -> dict[str, Any]:
+        merged = {key: value for key, value in schema.items() if key != "allOf"}
+        for sub in schema["allOf"]:
+            while isinstance(sub, dict) and "$ref" in sub:
+                sub = lookup_schema(self._resolver, sub["$ref"])
+            if isinstance(sub, dict) and "allOf" in sub:
+                sub = self._merge_all_of(sub)
+            for key, value in (sub or {}).items():
+                if key == "properties":
+                    merged["properties"] = {**merged.get("properties", {}), **value}
+                elif key == "required":
+                    merged["required"] = [*merged.get("required", []), *value]
+                else:
+                    merged.setdefault(key, value)
+        return merged
+
+    def _fill(self, node: _Node, schema: Any) -> None:
+        if not isinstance(schema, dict):
+            return
+        if "allOf" in schema:
+            schema = self._merge_all_of(schema)
+
+        node.nullable = bool(schema.get("nullable", False))
+        types = schema.get("type")
+        types = list(types) if isinstance(types, list) else [types] if types else []
+        if not types:
+            if "properties" in schema:
+                types = ["object"]
+            elif "items" in schema:
+                types = ["array"]
+        if "null" in types:
+            node.nullable = True
+        node.types = tuple(t for t in types if t != "null") or (("null",) if types else ())
+
+        if "enum" in schema:
+            node.enum = list(schema["enum"])
+        if "const" in schema:
+            node.const = [schema["const"]]
+        node.examples = [
+            value
+            for value in [schema.get("example"), schema.get("default"), *(schema.get("examples") or [])]
+            if value is not None
+        ]
+        for keyword in ("anyOf", "oneOf"):
+            if keyword in schema:
+                node.choices = [self.compile(sub) for sub in schema[keyword]]
+
+        properties = schema.get("properties", {})
+        node.properties = {name: self.compile(prop) for name, prop in properties.items()}
+        node.required = tuple(name for name in required_properties(schema) if name in node.properties)
+        node.additional = schema.get("additionalProperties", True) is not False
+
+        if isinstance(schema.get("items"), dict):
+            node.items = self.compile(schema["items"])
+        node.min_items = schema.get("minItems", 0)
+        node.max_items = schema.get("maxItems")
+        node.min_length = schema.get("minLength", 0)
+        node.max_length = schema.get("maxLength")
+        node.format = schema.get("format")
+        node.multiple_of = schema.get("multipleOf")
+        node.minimum, node.maximum = _numeric_bounds(schema, "integer" if node.types == ("integer",) else "number")
+        _drop_empty_numeric_types(node, schema)
+
+        node.mutations = _mutations(node, schema)
+
+
+def _drop_empty_numeric_types(node: _Node, schema: dict[str, Any]) -> None:
+    """Drop the numeric types whose bounds exclude every value, e.g. an integer in `(0, 1)`."""
+    empty = set()
+    for kind in node.types:
+        if kind in _NUMERIC:
+            low, high = node._bounds(kind)
+            if low is not None and high is not None and low > high:
+                empty.add(kind)
+    if not empty:
+        return
+    if empty.issuperset(node.types):
+        logger.warning(f"No value satisfies the bounds of {schema}, only invalid edge values are generated")
+        node.unsatisfiable = True
+    else:
+        node.types = tuple(kind for kind in node.types if kind not in empty)
+
+
+def _numeric_bounds(schema: dict[str, Any], kind: str) -> tuple[float | None, float | None]:
+    """Inclusive bounds of an `integer` or `number` schema, in both the OpenAPI 3.0 and the JSON schema flavours."""
+    minimum, maximum = schema.get("minimum"), schema.get("maximum")
+    exclusive_min, exclusive_max = schema.get("exclusiveMinimum"), schema.get("exclusiveMaximum")
+    if exclusive_min is True and minimum is not None:
+        exclusive_min = minimum
+    if exclusive_max is True and maximum is not None:
+        exclusive_max = maximum
+    if isinstance(exclusive_min, int | float) and not isinstance(exclusive_min, bool):
+        minimum = _next_after(exclusive_min, 1, kind)
+    if isinstance(exclusive_max, int | float) and not isinstance(exclusive_max, bool):
+        maximum = _next_after(exclusive_max, -1, kind)
+    return minimum, maximum
+
+
+def _next_after(value: float, direction: int, kind: str) -> float:
+    """The closest allowed value past an exclusive bound: the next integer, or a relative epsilon for numbers."""
+    if kind == "integer":
+        return math.floor(value) + 1 if direction > 0 else math.ceil(value) - 1
+    step = max(abs(value), 1.0) * 1e-9
+    return value + direction * step
+
+
+def _mutations(node: _Node, schema: dict[str, Any]) -> dict[str, Mutation]:
+    """The mutations that make a value at this node invalid."""
+    if not schema:
+        return {}
+    allowed = set(node.types)
+    if "number" in allowed:
+        allowed.add("integer")
+    return {**_scalar_mutations(node, allowed), **_container_mutations(node, allowed)}
+
+
+def _scalar_mutations(node: _Node, allowed: set[str]) -> dict[str, Mutation]:
+    mutations: dict[str, Mutation] = {}
+    confusions = [sample for t, sample in _TYPE_SAMPLES.items() if t not in allowed and t != "null"]
+    if node.types and confusions:
+        mutations["type_confusion"] = lambda rng, current: rng.choice(confusions)
+    if node.types and not node.nullable and "null" not in node.types:
+        mutations["null_injection"] = lambda rng, current: None
+
+    if node.enum:
+        mutations["out_of_enum"] = lambda rng, current: _out_of_enum(node.enum)
+
+    if allowed & set(_NUMERIC):
+        out_of_range = [value for value in (_outside(node.minimum, -1), _outside(node.maximum, 1)) if value is not None]
+        mutations["extreme_number"] = lambda rng, current: rng.choice([*out_of_range, *_EXTREME_NUMBERS])
+
+    if "string" in allowed:
+        long_length = max(_LONG_STRING, (node.max_length or 0) + 1)
+        mutations["long_string"] = lambda rng, current: rng.choice(_ALPHABET) * long_length
+        if node.min_length:
+            mutations["short_string"] = lambda rng, current: "x" * (node.min_length - 1)
+    return mutations
+
+
+def _container_mutations(node: _Node, allowed: set[str]) -> dict[str, Mutation]:
+    mutations: dict[str, Mutation] = {}
+    if node.required:
+        mutations["missing_required"] = _drop_required(node.required)
+    if not node.additional and "object" in allowed:
+        mutations["unexpected_field"] = lambda rng, current: {
+            **(current if isinstance(current, dict) else {}),
+            f"unexpected_{rng.randrange(1000)}": "fuzz",
+        }
+
+    if "array" in allowed:
+        if node.max_items is not None:
+            mutations["too_many_items"] = lambda rng, current: _resize(current, node.max_items + 1)
+        if node.min_items:
+            mutations["too_few_items"] = lambda rng, current: _resize(current, node.min_items - 1)
+        if node.items is not None:
+            mutations["bad_item"] = _bad_item(node.items)
+    return mutations
+
+
+def _bad_item(items: _Node) -> Mutation:
+    def mutation(rng: random.Random, current: Any) -> Any:
+        # Looked up when called, a `$ref` item node may not be compiled yet when its array is
+        if not items.mutations:
+            return current
+        name = rng.choice(list(items.mutations))
+        return [items.mutations[name](rng, None)]
+
+    return mutation
+
+
+def _outside(bound: float | None, direction: int) -> float | None:
+    if bound is None:
+        return None
+    return bound + direction * (1 if isinstance(bound, int) else max(abs(bound), 1.0))
+
+
+def _out_of_enum(values: list[Any]) -> Any:
+    candidate = "not_a_valid_option"
+    while candidate in values:
+        candidate += "_"
+    return candidate
+
+
+def _drop_required(required: tuple[str, ...]) -> Mutation:
+    def mutation(rng: random.Random, current: Any) -> Any:
+        if not isinstance(current, dict):
+            return {}
+        dropped = rng.choice(required)
+        return {name: value for name, value in current.items() if name != dropped}
+
+    return mutation
+
+
+def _resize(current: Any, size: int) -> list[Any]:
+    items = list(current) if isinstance(current, list) else []
+    if not items:
+        return [None] * size
+    return (items * (size // len(items) + 1))[:size]
+
+
+def _has_path(payload: Any, path: tuple[str, ...]) -> bool:
+    for name in path:
+        if not isinstance(payload, dict) or name not in payload:
+            return False
+        payload = payload[name]
+    return True
+
+
+def _replace_at(payload: Any, path: tuple[str, ...], update: Callable[[Any], Any]) -> Any:
+    """Copy `payload` with the value at `path` updated, copying only the objects along the path."""
+    if not path:
+        return update(payload)
+    name, rest = path[0], path[1:]
+    return {**payload, name: _replace_at(payload[name], rest, update)}
+
+
+def _collect_sites(root: _Node) -> list[tuple[tuple[str, ...], _Node]]:
+    """Every location mutations can target, down to `_MAX_DEPTH` levels of nested objects."""
+    sites: list[tuple[tuple[str, ...], _Node]] = []
+    stack: list[tuple[tuple[str, ...], _Node]] = [((), root)]
+    while stack:
+        path, node = stack.pop()
+        sites.append((path, node))
+        if len(path) < _MAX_DEPTH:
+            stack.extend((path + (name,), child) for name, child in reversed(node.properties.items()))
+    return sites
+
+
+def _date_time(rng: random.Random) -> str:
+    return (
+        f"{rng.randint(1970, 2099):04d}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        f"T{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}Z"
+    )
+
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10)))
+
+
+_FORMATS: dict[str, Callable[[random.Random], str]] = {
+    "date-time": _date_time,
+    "date": lambda rng: _date_time(rng)[:10],
+    "time": lambda rng: _date_time(rng)[11:],
+    "email": lambda rng: f"{_word(rng)}@example.com",
+    "uuid": lambda rng: str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+    "uri": lambda rng: f"https://example.com/{_word(rng)}",
+    "ipv4": lambda rng: ".".join(str(rng.randint(0, 255)) for _ in range(4)),
+}
+
+# Matches any value, for arrays without an `items` schema
+_ANY = _Node()
+
+
+def compile_generator(
+    schema: dict[str, Any] | None, root: Mapping[str, Any] | None = None, root_hash: str | None = None
+) -> CompiledGenerator:
+    """Compile a JSON schema into payload generators, reusing a cached one for identical schemas.
+
+    Args:
+        schema: The JSON schema, e.g. `APIEndpoint.request_body`.
+        root: The document local `$ref`s (`#/components/schemas/...`) resolve against.
+        root_hash: The `document_hash` of `root`, computed if not given.
+    """
+    key = (document_hash(root) if root_hash is None else root_hash, schema_hash(schema))
+    compiled = _GENERATOR_CACHE.get(key)
+    if compiled is None:
+        node = _GeneratorCompiler(root).compile(schema or {})
+        compiled = CompiledGenerator(key[1], node, _collect_sites(node))
+        _GENERATOR_CACHE.put(key, compiled)
+    return compiled
+
+
+@dataclass(slots=True)
+class FuzzPayload:
+    """A generated payload with the validation errors the compiled schema reports for it."""
+
+    kind: Kind
+    payload: Any
+    mutation: str | None = None
+    errors: list[str] = field(default_factory=list)
+
+    @property
+    def valid(self) -> bool:
+        return not self.errors
+
+
+class SchemaFuzzer:
+    """Generates valid, boundary and invalid payloads for a JSON schema.
+
+    The schema is compiled once and every payload is checked with the compiled validator, so a
+    mutation the schema happens to accept (e.g. an extreme number on an unbounded field) is reported
+    as valid rather than mislabelled.
+
+    Args:
+        schema: The JSON schema of the payloads, e.g. `APIEndpoint.request_body`.
+        root: The document local `$ref`s resolve against.
+        seed: Seed of the random generator, the same seed yields the same payload stream.
+        corpus: Known good payloads (e.g. the inputs of LLM generated test cases) to mutate, besides
+            the generated valid ones.
+    """
+
+    def __init__(
+        self,
+        schema: dict[str, Any] | None,
+        root: dict[str, Any] | None = None,
+        seed: int | None = None,
+        corpus: Iterable[Any] | None = None,
+    ):
+        root_hash = document_hash(root)
+        self.generator = compile_generator(schema, root, root_hash)
+        self.validator: CompiledSchema = compile_schema(schema, root, root_hash)
+        self.rng = random.Random(seed)
+        self.corpus = [payload for payload in corpus or [] if payload is not None]
+
+    def generate(self, kind: Kind) -> FuzzPayload:
+        """Generate a single payload of the given kind."""
+        mutation = None
+        if kind == "valid":
+            payload = self.generator.valid(self.rng)
+        elif kind == "boundary":
+            payload = self.generator.boundary(self.rng)
+        elif kind == "invalid":
+            use_corpus = self.corpus and self.rng.random() < 0.5
+            base = self.rng.choice(self.corpus) if use_corpus else self.generator.valid(self.rng)
+            mutated = self.generator.mutate(self.rng, base)
+            mutation, payload = mutated if mutated is not None else (None, base)
+        else:
+            raise ValueError(f"Unknown payload kind: {kind}")
+        return FuzzPayload(kind=kind, payload=payload, mutation=mutation, errors=self.validator.errors(payload))
+
+    def payloads(self, n: int, mix: Mapping[Kind, float] | None = None) -> Iterator[FuzzPayload]:
+        """Lazily generate `n` payloads, drawing their kind with the `mix` weights."""
+        mix = mix or {"valid": 0.4, "boundary": 0.2, "invalid": 0.4}
+        kinds, weights = list(mix), list(mix.values())
+        for _ in range(n):
+            yield self.generate(self.rng.choices(kinds, weights)[0])
+
+
+def fuzz_test_cases(
+    endpoint: APIEndpoint,
+    n: int,
+    seed: int | None = None,
+    corpus: Iterable[TestCase] | None = None,
+    root: dict[str, Any] | None = None,
+    mix: Mapping[Kind, float] | None = None,
+) -> Iterator[TestCase]:
+    """Lazily generate fuzzed test cases for the request body of an endpoint.
+
+    Args:
+        endpoint: The endpoint to fuzz.
+        n: Number of payloads to generate.
+        seed: Seed for a reproducible stream.
+        corpus: Test cases (e.g. generated by the agents) whose inputs for this endpoint are mutated.
+        root: The document local `$ref`s resolve against.
+        mix: Weights of the valid, boundary and invalid kinds.
+    """
+    # Corpus cases may use concrete paths (`/users/42`), they are matched to the endpoint template
+    index = PathIndex.from_endpoints([endpoint])
+    seeds = [case.input_json for case in corpus or [] if index.match(case.path, case.method) is not None]
+    fuzzer = SchemaFuzzer(endpoint.request_body, root=root, seed=seed, corpus=seeds)
+
+    skipped = 0
+    for i, fuzzed in enumerate(fuzzer.payloads(n, mix)):
+        payload = fuzzed.payload
+        # Test cases only carry object bodies, root level type confusion cannot be represented
+        if not (payload is None or isinstance(payload, dict) or _is_object_list(payload)):
+            skipped += 1
+            continue
+        label = fuzzed.kind if fuzzed.mutation is None else f"{fuzzed.kind} {fuzzed.mutation}"
+        if fuzzed.valid:
+            expected = "The request is accepted and the response matches the response schema"
+        else:
+            expected = f"The request is rejected with a 4xx validation error: {'; '.join(fuzzed.errors[:3])}"
+        yield TestCase(
+            name=f"fuzz {label} {i}",
+            description=f"Schema fuzzing of {endpoint.key} with a {label} payload",
+            path=endpoint.path,
+            method=endpoint.method,
+            input_json=payload,
+            expected_output_prompt=expected,
+            expected_output_json=None,
+            preconditions=None,
+        )
+    if skipped:
+        logger.debug(f"Skipped {skipped} fuzzed payloads of {endpoint.key} that are not JSON objects")
+
+
+def _is_object_list(payload: Any) -> bool:
+    return isinstance(payload, list) and all(isinstance(item, dict) for item in payload)
@@ -0,0 +1,138 @@
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from pydantic import BaseModel, Field
+
+from ai_api_testing.agents.api_specs_agents.base_extractor import APIEndpoint
+from ai_api_testing.agents.api_specs_agents.path_index import PathIndex
+from ai_api_testing.agents.test_generator_agents.orchestrator import AgentOrchestrator, AgentResult
+from ai_api_testing.core.models import TestCase
+from ai_api_testing.utils.logger import logger
+
+if TYPE_CHECKING:
+    from pydantic_ai import Agent
+
+
+class GeneratedCorpus(BaseModel):
+    """Generated test cases stored with the content hash of the endpoint they were generated for.
+
+    Both mappings are keyed by the endpoint key, e.g. `POST /pets`.
+    """
+
+    endpoint_hashes: dict[str, str] = Field(default_factory=dict)
+    cases: dict[str, list[TestCase]] = Field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "GeneratedCorpus":
+        return cls.model_validate_json(Path(path).read_bytes())
+
+    def save(self, path: str | Path) -> None:
+        Path(path).write_text(self.model_dump_json(indent=2))
+
+
+class SpecDiff(BaseModel):
+    """Endpoint keys of a new spec compared with the ones a corpus was generated for."""
+
+    added: list[str] = Field(default_factory=list)
+    changed: list[str] = Field(default_factory=list)
+    removed: list[str] = Field(default_factory=list)
+    unchanged: list[str] = Field(default_factory=list)
+
+    @property
+    def to_generate(self) -> list[str]:
+        return self.added + self.changed
+
+
+def diff_endpoints(corpus: GeneratedCorpus | None, endpoints: list[APIEndpoint]) -> SpecDiff:
+    """Compare the endpoints of a spec with the ones a corpus was generated for, by content hash."""
+    old_hashes = corpus.endpoint_hashes if corpus is not None else {}
+    diff = SpecDiff()
+    for endpoint in endpoints:
+        if endpoint.key not in old_hashes:
+            diff.added.append(endpoint.key)
+        elif old_hashes[endpoint.key] != endpoint.content_hash():
+            diff.changed.append(endpoint.key)
+        else:
+            diff.unchanged.append(endpoint.key)
+    current = {endpoint.key for endpoint in endpoints}
+    diff.removed = [key for key in old_hashes if key not in current]
+    return diff
+
+
+def collect_test_cases(results: dict[str, dict[str, AgentResult]], agent_name: str) -> list[TestCase]:
+    """Flatten the test cases produced by an agent across all its orchestrator tasks."""
+    cases = []
+    for result in results.get(agent_name, {}).values():
+        data = result.data if isinstance(result.data, list) else [result.data]
+        cases.extend(case for case in data if isinstance(case, TestCase))
+    return cases
+
+
+async def regenerate(
+    agents: "list[tuple[Agent, dict[str, Any]]]",
+    endpoints: list[APIEndpoint],
+    corpus: GeneratedCorpus | None = None,
+    streaming: bool = False,
+) -> tuple[GeneratedCorpus, SpecDiff]:
+    """Generate test cases only for the endpoints added or changed since `corpus` was generated.
+
+    The spec of those endpoints is appended to the first agent user prompt and the agents chain runs as
+    usual. The cases of the unchanged endpoints are reused and the ones of removed endpoints dropped.
+    A regenerated endpoint the agents produced no case for keeps its previous hash and cases, or is left
+    out of the corpus if it is new, so that the next run generates it again.
+
+    Args:
+        agents: The `AgentOrchestrator` chain, its last agent producing `TestCase`s.
+        endpoints: The endpoints of the current spec.
+        corpus: The previously generated corpus. If None, every endpoint is generated.
+        streaming: Run the chain with `run_streaming` instead of `run_parallel`.
+
+    Returns:
+        The updated corpus and the diff it was generated from.
+    """
+    diff = diff_endpoints(corpus, endpoints)
+    logger.info(
+        f"Spec diff: {len(diff.added)} added, {len(diff.changed)} changed, "
+        f"{len(diff.removed)} removed, {len(diff.unchanged)} unchanged endpoints"
+    )
+
+    previous = corpus if corpus is not None else GeneratedCorpus()
+    updated = GeneratedCorpus(
+        endpoint_hashes={key: previous.endpoint_hashes[key] for key in diff.unchanged},
+        cases={key: previous.cases.get(key, []) for key in diff.unchanged},
+    )
+
+    keys_to_generate = set(diff.to_generate)
+    to_generate = [endpoint for endpoint in endpoints if endpoint.key in keys_to_generate]
+    if not to_generate:
+        return updated, diff
+
+    first_agent, first_kwargs = agents[0]
+    spec = json.dumps([endpoint.model_dump() for endpoint in to_generate])
+    orchestrator = AgentOrchestrator(
+        [(first_agent, {**first_kwargs, "user_prompt": first_kwargs.get("user_prompt", "") + spec}), *agents[1:]]
+    )
+    results = await (orchestrator.run_streaming() if streaming else orchestrator.run_parallel())
+
+    # Generated cases may use concrete paths, they are assigned to their endpoint by template matching
+    index = PathIndex.from_endpoints(to_generate)
+    generated: dict[str, list[TestCase]] = {endpoint.key: [] for endpoint in to_generate}
+    for case in collect_test_cases(results, agents[-1][0].name):
+        found = index.match(case.path, case.method)
+        if found is None:
+            logger.warning(f"Generated case {case.name} does not target a regenerated endpoint")
+            continue
+        generated[found.value.key].append(case)
+
+    for endpoint in to_generate:
+        if generated[endpoint.key]:
+            updated.endpoint_hashes[endpoint.key] = endpoint.content_hash()
+            updated.cases[endpoint.key] = generated[endpoint.key]
+        else:
+            logger.warning(f"No test case generated for {endpoint.key}, it will be generated again next run")
+            if endpoint.key in previous.endpoint_hashes:
+                updated.endpoint_hashes[endpoint.key] = previous.endpoint_hashes[endpoint.key]
+                updated.cases[endpoint.key] = previous.cases.get(endpoint.key, [])
+
+    return updated, diff
@@ -0,0 +1,155 @@
+from collections.abc import Iterable
+from typing import Literal
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from ai_api_testing.agents.test_generator_agents.executor import Predictable, encode_inputs
+from ai_api_testing.core.models import TestCase
+from ai_api_testing.utils.logger import logger
+
+
+class MetamorphicRelation(BaseModel):
+    """A declarative relation between the prediction of an input and of a perturbed copy of it."""
+
+    name: str = Field(description="The name of the relation, e.g. 'gender does not change the score'")
+    feature: str = Field(description="The feature perturbed by the relation")
+    transform: Literal["flip", "shift", "scale", "set"] = Field(
+        default="flip",
+        description="flip swaps the two values of a binary feature, shift adds `value`, scale multiplies by "
+        "`value` and set replaces the feature with `value`",
+    )
+    value: float | None = Field(default=None, description="The shift, scale factor or value to set")
+    flip_values: tuple[float, float] = Field(default=(0.0, 1.0), description="The two values a flip swaps")
+    expect: Literal["invariant", "increasing", "decreasing"] = Field(
+        default="invariant",
+        description="invariant: the output does not change by more than `tolerance`. increasing/decreasing: the "
+        "output moves in the same/opposite direction as the feature",
+    )
+    tolerance: float = Field(default=0.0, description="The output change allowed before a violation")
+
+    def apply(self, x: np.ndarray, column: int) -> np.ndarray:
+        """Return a perturbed copy of the input matrix."""
+        variant = x.copy()
+        values = x[:, column]
+        if self.transform == "flip":
+            low, high = self.flip_values
+            variant[:, column] = low + high - values
+        elif self.value is None:
+            raise ValueError(f"Relation {self.name} needs a value for its {self.transform} transform")
+        elif self.transform == "shift":
+            variant[:, column] = values + self.value
+        elif self.transform == "scale":
+            variant[:, column] = values * self.value
+        else:
+            variant[:, column] = self.value
+        return variant
+
+    def violations(
+        self, x: np.ndarray, variant: np.ndarray, column: int, y: np.ndarray, y_variant: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Return the violation mask and the output change of every input pair."""
+        delta = y_variant - y
+        if self.expect == "invariant":
+            return np.abs(delta) > self.tolerance, delta
+        # The output must move in the direction of the feature change (or against it when decreasing)
+        direction = np.sign(variant[:, column] - x[:, column])
+        if self.expect == "decreasing":
+            direction = -direction
+        return direction * delta < -self.tolerance, delta
+
+
+class RelationReport(BaseModel):
+    """Violations of a relation over a batch of inputs."""
+
+    relation: str
+    n_pairs: int = 0
+    violations: int = 0
+    max_abs_change: float = 0.0
+    examples: list[int] = Field(default_factory=list, description="Row indices of the first violating inputs")
+
+    @property
+    def violation_rate(self) -> float:
+        return self.violations / self.n_pairs if self.n_pairs else 0.0
+
+
+class MetamorphicTester:
+    """Checks metamorphic and fairness relations of a model over batches of inputs.
+
+    The base inputs are predicted once. For every chunk of rows, the variants of all the relations are
+    stacked into one matrix and predicted in a single call, so checking millions of pairs costs a few
+    large model calls rather than one per pair.
+
+    Args:
+        model: The model under test.
+        feature_names: The input columns, in the order the model expects them.
+        predict_proba: Compare `predict_proba` outputs instead of `predict` ones.
+        output_column: Column of a 2D output to compare, by default the last one (the positive class).
+        batch_size: Base rows per chunk, bounding memory to `batch_size * (1 + n_relations)` rows.
+        max_examples: Violating row indices kept per relation.
+    """
+
+    def __init__(
+        self,
+        model: Predictable,
+        feature_names: list[str],
+        predict_proba: bool = False,
+        output_column: int = -1,
+        batch_size: int = 100_000,
+        max_examples: int = 10,
+    ):
+        self.model = model
+        self.feature_names = feature_names
+        self.predict_proba = predict_proba
+        self.output_column = output_column
+        self.batch_size = batch_size
+        self.max_examples = max_examples
+
+    def predict(self, x: np.ndarray) -> np.ndarray:
+        """Predict a matrix, reduced to one float per row."""
+        func = self.model.predict_proba if self.predict_proba else self.model.predict
+        y = np.asarray(func(x), dtype=float)
+        return y[:, self.output_column] if y.ndim == 2 else y.reshape(len(x))
+
+    def run(self, x: np.ndarray, relations: list[MetamorphicRelation]) -> list[RelationReport]:
+        """Check every relation on every row of `x`."""
+        columns = []
+        for relation in relations:
+            if relation.feature not in self.feature_names:
+                raise ValueError(f"Relation {relation.name} perturbs unknown feature {relation.feature}")
+            columns.append(self.feature_names.index(relation.feature))
+
+        reports = [RelationReport(relation=relation.name) for relation in relations]
+        for start in range(0, len(x), self.batch_size):
+            chunk = x[start : start + self.batch_size]
+            variants = [relation.apply(chunk, column) for relation, column in zip(relations, columns)]
+            outputs = self.predict(np.concatenate([chunk, *variants]))
+            y = outputs[: len(chunk)]
+            for i, (relation, column, report) in enumerate(zip(relations, columns, reports)):
+                y_variant = outputs[(i + 1) * len(chunk) : (i + 2) * len(chunk)]
+                mask, delta = relation.violations(chunk, variants[i], column, y, y_variant)
+                _update(report, mask, delta, start, self.max_examples)
+
+        for report in reports:
+            logger.info(
+                f"Relation {report.relation}: {report.violations}/{report.n_pairs} violations "
+                f"({report.violation_rate:.2%})"
+            )
+        return reports
+
+    def run_test_cases(
+        self, test_cases: Iterable[TestCase], relations: list[MetamorphicRelation]
+    ) -> list[RelationReport]:
+        """Check the relations on the inputs of test cases."""
+        _, x = encode_inputs(test_cases, self.feature_names)
+        return self.run(x, relations)
+
+
+def _update(report: RelationReport, mask: np.ndarray, delta: np.ndarray, offset: int, max_examples: int) -> None:
+    report.n_pairs += len(mask)
+    report.violations += int(mask.sum())
+    if len(delta):
+        report.max_abs_change = max(report.max_abs_change, float(np.abs(delta).max()))
+    missing = max_examples - len(report.examples)
+    if missing > 0:
+        report.examples.extend((np.flatnonzero(mask)[:missing] + offset).tolist())
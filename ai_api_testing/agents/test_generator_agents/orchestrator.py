@@ -1,23 +1,18 @@
 import asyncio
 import json
 from asyncio import create_task
+from collections.abc import Callable
 from datetime import datetime
 from enum import Enum
-from typing import Any, Generic, TypeVar
-
-from pydantic import BaseModel
-
-from ai_api_testing.agents.test_generator_agents.case_family_agent import (
-    default_test_case_family_agent,
-)
-from ai_api_testing.agents.test_generator_agents.case_test_generator_agent import (
-    default_test_case_generator_agent,
-)
-from ai_api_testing.agents.test_generator_agents.user_persona_modelling_agent import (
-    user_modelling_agent,
-)
+from typing import TYPE_CHECKING, Any, Generic, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
 from ai_api_testing.utils.logger import logger
-from pydantic_ai import Agent
+from ai_api_testing.utils.profiling import profile_region
+
+if TYPE_CHECKING:
+    from pydantic_ai import Agent
 
 
 class AgentStatus(Enum):
@@ -43,41 +38,46 @@ class AgentResult(BaseModel, Generic[T]):
 class AgentOrchestrator:
     """Orchestrator for running agents in sequence or parallel."""
 
-    def __init__(self, agents: list[tuple[Agent, dict[str, Any]]]):
+    def __init__(self, agents: "list[tuple[Agent, dict[str, Any]]]", stream_debounce: float | None = 0.1):
         self.agents: list[tuple[Agent, dict[str, Any]]] = agents
         self.results: dict[str, dict[str, AgentResult]] = {}
+        self.stream_debounce = stream_debounce
+
+    @staticmethod
+    def _build_run_kwargs(agent_kwargs: dict[str, Any], **kwargs) -> dict[str, Any]:
+        """Build the agent run arguments, appending the previous result to the user prompt if any."""
+        if "previous_agent" in kwargs:
+            logger.info("Running agent with previous result from: {}", kwargs["previous_agent"].name)
+            return {
+                "user_prompt": agent_kwargs.get("user_prompt", "") + f"{kwargs['previous_result']}",
+                **{k: v for k, v in agent_kwargs.items() if k != "user_prompt"},
+            }
+        logger.info("Running agent without previous result")
+        return agent_kwargs
 
     async def execute_agent_with_evaluation(
         self,
-        agent_tuple: tuple[Agent, dict[str, Any]],
+        agent_tuple: "tuple[Agent, dict[str, Any]]",
         **kwargs,
     ) -> AgentResult:
         """Execute an agent with evaluation."""
         agent, agent_kwargs = agent_tuple
-        logger.info(f"Executing agent: {agent.name}")
+        logger.info("Executing agent: {}", agent.name)
         try:
             # Initialize results structure if not exists
             if agent.name not in self.results:
                 self.results[agent.name] = {}
-                logger.info(f"Initialized results structure for agent: {agent.name}")
+                logger.info("Initialized results structure for agent: {}", agent.name)
 
             # Track execution under parent agent if it exists
             if "previous_agent" in kwargs:
                 parent_key = f"{kwargs['previous_agent'].name}_{kwargs.get('task_id', 'default')}"
                 self.results[agent.name][parent_key] = AgentResult(status=AgentStatus.RUNNING)
-                logger.info(f"Tracking execution under parent agent: {kwargs['previous_agent'].name}")
+                logger.info("Tracking execution under parent agent: {}", kwargs["previous_agent"].name)
 
             # Execute agent
-            if "previous_agent" in kwargs:
-                user_prompt = agent_kwargs.get("user_prompt", "") + f"{kwargs['previous_result']}"
-                logger.info(f"Running agent with previous result from: {kwargs['previous_agent'].name}")
-                result = await agent.run(
-                    user_prompt=user_prompt,
-                    **{k: v for k, v in agent_kwargs.items() if k != "user_prompt"},
-                )
-            else:
-                logger.info("Running agent without previous result")
-                result = await agent.run(**agent_kwargs)
+            with profile_region("agent.run"):
+                result = await agent.run(**self._build_run_kwargs(agent_kwargs, **kwargs))
 
             # Store result
             result_key = f"{kwargs.get('previous_agent', agent).name}_{kwargs.get('task_id', 'default')}"
@@ -85,7 +85,7 @@ class AgentOrchestrator:
                 status=AgentStatus.COMPLETED,
                 data=result.data,
             )
-            logger.info(f"Stored result for key: {result_key}")
+            logger.info("Stored result for key: {}", result_key)
 
             return self.results[agent.name][result_key]
 
@@ -100,7 +100,7 @@ class AgentOrchestrator:
         logger.info("Starting parallel execution of agents")
 
         async def process_agent_level(
-            agent_tuple: tuple[Agent, dict[str, Any]],
+            agent_tuple: "tuple[Agent, dict[str, Any]]",
             previous_results: list[tuple[str, Any]] | None = None,
             level: int = 0,
         ) -> list[AgentResult]:
@@ -120,7 +120,7 @@ class AgentOrchestrator:
                 # Create tasks for each previous result
                 tasks = []
                 for task_id, prev_result in previous_results:
-                    logger.info(f"Creating task for previous result: {task_id}")
+                    logger.info("Creating task for previous result: {}", task_id)
                     task = create_task(
                         self.execute_agent_with_evaluation(
                             agent_tuple,
@@ -137,7 +137,7 @@ class AgentOrchestrator:
                     try:
                         result = await task
                         results.append((task_id, result))
-                        logger.info(f"Completed task: {task_id}")
+                        logger.info("Completed task: {}", task_id)
                     except Exception as e:
                         logger.error(f"Error in task {task_id}: {e}")
 
@@ -146,7 +146,7 @@ class AgentOrchestrator:
             for task_id, result in results:
                 if result.data:
                     data_list = result.data if isinstance(result.data, list) else [result.data]
-                    logger.info(f"Expanding {len(data_list)} results from task: {task_id}")
+                    logger.info("Expanding {} results from task: {}", len(data_list), task_id)
                     for i, data_item in enumerate(data_list):
                         expanded_results.append((f"{task_id}_subtask_{i}", data_item))
 
@@ -162,8 +162,116 @@ class AgentOrchestrator:
         logger.info("\nAll levels completed")
         return self.results
 
+    @profile_region("agent.run_stream")
+    async def execute_agent_streaming(
+        self,
+        agent_tuple: "tuple[Agent, dict[str, Any]]",
+        on_item: Callable[[int, Any], None],
+        **kwargs,
+    ) -> AgentResult:
+        """Execute an agent in streaming mode, calling `on_item` for each list element as soon as it is complete.
+
+        Args:
+            agent_tuple: The agent and its run arguments.
+            on_item: Callback receiving the index and value of every complete element of the result.
+            **kwargs: Same tracking arguments as `execute_agent_with_evaluation`.
+
+        Returns:
+            The final result of the agent.
+        """
+        agent, agent_kwargs = agent_tuple
+        logger.info("Streaming agent: {}", agent.name)
+        result_key = f"{kwargs.get('previous_agent', agent).name}_{kwargs.get('task_id', 'default')}"
+        agent_results = self.results.setdefault(agent.name, {})
+        agent_results[result_key] = AgentResult(status=AgentStatus.RUNNING)
+        try:
+            emitted = 0
+            data = None
+            async with agent.run_stream(**self._build_run_kwargs(agent_kwargs, **kwargs)) as result:
+                if not result.is_structured:
+                    data = await result.get_data()
+                else:
+                    async for message, is_last in result.stream_structured(debounce_by=self.stream_debounce):
+                        try:
+                            data = await result.validate_structured_result(message, allow_partial=not is_last)
+                        except ValidationError:
+                            # Early chunks may not even contain the result wrapper yet
+                            if is_last:
+                                raise
+                            continue
+                        # Partially validated lists only guarantee the elements before the last one are complete
+                        while isinstance(data, list) and emitted < len(data) - 1:
+                            on_item(emitted, data[emitted])
+                            emitted += 1
+
+            items = data if isinstance(data, list) else [data] if data else []
+            for i in range(emitted, len(items)):
+                on_item(i, items[i])
+
+            agent_results[result_key] = AgentResult(status=AgentStatus.COMPLETED, data=data)
+            logger.info("Stored streamed result for key: {}", result_key)
+            return agent_results[result_key]
+
+        except Exception as e:
+            agent_results[result_key] = AgentResult(status=AgentStatus.FAILED, msg=str(e))
+            logger.error(f"Error streaming agent {agent.name}: {e}")
+            raise
+
+    async def run_streaming(self, **kwargs) -> dict[str, dict[str, AgentResult]]:
+        """Execute agents as a pipeline, starting next level tasks as soon as each list element is parsed.
+
+        Produces the same results structure as `run_parallel`, but a downstream agent does not wait for the
+        whole upstream response (nor for the rest of its level) before starting.
+        """
+        logger.info("Starting streaming execution of agents")
+        scheduled: list[tuple[str, asyncio.Task]] = []
+
+        async def run_level(level: int, task_id: str, previous_result: Any = None) -> AgentResult:
+            level_kwargs: dict[str, Any] = {"task_id": f"level_{level}_{task_id}", **kwargs}
+            if level > 0:
+                level_kwargs.update(previous_agent=self.agents[level - 1][0], previous_result=previous_result)
+
+            def on_item(i: int, item: Any) -> None:
+                if level + 1 < len(self.agents):
+                    subtask_id = f"{task_id}_subtask_{i}"
+                    logger.info("Scheduling level {} task: {}", level + 1, subtask_id)
+                    scheduled.append((subtask_id, create_task(run_level(level + 1, subtask_id, item))))
+
+            return await self.execute_agent_streaming(self.agents[level], on_item, **level_kwargs)
+
+        try:
+            await run_level(0, "task_0")
+
+            awaited = 0
+            while awaited < len(scheduled):
+                batch = scheduled[awaited:]
+                awaited = len(scheduled)
+                outcomes = await asyncio.gather(*(task for _, task in batch), return_exceptions=True)
+                for (task_id, _), outcome in zip(batch, outcomes):
+                    if isinstance(outcome, Exception):
+                        logger.error(f"Error in task {task_id}: {outcome}")
+        finally:
+            # After an upstream failure or a cancellation, stop the downstream agents already started
+            pending = [task for _, task in scheduled if not task.done()]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        logger.info("\nAll streamed levels completed")
+        return self.results
+
 
 if __name__ == "__main__":
+    from ai_api_testing.agents.test_generator_agents.case_family_agent import (
+        default_test_case_family_agent,
+    )
+    from ai_api_testing.agents.test_generator_agents.case_test_generator_agent import (
+        default_test_case_generator_agent,
+    )
+    from ai_api_testing.agents.test_generator_agents.user_persona_modelling_agent import (
+        user_modelling_agent,
+    )
+
     dummy_api_spec = """
         api_spec = {
             "paths": {
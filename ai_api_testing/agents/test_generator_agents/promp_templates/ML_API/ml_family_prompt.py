@@ -9,5 +9,7 @@ ML_FAMILY_PROMPT = """
 
     Align with real use cases based on the training feature distributions. Include edge cases where features are far from the training distribution. Account for interactions between highly important features (as per SHAP and feature importance). Test fairness by including scenarios that test biases related to sensitive features. Be brief but descriptive so developers can implement simulations easily.
 
+    Do not write input values by hand. For each scenario set its sampling parameters instead: the design (lhs for realistic coverage, stratified, boundary for edge cases or random), the number of samples and, when the scenario focuses on a region, the narrower feature ranges. The inputs are then sampled from the training feature distributions.
+
     Output 5-10 medium level test scenarios, with variety and coverage of the model’s functionality.
     """
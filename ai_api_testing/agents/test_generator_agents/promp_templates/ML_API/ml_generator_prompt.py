@@ -13,7 +13,7 @@ ML_GENERATOR_PROMPT = """
     Method: Indicate the HTTP method (e.g., GET, POST, PUT, DELETE) being used.
     Input JSON: Include realistic input data strictly adhering to the API specification. Cover edge cases, typical inputs, and invalid inputs for robustness.
     Expected Output Prompt: Describe the expected behavior or output from the API in natural language.
-    Expected Output JSON: Provide the structured expected output, ensuring it aligns with the API's documented response format.
+    Expected Output JSON: Provide the structured expected output, ensuring it aligns with the API's documented response format. So it can be checked automatically, use the keys class (the expected prediction), min_probability/max_probability (bounds of the probability of probability_class, the positive class by default), min/max (bounds of a numeric prediction) and greater_than_case/less_than_case (the name of another test case whose prediction this one must be at least/at most).
     Preconditions: Specify any preconditions or dependencies required for the test case to be valid, such as system state, data setup, or prior API calls.
 
     Guidelines for Expansion:
@@ -0,0 +1,271 @@
+import re
+from collections.abc import Iterator, Mapping
+from typing import Any, Literal
+
+import numpy as np
+from pydantic import BaseModel
+
+from ai_api_testing.core.models import SamplingParams, TestCase, TestCaseFami
+
+Design = Literal["lhs", "stratified", "boundary", "random"]
+
+# Quantile keys of a polars `describe()` column, with their probability
+_DESCRIBE_QUANTILES = {"25%": 0.25, "50%": 0.5, "75%": 0.75}
+
+# Integer numpy or polars dtype names, e.g. `int64`, `UInt8` or `i4`
+_INTEGER_DTYPE = re.compile(r"u?int\d*|[iu]\d", re.IGNORECASE)
+
+# Below this normal mass within the range, e.g. a range far in a tail, values are drawn uniformly
+_MIN_NORMAL_MASS = 1e-9
+
+
+def norm_cdf(x: np.ndarray) -> np.ndarray:
+    """Standard normal CDF, through the Abramowitz-Stegun 7.1.26 erf approximation (error < 1.5e-7)."""
+    z = np.abs(x) / np.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.3275911 * z)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    erf = 1.0 - poly * np.exp(-z * z)
+    return 0.5 * (1.0 + np.sign(x) * erf)
+
+
+def norm_ppf(p: np.ndarray) -> np.ndarray:
+    """Standard normal inverse CDF, through Acklam's rational approximation (relative error < 1.2e-9)."""
+    a = (-3.969683028665376e01, 2.209460984245205e02, -2.759285104469687e02, 1.383577518672690e02,
+         -3.066479806614716e01, 2.506628277459239e00)  # fmt: skip
+    b = (-5.447609879822406e01, 1.615858368580409e02, -1.556989798598866e02, 6.680131188771972e01,
+         -1.328068155288572e01)  # fmt: skip
+    c = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e00, -2.549732539343734e00,
+         4.374664141464968e00, 2.938163982698783e00)  # fmt: skip
+    d = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e00, 3.754408661907416e00)
+
+    p = np.clip(np.asarray(p, dtype=float), 1e-300, 1 - 1e-16)
+
+    # Central region for every value, then the few tail values are overwritten
+    q = p - 0.5
+    r = q * q
+    x = (
+        (((((a[0] * r + a[1]) * r + a[2]) * r + a[3]) * r + a[4]) * r + a[5])
+        * q
+        / (((((b[0] * r + b[1]) * r + b[2]) * r + b[3]) * r + b[4]) * r + 1)
+    )
+
+    tail = np.minimum(p, 1 - p)
+    low = tail < 0.02425
+    q = np.sqrt(-2 * np.log(tail[low]))
+    tails = (((((c[0] * q + c[1]) * q + c[2]) * q + c[3]) * q + c[4]) * q + c[5]) / (
+        (((d[0] * q + d[1]) * q + d[2]) * q + d[3]) * q + 1
+    )
+    x[low] = np.where(p[low] < 0.5, tails, -tails)
+    return x
+
+
+class FeatureSpec(BaseModel):
+    """Marginal distribution of a numeric feature.
+
+    Values are drawn by inverse transform: through the quantiles when known, a normal truncated to the
+    range when only the mean and std are known, and uniformly over the range otherwise.
+    """
+
+    name: str
+    low: float
+    high: float
+    mean: float | None = None
+    std: float | None = None
+    quantiles: dict[float, float] | None = None
+    integer: bool = False
+
+    @classmethod
+    def from_stats(cls, name: str, stats: Mapping[str, Any], integer: bool | None = None) -> "FeatureSpec":
+        """Build from a `{"min", "max"}` range or the statistics of a polars `describe()` column.
+
+        Unless `integer` is given, the feature is integer when the stats have an integer `dtype`, e.g.
+        `Int64` from a polars schema or `int32` from numpy.
+        """
+        quantiles = {p: float(stats[key]) for key, p in _DESCRIBE_QUANTILES.items() if stats.get(key) is not None}
+        if integer is None:
+            integer = _INTEGER_DTYPE.fullmatch(str(stats.get("dtype", ""))) is not None
+        return cls(
+            name=name,
+            low=float(stats["min"]),
+            high=float(stats["max"]),
+            mean=float(stats["mean"]) if stats.get("mean") is not None else None,
+            std=float(stats["std"]) if stats.get("std") is not None else None,
+            quantiles=quantiles or None,
+            integer=integer,
+        )
+
+    def ppf(self, u: np.ndarray) -> np.ndarray:
+        """Map uniforms in [0, 1] to feature values."""
+        if self.quantiles:
+            probabilities = [0.0, *sorted(self.quantiles), 1.0]
+            values = [self.low, *(self.quantiles[p] for p in sorted(self.quantiles)), self.high]
+            x = np.interp(u, probabilities, values)
+        elif (bounds := self._normal_bounds()) is not None:
+            p_low, p_high = bounds
+            x = np.clip(self.mean + self.std * norm_ppf(p_low + u * (p_high - p_low)), self.low, self.high)
+        else:
+            x = self.low + u * (self.high - self.low)
+        return np.rint(x) if self.integer else x
+
+    def _normal_bounds(self) -> tuple[float, float] | None:
+        """Normal CDF at the range edges, None without a normal or with no normal mass in the range."""
+        if self.mean is None or not self.std:
+            return None
+        p_low, p_high = norm_cdf(np.array([self.low - self.mean, self.high - self.mean]) / self.std)
+        return (float(p_low), float(p_high)) if p_high - p_low > _MIN_NORMAL_MASS else None
+
+    def cdf(self, x: np.ndarray) -> np.ndarray:
+        """Probability of a value at most `x`, the inverse of `ppf`."""
+        x = np.asarray(x, dtype=float)
+        if self.quantiles:
+            probabilities = [0.0, *sorted(self.quantiles), 1.0]
+            values = [self.low, *(self.quantiles[p] for p in sorted(self.quantiles)), self.high]
+            p = np.interp(x, values, probabilities)
+        elif (bounds := self._normal_bounds()) is not None:
+            p_low, p_high = bounds
+            p = (norm_cdf((x - self.mean) / self.std) - p_low) / (p_high - p_low)
+        elif self.high > self.low:
+            p = (x - self.low) / (self.high - self.low)
+        else:
+            p = (x >= self.low).astype(float)
+        return np.where(x < self.low, 0.0, np.where(x >= self.high, 1.0, np.clip(p, 0.0, 1.0)))
+
+
+def features_from_stats(stats: Mapping[str, Mapping[str, Any]]) -> list[FeatureSpec]:
+    """Build the feature specs from per-feature statistics, skipping the non-numeric ones.
+
+    Features whose statistics have an integer `dtype`, e.g. added from the polars schema, are integer.
+    """
+    features = []
+    for name, feature_stats in stats.items():
+        try:
+            features.append(FeatureSpec.from_stats(name, feature_stats))
+        except (KeyError, TypeError, ValueError):
+            continue
+    return features
+
+
+class PopulationSampler:
+    """Vectorized generator of synthetic model inputs from feature distributions.
+
+    Designs produce a matrix of uniforms, optionally correlated with a Gaussian copula, which is then
+    mapped through each feature marginal. Columns follow the order of `features`, so the matrix can be
+    fed to `Predictable.predict` directly.
+
+    Args:
+        features: The feature marginals.
+        correlation: Optional target correlation, either a full matrix or `{(feature_a, feature_b): rho}`.
+        seed: Seed of the random generator, for reproducible populations.
+    """
+
+    def __init__(
+        self,
+        features: list[FeatureSpec],
+        correlation: np.ndarray | Mapping[tuple[str, str], float] | None = None,
+        seed: int | None = None,
+    ):
+        self.features = features
+        self.names = [feature.name for feature in features]
+        self.rng = np.random.default_rng(seed)
+        self._cholesky = self._compile_correlation(correlation) if correlation is not None else None
+
+    @classmethod
+    def from_stats(cls, stats: Mapping[str, Mapping[str, Any]], **kwargs) -> "PopulationSampler":
+        return cls(features_from_stats(stats), **kwargs)
+
+    def _compile_correlation(self, correlation: np.ndarray | Mapping[tuple[str, str], float]) -> np.ndarray:
+        if isinstance(correlation, Mapping):
+            matrix = np.eye(len(self.features))
+            positions = {name: i for i, name in enumerate(self.names)}
+            for (a, b), rho in correlation.items():
+                matrix[positions[a], positions[b]] = matrix[positions[b], positions[a]] = rho
+        else:
+            matrix = np.asarray(correlation, dtype=float)
+        try:
+            return np.linalg.cholesky(matrix)
+        except np.linalg.LinAlgError as e:
+            raise ValueError("The correlation matrix is not positive definite") from e
+
+    def _uniforms(self, n: int, design: Design, strata: int, boundary_fraction: float, margin: float) -> np.ndarray:
+        d = len(self.features)
+        if design == "random":
+            return self.rng.random((n, d))
+        if design == "lhs":
+            # One sample per each of the n equal-probability bins of every feature
+            bins = self.rng.permuted(np.tile(np.arange(n), (d, 1)), axis=1).T
+            return (bins + self.rng.random((n, d))) / n
+        if design == "stratified":
+            # Balanced allocation over `strata` equal-probability bins of every feature
+            bins = self.rng.permuted(np.tile(np.arange(n) % strata, (d, 1)), axis=1).T
+            return (bins + self.rng.random((n, d))) / strata
+        if design == "boundary":
+            u = self.rng.random((n, d))
+            at_edge = self.rng.random((n, d)) < boundary_fraction
+            offset = margin * self.rng.random((n, d))
+            edge = np.where(self.rng.random((n, d)) < 0.5, offset, 1 - offset)
+            return np.where(at_edge, edge, u)
+        raise ValueError(f"Unknown sampling design: {design}")
+
+    def _correlate(self, u: np.ndarray) -> np.ndarray:
+        """Impose the correlation with a Gaussian copula, keeping the uniform marginals."""
+        return norm_cdf(norm_ppf(u) @ self._cholesky.T)
+
+    def sample(
+        self,
+        n: int,
+        design: Design = "lhs",
+        strata: int = 10,
+        boundary_fraction: float = 0.5,
+        margin: float = 0.01,
+        feature_ranges: Mapping[str, tuple[float, float]] | None = None,
+    ) -> np.ndarray:
+        """Draw `n` inputs as an `(n, n_features)` matrix.
+
+        Args:
+            n: Number of inputs.
+            design: `lhs` (Latin hypercube), `stratified` (balanced over `strata` bins per feature),
+                `boundary` (features within `margin` of their range edges with probability
+                `boundary_fraction`) or `random`.
+            strata: Number of bins of the stratified design.
+            boundary_fraction: Probability of each feature being drawn at an edge in the boundary design.
+            margin: Width of the edges of the boundary design, as a fraction of the probability range.
+            feature_ranges: Optional narrower `(min, max)` per feature, e.g. set by a scenario family.
+        """
+        u = self._uniforms(n, design, strata, boundary_fraction, margin)
+        if self._cholesky is not None and design != "boundary":
+            u = self._correlate(u)
+
+        x = np.empty_like(u)
+        for j, feature in enumerate(self.features):
+            if feature_ranges and feature.name in feature_ranges:
+                low, high = feature_ranges[feature.name]
+                feature = feature.model_copy(update={"low": low, "high": high, "quantiles": None})
+            x[:, j] = feature.ppf(u[:, j])
+        return x
+
+    def sample_family(self, family: TestCaseFami, n: int | None = None) -> np.ndarray:
+        """Draw the inputs of a scenario family with the sampling parameters it was generated with."""
+        params = family.sampling or SamplingParams()
+        return self.sample(
+            n if n is not None else params.n_samples,
+            design=params.design,
+            strata=params.strata,
+            boundary_fraction=params.boundary_fraction,
+            feature_ranges=params.feature_ranges,
+        )
+
+    def iter_test_cases(
+        self, x: np.ndarray, family: TestCaseFami, path: str = "/predict", method: str = "POST"
+    ) -> Iterator[TestCase]:
+        """Wrap sampled rows as test cases, lazily since a population can hold millions of rows."""
+        for i, row in enumerate(x.tolist()):
+            yield TestCase(
+                name=f"{family.name} {i}",
+                description=family.description,
+                path=path,
+                method=method,
+                input_json=dict(zip(self.names, row)),
+                expected_output_prompt=None,
+                expected_output_json=None,
+                preconditions=None,
+            )
@@ -16,6 +16,7 @@ class UserPersona(BaseModel):
 
 user_modelling_agent = Agent(
     "openai:gpt-4o-mini",
+    defer_model_check=True,
     name="user_modelling_agent",
     retries=1,
     result_type=list[UserPersona],
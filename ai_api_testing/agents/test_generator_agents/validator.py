@@ -0,0 +1,447 @@
+import hashlib
+import json
+import re
+from collections import OrderedDict
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Hashable, Iterable, Iterator, Mapping
+from typing import Any, Generic, TypeVar
+
+from pydantic import BaseModel, Field, PrivateAttr
+
+from ai_api_testing.agents.api_specs_agents.base_extractor import APIEndpoint
+from ai_api_testing.agents.api_specs_agents.lazy_spec import LazyJSONObject
+from ai_api_testing.agents.api_specs_agents.path_index import PathIndex
+from ai_api_testing.agents.api_specs_agents.ref_resolver import RefResolver
+from ai_api_testing.core.models import TestCase
+from ai_api_testing.utils.logger import logger
+
+# A compiled check appends human readable errors for `instance` (located at `location`) to `errors`
+Check = Callable[[Any, str, list[str]], None]
+
+_JSON_TYPES: dict[str, Callable[[Any], bool]] = {
+    "string": lambda v: isinstance(v, str),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "number": lambda v: isinstance(v, int | float) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "null": lambda v: v is None,
+}
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    """Mapping keeping the `maxsize` most recently used entries."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[K, V] = OrderedDict()
+
+    def get(self, key: K) -> V | None:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: K, value: V) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Compiled validators by (root document hash, schema hash)
+_VALIDATOR_CACHE: LRUCache[tuple[str, str], "CompiledSchema"] = LRUCache(maxsize=4096)
+
+
+def schema_hash(schema: Any) -> str:
+    """Stable content hash of a schema."""
+    payload = json.dumps(schema, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def document_hash(document: Mapping[str, Any] | None) -> str:
+    """Content hash of the document `$ref`s resolve against, empty without document.
+
+    Lazily loaded documents are hashed from their raw bytes, without decoding them. The hash is meant
+    to be computed once per document and passed to `compile_schema` for each of its schemas.
+    """
+    if document is None:
+        return ""
+    if isinstance(document, LazyJSONObject):
+        return hashlib.sha256(document.source).hexdigest()
+    return schema_hash(document)
+
+
+def _reject_external_document(uri: str) -> Any:
+    raise ValueError(f"External reference to {uri} is not supported in compiled schemas")
+
+
+def local_ref_resolver(root: Mapping[str, Any] | None) -> RefResolver:
+    """Resolver of the local `$ref`s (`#/components/schemas/...`) of the schemas compiled against `root`."""
+    return RefResolver(root or {}, loader=_reject_external_document)
+
+
+def lookup_schema(resolver: RefResolver, ref: str) -> Any:
+    """Target schema of a `$ref`, or an empty schema accepting any value when it cannot be resolved.
+
+    Extracted request bodies keep `{"$ref": ...}` placeholders where a schema references itself, and are
+    often compiled without the spec they were extracted from.
+    """
+    try:
+        return resolver.lookup(ref)
+    except ValueError as e:
+        logger.warning(f"Accepting any value for the unresolvable reference {ref}: {e}")
+        return {}
+
+
+def required_properties(schema: dict[str, Any]) -> tuple[str, ...]:
+    """Names of the required properties of an object schema, without duplicates."""
+    required = schema.get("required", [])
+    required = list(required) if isinstance(required, list) else []
+    # Swagger 2.0 parameters flattened by the extractors flag `required: true` on the property itself
+    required += [
+        name
+        for name, prop in schema.get("properties", {}).items()
+        if isinstance(prop, dict) and prop.get("required") is True
+    ]
+    return tuple(dict.fromkeys(required))
+
+
+class CompiledSchema:
+    """A JSON schema compiled once into a tree of closures."""
+
+    __slots__ = ("_check", "schema_hash")
+
+    def __init__(self, schema_hash: str, check: Check):
+        self.schema_hash = schema_hash
+        self._check = check
+
+    def errors(self, instance: Any) -> list[str]:
+        """Return the validation errors for `instance`, empty if it is valid."""
+        errors: list[str] = []
+        self._check(instance, "$", errors)
+        return errors
+
+    def is_valid(self, instance: Any) -> bool:
+        return not self.errors(instance)
+
+
+class _SchemaCompiler:
+    """Compile JSON schema dicts into closures, resolving `$ref`s against a root document."""
+
+    def __init__(self, root: Mapping[str, Any] | None):
+        self._resolver = local_ref_resolver(root)
+        self._refs: dict[str, Check] = {}
+
+    def compile(self, schema: Any) -> Check:
+        if not isinstance(schema, dict) or not schema:
+            return _accept
+
+        if "$ref" in schema:
+            return self._compile_ref(schema["$ref"])
+
+        checks: list[Check] = []
+        nullable = schema.get("nullable", False)
+
+        types = schema.get("type")
+        if types is not None:
+            checks.append(_type_check(types if isinstance(types, list) else [types], nullable))
+        if "enum" in schema:
+            checks.append(_enum_check(schema["enum"]))
+        if "const" in schema:
+            checks.append(_enum_check([schema["const"]]))
+
+        checks.extend(self._object_checks(schema))
+        checks.extend(self._array_checks(schema))
+        checks.extend(_string_checks(schema))
+        checks.extend(_number_checks(schema))
+
+        for keyword in ("allOf", "anyOf", "oneOf"):
+            if keyword in schema:
+                checks.append(_combinator_check(keyword, [self.compile(s) for s in schema[keyword]]))
+
+        if not checks:
+            return _accept
+        if len(checks) == 1 and not nullable:
+            return checks[0]
+
+        def check(instance: Any, location: str, errors: list[str]) -> None:
+            if instance is None and nullable:
+                return
+            for c in checks:
+                c(instance, location, errors)
+
+        return check
+
+    def _compile_ref(self, ref: str) -> Check:
+        if ref in self._refs:
+            return self._refs[ref]
+
+        # Register a trampoline first so self-referencing schemas compile without infinite recursion
+        target: list[Check] = []
+
+        def check(instance: Any, location: str, errors: list[str]) -> None:
+            target[0](instance, location, errors)
+
+        self._refs[ref] = check
+        target.append(self.compile(lookup_schema(self._resolver, ref)))
+        return check
+
+    def _object_checks(self, schema: dict[str, Any]) -> Iterator[Check]:
+        properties: dict[str, Any] = schema.get("properties", {})
+        required_names = required_properties(schema)
+
+        if required_names:
+
+            def check_required(instance: Any, location: str, errors: list[str]) -> None:
+                if isinstance(instance, dict):
+                    for name in required_names:
+                        if name not in instance:
+                            errors.append(f"{location}: missing required field '{name}'")
+
+            yield check_required
+
+        yield from self._property_checks(properties)
+
+        additional = schema.get("additionalProperties", True)
+        if additional is not True:
+            yield self._additional_check(additional, frozenset(properties))
+
+    def _property_checks(self, properties: dict[str, Any]) -> Iterator[Check]:
+        if properties:
+            compiled = {name: self.compile(prop) for name, prop in properties.items()}
+            compiled = {name: c for name, c in compiled.items() if c is not _accept}
+            if compiled:
+
+                def check_properties(instance: Any, location: str, errors: list[str]) -> None:
+                    if isinstance(instance, dict):
+                        for name, c in compiled.items():
+                            if name in instance:
+                                c(instance[name], f"{location}.{name}", errors)
+
+                yield check_properties
+
+    def _additional_check(self, additional: Any, known: frozenset[str]) -> Check:
+        extra_check = None if additional is False else self.compile(additional)
+
+        def check(instance: Any, location: str, errors: list[str]) -> None:
+            if isinstance(instance, dict):
+                for name, value in instance.items():
+                    if name in known:
+                        continue
+                    if extra_check is None:
+                        errors.append(f"{location}: unexpected field '{name}'")
+                    else:
+                        extra_check(value, f"{location}.{name}", errors)
+
+        return check
+
+    def _array_checks(self, schema: dict[str, Any]) -> Iterator[Check]:
+        if isinstance(schema.get("items"), dict):
+            item_check = self.compile(schema["items"])
+            if item_check is not _accept:
+
+                def check_items(instance: Any, location: str, errors: list[str]) -> None:
+                    if isinstance(instance, list):
+                        for i, item in enumerate(instance):
+                            item_check(item, f"{location}[{i}]", errors)
+
+                yield check_items
+
+        min_items, max_items = schema.get("minItems"), schema.get("maxItems")
+        if min_items is not None or max_items is not None:
+            yield _bounds_check(min_items, max_items, list, len, "items")
+
+
+def _accept(instance: Any, location: str, errors: list[str]) -> None:
+    return None
+
+
+def _type_check(types: list[str], nullable: bool) -> Check:
+    predicates = [_JSON_TYPES[t] for t in types if t in _JSON_TYPES]
+    if nullable:
+        predicates.append(_JSON_TYPES["null"])
+    expected = "|".join(types)
+
+    def check(instance: Any, location: str, errors: list[str]) -> None:
+        for predicate in predicates:
+            if predicate(instance):
+                return
+        errors.append(f"{location}: expected {expected}, got {type(instance).__name__}")
+
+    return check
+
+
+def _enum_check(values: list[Any]) -> Check:
+    def check(instance: Any, location: str, errors: list[str]) -> None:
+        if instance not in values:
+            errors.append(f"{location}: {instance!r} is not one of {values!r}")
+
+    return check
+
+
+def _bounds_check(minimum: Any, maximum: Any, kind: type | tuple[type, ...], size: Callable, label: str) -> Check:
+    def check(instance: Any, location: str, errors: list[str]) -> None:
+        if isinstance(instance, kind) and not isinstance(instance, bool):
+            value = size(instance)
+            if minimum is not None and value < minimum:
+                errors.append(f"{location}: {label} {value} is below the minimum {minimum}")
+            if maximum is not None and value > maximum:
+                errors.append(f"{location}: {label} {value} is above the maximum {maximum}")
+
+    return check
+
+
+def _string_checks(schema: dict[str, Any]) -> Iterator[Check]:
+    min_length, max_length = schema.get("minLength"), schema.get("maxLength")
+    if min_length is not None or max_length is not None:
+        yield _bounds_check(min_length, max_length, str, len, "length")
+
+    if "pattern" in schema:
+        pattern = re.compile(schema["pattern"])
+
+        def check_pattern(instance: Any, location: str, errors: list[str]) -> None:
+            if isinstance(instance, str) and not pattern.search(instance):
+                errors.append(f"{location}: {instance!r} does not match '{pattern.pattern}'")
+
+        yield check_pattern
+
+
+def _number_checks(schema: dict[str, Any]) -> Iterator[Check]:
+    minimum, maximum = schema.get("minimum"), schema.get("maximum")
+    if minimum is not None or maximum is not None:
+        yield _bounds_check(minimum, maximum, (int, float), lambda v: v, "value")
+
+    exclusive_min, exclusive_max = schema.get("exclusiveMinimum"), schema.get("exclusiveMaximum")
+    # OpenAPI 3.0 uses booleans modifying minimum/maximum, JSON schema uses numbers
+    if isinstance(exclusive_min, bool):
+        exclusive_min = minimum if exclusive_min else None
+    if isinstance(exclusive_max, bool):
+        exclusive_max = maximum if exclusive_max else None
+    if exclusive_min is not None or exclusive_max is not None:
+
+        def check_exclusive(instance: Any, location: str, errors: list[str]) -> None:
+            if isinstance(instance, int | float) and not isinstance(instance, bool):
+                if exclusive_min is not None and instance <= exclusive_min:
+                    errors.append(f"{location}: value {instance} must be greater than {exclusive_min}")
+                if exclusive_max is not None and instance >= exclusive_max:
+                    errors.append(f"{location}: value {instance} must be less than {exclusive_max}")
+
+        yield check_exclusive
+
+
+def _combinator_check(keyword: str, checks: list[Check]) -> Check:
+    def check(instance: Any, location: str, errors: list[str]) -> None:
+        results = []
+        for c in checks:
+            sub_errors: list[str] = []
+            c(instance, location, sub_errors)
+            results.append(sub_errors)
+        passed = sum(1 for r in results if not r)
+        if keyword == "allOf":
+            for r in results:
+                errors.extend(r)
+        elif keyword == "anyOf" and passed == 0:
+            errors.append(f"{location}: does not match any of the anyOf schemas")
+        elif keyword == "oneOf" and passed != 1:
+            errors.append(f"{location}: matches {passed} of the oneOf schemas, expected exactly one")
+
+    return check
+
+
+def compile_schema(
+    schema: dict[str, Any] | None, root: Mapping[str, Any] | None = None, root_hash: str | None = None
+) -> CompiledSchema:
+    """Compile a JSON schema into a validator, reusing a cached one for identical schemas.
+
+    Args:
+        schema: The JSON schema, e.g. `APIEndpoint.request_body`.
+        root: The document local `$ref`s (`#/components/schemas/...`) resolve against.
+        root_hash: The `document_hash` of `root`, computed if not given.
+
+    Returns:
+        The compiled validator, shared by every schema with the same content hash and root document.
+    """
+    key = (document_hash(root) if root_hash is None else root_hash, schema_hash(schema))
+    compiled = _VALIDATOR_CACHE.get(key)
+    if compiled is None:
+        compiled = CompiledSchema(key[1], _SchemaCompiler(root).compile(schema))
+        _VALIDATOR_CACHE.put(key, compiled)
+    return compiled
+
+
+class ValidatedCase(BaseModel):
+    """A test case tagged with the result of validating its input against the endpoint schema."""
+
+    test_case: TestCase
+    valid: bool
+    errors: list[str] = Field(default_factory=list)
+
+
+class CaseValidator(BaseModel):
+    """Validates generated test case inputs against the request body schema of their endpoint.
+
+    Each endpoint schema is compiled once (and cached by content hash across validators), so the
+    validator can be run in bulk over a stream of test cases before they reach any executor. Test cases
+    are matched to their endpoint by path template, so concrete paths such as `/pets/42` target
+    `/pets/{petId}`.
+
+    Attributes:
+        endpoints: The endpoints the test cases target.
+        root_spec: Optional full spec used to resolve `$ref`s left in the endpoint schemas.
+    """
+
+    endpoints: list[APIEndpoint]
+    root_spec: Mapping[str, Any] | None = None
+
+    # The compiled request body schema of every operation, None for the ones without body
+    _index: PathIndex = PrivateAttr(default_factory=PathIndex)
+
+    def model_post_init(self, context: Any, /) -> None:
+        root_hash = document_hash(self.root_spec)
+        for endpoint in self.endpoints:
+            validator = (
+                compile_schema(endpoint.request_body, self.root_spec, root_hash) if endpoint.request_body else None
+            )
+            self._index.add(endpoint.path, endpoint.method, validator)
+
+    def check(self, test_case: TestCase) -> ValidatedCase:
+        """Validate a single test case."""
+        found = self._index.match(test_case.path, test_case.method)
+        if found is None:
+            return ValidatedCase(
+                test_case=test_case,
+                valid=False,
+                errors=[f"No endpoint {test_case.method.upper()} {test_case.path} in the specification"],
+            )
+
+        validator = found.value
+        if validator is None:
+            return ValidatedCase(test_case=test_case, valid=True)
+
+        payloads = test_case.input_json if isinstance(test_case.input_json, list) else [test_case.input_json]
+        errors: list[str] = []
+        for payload in payloads:
+            errors.extend(validator.errors({} if payload is None else payload))
+        return ValidatedCase(test_case=test_case, valid=not errors, errors=errors)
+
+    def validate_cases(self, test_cases: Iterable[TestCase]) -> Iterator[ValidatedCase]:
+        """Lazily tag every test case of the stream as valid or invalid."""
+        for test_case in test_cases:
+            yield self.check(test_case)
+
+    def filter_valid(self, test_cases: Iterable[TestCase]) -> Iterator[TestCase]:
+        """Lazily drop the test cases whose input does not match the endpoint schema."""
+        for validated in self.validate_cases(test_cases):
+            if validated.valid:
+                yield validated.test_case
+
+    async def avalidate_cases(self, test_cases: AsyncIterable[TestCase]) -> AsyncIterator[ValidatedCase]:
+        """Async counterpart of `validate_cases` for streamed test cases."""
+        async for test_case in test_cases:
+            yield self.check(test_case)
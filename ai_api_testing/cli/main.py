@@ -1,10 +1,11 @@
 import asyncio
+import json
+from pathlib import Path
 from typing import Annotated
 
 import typer
 
-from ai_api_testing.agents.agent_specs_extractor import main
-from ai_api_testing.utils.logger import logger
+from ai_api_testing.utils.logger import configure_logging, logger, logging_options_from_env
 
 app = typer.Typer(no_args_is_help=True)
 specs_app = typer.Typer(no_args_is_help=True)
@@ -12,8 +13,33 @@ app.add_typer(specs_app, name="specs")
 
 
 @app.callback()
-def callback():
+def callback(
+    ctx: typer.Context,
+    log_level: Annotated[str | None, typer.Option(help="Minimum log level, overrides AI_API_TESTING_LOG_LEVEL")] = None,
+    log_json: Annotated[bool, typer.Option(help="Write one JSON object per log record")] = False,
+    profile: Annotated[
+        Path | None,
+        typer.Option(help="Profile the command into this pstats file, with a JSON report of the hot spots next to it"),
+    ] = None,
+    profile_top: Annotated[int, typer.Option(help="Number of entries of the profile summary")] = 20,
+    profile_memory: Annotated[
+        bool, typer.Option(help="Also trace the Python allocations of a profiled command, which slows it down")
+    ] = False,
+):
     """Awesome API testing tool."""
+    if log_level is not None or log_json:
+        options = logging_options_from_env()
+        if log_level is not None:
+            options["level"] = log_level.upper()
+        if log_json:
+            options["serialize"] = True
+        configure_logging(**options)
+    if profile is not None:
+        from ai_api_testing.utils.profiling import Profiler
+
+        profiler = Profiler(profile, top=profile_top, trace_memory=profile_memory)
+        profiler.start()
+        ctx.call_on_close(profiler.stop)
 
 
 @app.command()
@@ -25,9 +51,54 @@ def ping():
 @specs_app.command()
 def extract(url: Annotated[str, typer.Argument(help="The URL of the API to extract specs from")]):
     """Extract API specs."""
+    from ai_api_testing.agents.agent_specs_extractor import main
+
     logger.info(f"Extracting specs from {url}")
     asyncio.run(main(url))
 
 
+@specs_app.command()
+def bulk(
+    sources: Annotated[
+        Path, typer.Argument(help="File with one URL or local spec file per line, or - for stdin", allow_dash=True)
+    ],
+    output: Annotated[Path, typer.Option("--output", "-o", help="JSON lines file the endpoints are written to")] = Path(
+        "endpoints.jsonl"
+    ),
+    concurrency: Annotated[int, typer.Option(help="Maximum number of services extracted at once")] = 8,
+    timeout: Annotated[float, typer.Option(help="Timeout in seconds for each service")] = 120.0,
+    endpoints: Annotated[
+        list[str] | None, typer.Option("--endpoint", help="Endpoint selection, can be repeated")
+    ] = None,
+    report: Annotated[Path | None, typer.Option(help="JSON file the per-service report is written to")] = None,
+    cache: Annotated[
+        bool, typer.Option(help="Revalidate previously downloaded specs instead of downloading them")
+    ] = True,
+):
+    """Extract the specs of many services concurrently, without any LLM."""
+    from ai_api_testing.agents.api_specs_agents.bulk_extractor import extract_many, log_summary, read_sources
+    from ai_api_testing.agents.api_specs_agents.spec_cache import SpecCache
+
+    urls = read_sources(sources)
+    logger.info(f"Extracting specs from {len(urls)} services into {output}")
+    with open(output, "w") as out:
+        reports = asyncio.run(
+            extract_many(
+                urls,
+                out,
+                concurrency=concurrency,
+                timeout=timeout,
+                endpoint_list=endpoints,
+                cache=SpecCache() if cache else None,
+            )
+        )
+
+    log_summary(reports)
+    if report is not None:
+        report.write_text(json.dumps([service.model_dump() for service in reports], indent=2))
+    if not all(service.ok for service in reports):
+        raise typer.Exit(code=1)
+
+
 if __name__ == "__main__":
     app()
@@ -0,0 +1,244 @@
+import json
+import mmap
+import os
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from typing_extensions import Self
+
+from ai_api_testing.core.models import TestCase
+from ai_api_testing.utils.logger import logger
+
+CORPUS_VERSION = 1
+
+RECORDS_FILE = "records.jsonl"
+OFFSETS_FILE = "offsets.i64"
+KEYS_FILE = "keys.u32"
+INDEX_FILE = "index.json"
+
+# Columns of the key codes of every record, the secondary indexes
+KEY_COLUMNS = ("endpoint", "family", "persona")
+
+
+def endpoint_key(path: str, method: str) -> str:
+    """Key of the endpoint index, e.g. `POST /predict`."""
+    return f"{method.upper()} {path}"
+
+
+class TestCaseCorpus:
+    """Persistent append-only corpus of test cases, opened without decoding it.
+
+    A corpus is a directory with:
+
+    - `records.jsonl`: the test cases, one JSON document per line, only ever appended to.
+    - `offsets.i64`: the end offset of every record, memory-mapped, so record `i` is read without scanning.
+    - `keys.u32`: the endpoint (`METHOD path`), family and persona codes of every record, memory-mapped.
+      Selections are vectorized scans of these columns.
+    - `index.json`: the vocabularies the codes refer to.
+
+    Records are appended first and the offsets last, so after an interrupted write the offsets only
+    cover complete records and the trailing data is dropped when the corpus is next opened for writing.
+    Test cases are decoded and validated only when accessed.
+
+    Args:
+        path: The corpus directory, created if missing in write mode.
+        mode: `r` to read, `a` to also append.
+    """
+
+    def __init__(self, path: str | Path, mode: str = "r"):
+        if mode not in ("r", "a"):
+            raise ValueError(f"Unknown corpus mode {mode}, expected r or a")
+        self.path = Path(path)
+        self.mode = mode
+        if mode == "a":
+            self.path.mkdir(parents=True, exist_ok=True)
+            for name in (RECORDS_FILE, OFFSETS_FILE, KEYS_FILE):
+                (self.path / name).touch()
+        elif not (self.path / OFFSETS_FILE).exists():
+            raise ValueError(f"No test case corpus at {self.path}")
+
+        self._mapped: mmap.mmap | None = None
+        self._pending_records: list[bytes] = []
+        self._pending_keys: list[tuple[int, int, int]] = []
+        self.refresh()
+        if mode == "a":
+            self._recover()
+
+    def refresh(self) -> None:
+        """Reload the vocabularies and offsets, e.g. to see the records flushed by another writer since opening."""
+        self._vocab: dict[str, list[str | None]] = {column: [] for column in KEY_COLUMNS}
+        if (self.path / INDEX_FILE).exists():
+            stored = json.loads((self.path / INDEX_FILE).read_bytes())
+            if stored.get("version") != CORPUS_VERSION:
+                raise ValueError(f"Unsupported corpus version {stored.get('version')}")
+            self._vocab = stored["vocab"]
+        self._codes = {
+            column: {value: code for code, value in enumerate(values)} for column, values in self._vocab.items()
+        }
+        self._load_index()
+
+    def _load_index(self) -> None:
+        offsets_path, keys_path = self.path / OFFSETS_FILE, self.path / KEYS_FILE
+        n = min(offsets_path.stat().st_size // 8, keys_path.stat().st_size // (4 * len(KEY_COLUMNS)))
+        self._offsets = np.memmap(offsets_path, dtype=np.int64, mode="r", shape=(n,)) if n else np.empty(0, np.int64)
+        self._keys = (
+            np.memmap(keys_path, dtype=np.uint32, mode="r", shape=(n, len(KEY_COLUMNS)))
+            if n
+            else np.empty((0, len(KEY_COLUMNS)), np.uint32)
+        )
+
+    def _recover(self) -> None:
+        """Drop the data of an interrupted write, past the last complete record."""
+        n = len(self._offsets)
+        end = int(self._offsets[-1]) if n else 0
+        for name, size in (
+            (RECORDS_FILE, end),
+            (OFFSETS_FILE, n * 8),
+            (KEYS_FILE, n * 4 * len(KEY_COLUMNS)),
+        ):
+            if (self.path / name).stat().st_size > size:
+                logger.warning(f"Dropping the incomplete data at the end of {self.path / name}")
+                os.truncate(self.path / name, size)
+
+    def __len__(self) -> int:
+        """Number of flushed records."""
+        return len(self._offsets)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _code(self, column: str, value: str | None) -> int:
+        code = self._codes[column].get(value)
+        if code is None:
+            code = self._codes[column][value] = len(self._vocab[column])
+            self._vocab[column].append(value)
+        return code
+
+    def append(self, test_case: TestCase, family: str | None = None, persona: str | None = None) -> int:
+        """Append a test case, returning its record id. It can be read once flushed."""
+        if self.mode != "a":
+            raise ValueError("The corpus is not open for appending")
+        self._pending_records.append(test_case.model_dump_json().encode())
+        self._pending_keys.append(
+            (
+                self._code("endpoint", endpoint_key(test_case.path, test_case.method)),
+                self._code("family", family),
+                self._code("persona", persona),
+            )
+        )
+        return len(self._offsets) + len(self._pending_records) - 1
+
+    def extend(
+        self,
+        test_cases: Iterable[TestCase],
+        family: str | None = None,
+        persona: str | None = None,
+        flush_every: int = 10_000,
+    ) -> None:
+        """Append a stream of test cases of a family, flushing every `flush_every` records."""
+        for test_case in test_cases:
+            self.append(test_case, family, persona)
+            if len(self._pending_records) >= flush_every:
+                self.flush()
+
+    def flush(self) -> None:
+        """Write the pending records, then their keys and vocabularies, and last their offsets."""
+        if not self._pending_records:
+            return
+        start = int(self._offsets[-1]) if len(self._offsets) else 0
+        ends = start + np.cumsum([len(record) + 1 for record in self._pending_records], dtype=np.int64)
+
+        with open(self.path / RECORDS_FILE, "ab") as f:
+            f.write(b"\n".join(self._pending_records) + b"\n")
+        self._write_vocab()
+        with open(self.path / KEYS_FILE, "ab") as f:
+            f.write(np.asarray(self._pending_keys, dtype=np.uint32).tobytes())
+        with open(self.path / OFFSETS_FILE, "ab") as f:
+            f.write(ends.tobytes())
+
+        self._pending_records, self._pending_keys = [], []
+        self._load_index()
+
+    def _write_vocab(self) -> None:
+        # Write then rename so readers never see a partial index
+        tmp_path = self.path / f"{INDEX_FILE}.{os.getpid()}.tmp"
+        tmp_path.write_text(json.dumps({"version": CORPUS_VERSION, "vocab": self._vocab}))
+        os.replace(tmp_path, self.path / INDEX_FILE)
+
+    def close(self) -> None:
+        self.flush()
+        if self._mapped is not None:
+            self._mapped.close()
+            self._mapped = None
+
+    def _records(self) -> mmap.mmap:
+        """The records file mapping, remapped when flushed records are past its end."""
+        end = int(self._offsets[-1])
+        if self._mapped is None or len(self._mapped) < end:
+            if self._mapped is not None:
+                self._mapped.close()
+            with open(self.path / RECORDS_FILE, "rb") as f:
+                self._mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mapped
+
+    def raw(self, i: int) -> bytes:
+        """The JSON document of record `i`, without decoding it."""
+        if i < 0:
+            i += len(self._offsets)
+        if not 0 <= i < len(self._offsets):
+            raise IndexError(f"Record {i} out of range, the corpus has {len(self._offsets)} flushed records")
+        start = int(self._offsets[i - 1]) if i else 0
+        # Without the trailing newline
+        return self._records()[start : int(self._offsets[i]) - 1]
+
+    def __getitem__(self, i: int) -> TestCase:
+        return TestCase.model_validate_json(self.raw(i))
+
+    def __iter__(self) -> Iterator[TestCase]:
+        return self.iter_cases()
+
+    def iter_cases(self, ids: Iterable[int] | None = None) -> Iterator[TestCase]:
+        """Decode the records `ids` (by default all of them) one at a time."""
+        for i in range(len(self._offsets)) if ids is None else ids:
+            yield self[int(i)]
+
+    def select(
+        self,
+        path: str | None = None,
+        method: str | None = None,
+        family: str | None = None,
+        persona: str | None = None,
+    ) -> np.ndarray:
+        """Ids of the flushed records matching all the given keys, in append order."""
+        mask = np.ones(len(self._offsets), dtype=bool)
+        if path is not None or method is not None:
+            codes = [
+                code
+                for code, key in enumerate(self._vocab["endpoint"])
+                if (method is None or key.split(" ", 1)[0] == method.upper())
+                and (path is None or key.split(" ", 1)[1] == path)
+            ]
+            mask &= np.isin(self._keys[:, 0], codes)
+        for column, value in (("family", family), ("persona", persona)):
+            if value is not None:
+                code = self._codes[column].get(value)
+                if code is None:
+                    return np.empty(0, dtype=np.int64)
+                mask &= self._keys[:, KEY_COLUMNS.index(column)] == code
+        return np.flatnonzero(mask)
+
+    def counts(self, column: str) -> dict[str | None, int]:
+        """Number of flushed records by endpoint, family or persona."""
+        if column not in KEY_COLUMNS:
+            raise ValueError(f"Unknown corpus index {column}, expected one of {', '.join(KEY_COLUMNS)}")
+        counts = np.bincount(self._keys[:, KEY_COLUMNS.index(column)], minlength=len(self._vocab[column]))
+        return {value: int(count) for value, count in zip(self._vocab[column], counts) if count}
+
+    def keys(self, i: int) -> dict[str, Any]:
+        """The endpoint, family and persona of record `i`."""
+        return {column: self._vocab[column][int(code)] for column, code in zip(KEY_COLUMNS, self._keys[i])}
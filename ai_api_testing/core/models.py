@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Literal
 
 from pydantic import BaseModel, Field
 
@@ -19,6 +19,29 @@ class TestCase(BaseModel):
     )
     preconditions: str | None = Field(description="Any relevant preconditions for the test case")
 
+    def input_rows(self) -> list[dict[str, Any]]:
+        """The inputs as a list of rows, a list `input_json` holding one row per item."""
+        if self.input_json is None:
+            return []
+        return self.input_json if isinstance(self.input_json, list) else [self.input_json]
+
+
+class SamplingParams(BaseModel):
+    """How to sample the bulk inputs of a scenario family, instead of writing every input by hand."""
+
+    design: Literal["lhs", "stratified", "boundary", "random"] = Field(
+        default="lhs",
+        description="Sampling design: lhs (space filling), stratified, boundary (values at the range edges) or random",
+    )
+    n_samples: int = Field(default=1000, description="The number of inputs to sample for the family")
+    feature_ranges: dict[str, tuple[float, float]] | None = Field(
+        default=None, description="Optional narrower [min, max] range per feature for this family"
+    )
+    boundary_fraction: float = Field(
+        default=0.5, description="For the boundary design, the probability of each feature being at a range edge"
+    )
+    strata: int = Field(default=10, description="For the stratified design, the number of bins per feature")
+
 
 class TestCaseFami(BaseModel):
     """A test case family is a group of test cases that are related to a specific user or service persona."""
@@ -27,3 +50,6 @@ class TestCaseFami(BaseModel):
     description: str = Field(description="The description of the test case family")
     test_case_type: str = Field(description="The type of the test case family")
     test_variations: list[str] = Field(description="The variations of the test case family")
+    sampling: SamplingParams | None = Field(
+        default=None, description="For numeric model inputs, how to sample the inputs of the family"
+    )
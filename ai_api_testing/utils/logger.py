@@ -1,4 +1,7 @@
+import os
 import sys
+from collections.abc import Mapping
+from typing import Any, TextIO
 
 from loguru import logger
 
@@ -12,11 +15,124 @@ DEFAULT_FORMAT = (
     "<level>{message}</level>"
 )
 
-logger.add(
-    sys.stderr,
-    colorize=True,
-    format=DEFAULT_FORMAT,
-    level="INFO",
-)
+# Environment variables read when the package is imported, e.g. by workers that have no CLI
+ENV_PREFIX = "AI_API_TESTING_LOG_"
+
+# Only records below this level are sampled, warnings and errors are always kept
+_SAMPLED_BELOW = logger.level("WARNING").no
+
+_handler_id: int | None = None
+
+
+class RecordFilter:
+    """Per-module level gating and per call site sampling of log records.
+
+    Args:
+        level: Level of the modules without a specific one.
+        module_levels: Levels by module prefix, e.g. `{"ai_api_testing.agents.test_generator_agents": "WARNING"}`.
+            The longest matching prefix wins.
+        sample_every: Keep the first and then one of every `sample_every` records below WARNING of each
+            call site, e.g. the per-task lines of large fan-outs.
+    """
+
+    def __init__(self, level: str = "INFO", module_levels: Mapping[str, str] | None = None, sample_every: int = 1):
+        self.level_no = logger.level(level).no
+        self.module_levels = sorted(
+            ((module, logger.level(module_level).no) for module, module_level in (module_levels or {}).items()),
+            key=lambda item: -len(item[0]),
+        )
+        self.sample_every = sample_every
+        self._levels: dict[str, int] = {}
+        self._counts: dict[tuple[str, int], int] = {}
+
+    @property
+    def min_level_no(self) -> int:
+        """The lowest level any module logs at."""
+        return min([self.level_no, *(level_no for _, level_no in self.module_levels)])
+
+    def module_level_no(self, name: str) -> int:
+        level_no = self._levels.get(name)
+        if level_no is None:
+            level_no = next(
+                (no for module, no in self.module_levels if name == module or name.startswith(f"{module}.")),
+                self.level_no,
+            )
+            self._levels[name] = level_no
+        return level_no
+
+    def __call__(self, record: dict[str, Any]) -> bool:
+        level_no = record["level"].no
+        if level_no < self.module_level_no(record["name"] or ""):
+            return False
+        if self.sample_every > 1 and level_no < _SAMPLED_BELOW:
+            site = (record["name"], record["line"])
+            count = self._counts.get(site, 0)
+            self._counts[site] = count + 1
+            return count % self.sample_every == 0
+        return True
+
+
+def configure_logging(
+    level: str = "INFO",
+    serialize: bool = False,
+    enqueue: bool = False,
+    module_levels: Mapping[str, str] | None = None,
+    sample_every: int = 1,
+    sink: TextIO = sys.stderr,
+) -> int:
+    """Replace the package log handler.
+
+    Messages logged with `{}` placeholders and arguments, e.g. `logger.info("Completed task: {}", task_id)`,
+    are only formatted when some handler accepts their level.
+
+    Args:
+        level: Default minimum level.
+        serialize: Write one JSON object per record instead of colorized text.
+        enqueue: Write from a background thread, so logging never blocks the caller (e.g. the event loop).
+        module_levels: Minimum levels by module prefix.
+        sample_every: Keep one of every `sample_every` records below WARNING of each call site.
+        sink: The stream records are written to.
+
+    Returns:
+        The loguru handler id.
+    """
+    global _handler_id
+    if _handler_id is not None:
+        logger.remove(_handler_id)
+
+    record_filter = RecordFilter(level, module_levels, sample_every)
+    _handler_id = logger.add(
+        sink,
+        level=record_filter.min_level_no,
+        format="{message}" if serialize else DEFAULT_FORMAT,
+        colorize=not serialize,
+        serialize=serialize,
+        enqueue=enqueue,
+        filter=record_filter,
+    )
+    return _handler_id
+
+
+def logging_options_from_env(environ: Mapping[str, str] = os.environ) -> dict[str, Any]:
+    """Read the `configure_logging` options from `AI_API_TESTING_LOG_*` environment variables.
+
+    `LEVEL`, `JSON`, `ENQUEUE`, `SAMPLE_EVERY` and `MODULES`, the latter as `module=LEVEL` pairs separated
+    by commas.
+    """
+    options: dict[str, Any] = {}
+    if f"{ENV_PREFIX}LEVEL" in environ:
+        options["level"] = environ[f"{ENV_PREFIX}LEVEL"].upper()
+    for name, option in (("JSON", "serialize"), ("ENQUEUE", "enqueue")):
+        if f"{ENV_PREFIX}{name}" in environ:
+            options[option] = environ[f"{ENV_PREFIX}{name}"].lower() in ("1", "true", "yes")
+    if f"{ENV_PREFIX}SAMPLE_EVERY" in environ:
+        options["sample_every"] = int(environ[f"{ENV_PREFIX}SAMPLE_EVERY"])
+    if environ.get(f"{ENV_PREFIX}MODULES"):
+        pairs = (pair.split("=", 1) for pair in environ[f"{ENV_PREFIX}MODULES"].split(",") if "=" in pair)
+        options["module_levels"] = {module.strip(): module_level.strip().upper() for module, module_level in pairs}
+    return options
+
+
+configure_logging(**logging_options_from_env())
 
 app_logger = logger.bind(name="ai-api-testing")
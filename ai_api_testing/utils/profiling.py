@@ -0,0 +1,216 @@
+import asyncio
+import functools
+import inspect
+import json
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from typing_extensions import Self
+
+from ai_api_testing.utils.logger import logger
+
+# Timings of the annotated regions and of the asyncio tasks, by name: [count, total seconds, max seconds].
+# None while no profiler runs, so the annotated functions only check a global before running.
+_regions: dict[str, list[float]] | None = None
+_tasks: dict[str, list[float]] | None = None
+
+
+def _record(timings: dict[str, list[float]] | None, name: str, elapsed: float) -> None:
+    if timings is None:
+        return
+    stats = timings.get(name)
+    if stats is None:
+        timings[name] = [1, elapsed, elapsed]
+    else:
+        stats[0] += 1
+        stats[1] += elapsed
+        stats[2] = max(stats[2], elapsed)
+
+
+class _Region:
+    __slots__ = ("_start", "name")
+
+    def __init__(self, name: str):
+        self.name = name
+        self._start: float | None = None
+
+    def __enter__(self) -> Self:
+        if _regions is not None:
+            self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        if self._start is not None:
+            _record(_regions, self.name, time.perf_counter() - self._start)
+            self._start = None
+
+    def __call__(self, func: Callable[..., Any]) -> Callable[..., Any]:
+        name = self.name
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if _regions is None:
+                    return await func(*args, **kwargs)
+                with _Region(name):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _regions is None:
+                return func(*args, **kwargs)
+            with _Region(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+
+def profile_region(name: str) -> _Region:
+    """Attribute the wall time of a block or function to `name` in the profiling report.
+
+    Usable as a context manager or a decorator, of sync and async functions. Nested regions are timed
+    inclusively. Without a running `Profiler`, a decorated function only adds a call and a global check.
+    """
+    return _Region(name)
+
+
+class _TaskTimingPolicy(asyncio.DefaultEventLoopPolicy):
+    """Event loop policy whose loops time every task from creation to completion."""
+
+    def new_event_loop(self) -> asyncio.AbstractEventLoop:
+        loop = super().new_event_loop()
+        loop.set_task_factory(_timed_task)
+        return loop
+
+
+def _timed_task(loop: asyncio.AbstractEventLoop, coro: Any, **kwargs) -> asyncio.Task:
+    task = asyncio.Task(coro, loop=loop, **kwargs)
+    start = time.perf_counter()
+    name = getattr(coro, "__qualname__", type(coro).__name__)
+    task.add_done_callback(lambda _: _record(_tasks, name, time.perf_counter() - start))
+    return task
+
+
+class Profiler:
+    """CPU profile, asyncio task timings, region timings and peak memory of a run.
+
+    The peak memory is the peak resident set size of the process. Tracing the Python allocations gives
+    the peak of the run itself, but slows every allocation down and skews the timings, so it is opt-in.
+
+    Args:
+        output: Path of the `pstats` profile, readable with `python -m pstats` or snakeviz. The JSON
+            report is written next to it.
+        top: Number of functions, regions and tasks in the logged summary and the report.
+        trace_memory: Also trace the peak memory allocated by Python during the run, with `tracemalloc`.
+    """
+
+    def __init__(self, output: Path, top: int = 20, trace_memory: bool = False):
+        self.output = Path(output)
+        self.top = top
+        self.trace_memory = trace_memory
+        import cProfile
+
+        self._profile = cProfile.Profile()
+        self._policy: asyncio.AbstractEventLoopPolicy | None = None
+        self._start = 0.0
+
+    @property
+    def report_path(self) -> Path:
+        return self.output.with_suffix(".json")
+
+    def start(self) -> None:
+        global _regions, _tasks
+        _regions, _tasks = {}, {}
+        self._policy = asyncio.get_event_loop_policy()
+        asyncio.set_event_loop_policy(_TaskTimingPolicy())
+        if self.trace_memory:
+            import tracemalloc
+
+            tracemalloc.start()
+        self._start = time.perf_counter()
+        self._profile.enable()
+
+    def stop(self) -> dict[str, Any]:
+        """Stop profiling, write the profile and the report, and log the summary."""
+        global _regions, _tasks
+        self._profile.disable()
+        wall = time.perf_counter() - self._start
+        traced_peak = None
+        if self.trace_memory:
+            import tracemalloc
+
+            _, traced_peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        asyncio.set_event_loop_policy(self._policy)
+        regions, tasks = _regions or {}, _tasks or {}
+        _regions = _tasks = None
+
+        self.output.parent.mkdir(parents=True, exist_ok=True)
+        self._profile.dump_stats(self.output)
+        report = {
+            "wall_seconds": wall,
+            "peak_memory_mb": _peak_rss_mb(),
+            "traced_memory_mb": traced_peak / 2**20 if traced_peak is not None else None,
+            "regions": _top_timings(regions, self.top),
+            "tasks": _top_timings(tasks, self.top),
+            "functions": self._top_functions(),
+        }
+        self.report_path.write_text(json.dumps(report, indent=2))
+        self._log_summary(report)
+        return report
+
+    def _top_functions(self) -> list[dict[str, Any]]:
+        import pstats
+
+        stats = pstats.Stats(self._profile)
+        rows = [
+            {
+                "function": f"{Path(filename).name}:{line}({function})",
+                "calls": calls,
+                "self_seconds": self_time,
+                "cumulative_seconds": cumulative,
+            }
+            for (filename, line, function), (_, calls, self_time, cumulative, _) in stats.stats.items()
+        ]
+        return sorted(rows, key=lambda row: row["cumulative_seconds"], reverse=True)[: self.top]
+
+    def _log_summary(self, report: dict[str, Any]) -> None:
+        parts = [f"{report['wall_seconds']:.2f}s wall"]
+        if report["peak_memory_mb"] is not None:
+            parts.append(f"{report['peak_memory_mb']:.1f} MB peak memory")
+        if report["traced_memory_mb"] is not None:
+            parts.append(f"{report['traced_memory_mb']:.1f} MB peak traced allocations")
+        logger.info(f"Profile: {', '.join(parts)}, written to {self.output} and {self.report_path}")
+        for region in report["regions"]:
+            logger.info(
+                f"Region {region['name']}: {region['total_seconds']:.3f}s in {region['count']} calls "
+                f"(max {region['max_seconds']:.3f}s)"
+            )
+        for function in report["functions"][:10]:
+            logger.info(
+                f"{function['cumulative_seconds']:8.3f}s cumulative {function['calls']:>8} calls {function['function']}"
+            )
+
+
+def _peak_rss_mb() -> float | None:
+    """Peak resident set size of the process, None where `resource` is not available (Windows)."""
+    try:
+        import resource
+    except ImportError:  # pragma: no cover
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def _top_timings(timings: dict[str, list[float]], top: int) -> list[dict[str, Any]]:
+    rows = [
+        {"name": name, "count": int(count), "total_seconds": total, "max_seconds": longest}
+        for name, (count, total, longest) in timings.items()
+    ]
+    return sorted(rows, key=lambda row: row["total_seconds"], reverse=True)[:top]
@@ -0,0 +1,49 @@
+"""Benchmark the import time of the CLI and of the modules loaded by workers.
+
+Each module is imported in a fresh interpreter. Exits with an error when a median exceeds `--max-ms`, so it
+can guard against heavy imports creeping back into the startup path.
+
+Usage:
+    uv run python benchmarks/bench_import_time.py --max-ms 400
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+MODULES = [
+    "ai_api_testing.cli.main",
+    "ai_api_testing.agents.test_generator_agents.executor",
+    "ai_api_testing.agents.test_generator_agents.orchestrator",
+    "ai_api_testing.agents.agent_specs_extractor",
+]
+
+
+def import_time_ms(module: str) -> float:
+    """Wall time of importing `module` in a fresh interpreter, excluding the interpreter startup."""
+    code = f"import time; start = time.perf_counter(); import {module}; print((time.perf_counter() - start) * 1000)"
+    env = {key: value for key, value in os.environ.items() if key != "OPENAI_API_KEY"}
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env, check=True)
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def run(repeat: int) -> dict[str, float]:
+    """Median import time of every module."""
+    results = {}
+    for module in MODULES:
+        results[module] = statistics.median(import_time_ms(module) for _ in range(repeat))
+        print(f"{module:<60} {results[module]:>8.1f} ms")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the package import times")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per module, the median is reported")
+    parser.add_argument("--max-ms", type=float, default=None, help="Fail if the CLI import median exceeds this")
+    args = parser.parse_args()
+
+    results = run(args.repeat)
+    if args.max_ms is not None and results["ai_api_testing.cli.main"] > args.max_ms:
+        sys.exit(f"CLI import took {results['ai_api_testing.cli.main']:.1f} ms, above {args.max_ms} ms")
@@ -0,0 +1,98 @@
+"""Benchmark the decoding of large OpenAPI specs with each available backend.
+
+Usage:
+    uv run python benchmarks/bench_spec_decoding.py --paths 20000
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from ai_api_testing.agents.api_specs_agents.lazy_spec import load_lazy_json
+from ai_api_testing.agents.api_specs_agents.spec_decoding import JSON_BACKEND, YAML_LOADER, load_spec_source
+
+
+def synthetic_spec(n_paths: int) -> dict[str, Any]:
+    """OpenAPI spec with `n_paths` POST operations, each referencing its own component."""
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": "Synthetic API", "version": "1.0.0"},
+        "paths": {
+            f"/resources{i}/{{id}}": {
+                "post": {
+                    "parameters": [{"name": "id", "in": "path", "required": True, "schema": {"type": "integer"}}],
+                    "requestBody": {
+                        "content": {"application/json": {"schema": {"$ref": f"#/components/schemas/Resource{i}"}}}
+                    },
+                }
+            }
+            for i in range(n_paths)
+        },
+        "components": {
+            "schemas": {
+                f"Resource{i}": {
+                    "type": "object",
+                    "required": ["name"],
+                    "properties": {
+                        "name": {"type": "string", "maxLength": 64},
+                        "size": {"type": "number", "minimum": 0},
+                        "tags": {"type": "array", "items": {"type": "string"}},
+                    },
+                }
+                for i in range(n_paths)
+            }
+        },
+    }
+
+
+def timed(fn: Callable[[], Any], repeat: int) -> float:
+    """Best wall time in seconds of `repeat` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(n_paths: int, repeat: int) -> dict[str, float]:
+    """Time every decoding backend on the same synthetic spec."""
+    spec = synthetic_spec(n_paths)
+    json_text = json.dumps(spec)
+    yaml_text = yaml.dump(spec, Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper))
+    one_path = f"/resources{n_paths // 2}/{{id}}"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = Path(tmp) / "openapi.json"
+        yaml_path = Path(tmp) / "openapi.yaml"
+        json_path.write_text(json_text)
+        yaml_path.write_text(yaml_text)
+        print(f"{n_paths} paths: JSON {len(json_text) / 1e6:.1f} MB, YAML {len(yaml_text) / 1e6:.1f} MB")
+
+        cases = {
+            "json stdlib": lambda: json.loads(json_text),
+            f"json {JSON_BACKEND} (file, mmap)": lambda: load_spec_source(json_path, lazy_threshold=len(json_text)),
+            "json lazy index + one operation": lambda: load_lazy_json(json_text)["paths"][one_path],
+            "yaml SafeLoader": lambda: yaml.load(yaml_text, Loader=yaml.SafeLoader),
+            f"yaml {YAML_LOADER.__name__} (file, mmap)": lambda: load_spec_source(yaml_path),
+        }
+        results = {}
+        for name, fn in cases.items():
+            results[name] = timed(fn, repeat)
+            print(f"{name:<40} {results[name] * 1000:>10.1f} ms")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the OpenAPI spec decoding backends")
+    parser.add_argument("--paths", type=int, default=5000, help="Number of paths of the synthetic spec")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per backend, the best one is reported")
+    args = parser.parse_args()
+
+    run(args.paths, args.repeat)
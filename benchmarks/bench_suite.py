@@ -0,0 +1,394 @@
+"""Benchmark suite of the spec extractors and of the executor, with results comparable across releases.
+
+`run` times every benchmark on synthetic inputs (huge OpenAPI specs in JSON and YAML, deep `$ref` graphs,
+large FastAPI apps and model input batches) and writes the results as JSON. `compare` reports the relative
+change of every benchmark against a baseline file and exits with an error when one regressed beyond the
+tolerance. Timings are only comparable on the same quiet machine, e.g. the baseline and the release
+candidate run back to back.
+
+Usage:
+    uv run python benchmarks/bench_suite.py run --output benchmarks/results/current.json
+    uv run python benchmarks/bench_suite.py run --quick --filter executor
+    uv run python benchmarks/bench_suite.py compare benchmarks/results/baseline.json benchmarks/results/current.json
+"""
+
+import argparse
+import asyncio
+import fnmatch
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import yaml
+
+from ai_api_testing.agents.api_specs_agents.fastapi_extractor import FastAPISpecsExtractor
+from ai_api_testing.agents.api_specs_agents.swagger_extractor import SwaggerExtractor
+from ai_api_testing.agents.test_generator_agents.executor import Executor
+from ai_api_testing.core.models import TestCase
+from ai_api_testing.utils.logger import configure_logging
+
+SCHEMA_VERSION = 1
+# Fast benchmarks without setup are looped until a timed run lasts this long, to keep the timer noise low
+MIN_RUN_SECONDS = 0.05
+MAX_LOOPS = 10_000
+
+
+def synthetic_spec(n_paths: int, ref_depth: int = 1) -> dict[str, Any]:
+    """OpenAPI spec with `n_paths` POST operations, each body the head of a chain of `ref_depth` components."""
+    schemas = {}
+    for i in range(n_paths):
+        for depth in range(ref_depth):
+            properties: dict[str, Any] = {
+                "name": {"type": "string", "maxLength": 64},
+                "size": {"type": "number", "minimum": 0},
+                "tags": {"type": "array", "items": {"type": "string"}},
+            }
+            if depth + 1 < ref_depth:
+                properties["child"] = {"$ref": f"#/components/schemas/Resource{i}_{depth + 1}"}
+            schemas[f"Resource{i}_{depth}"] = {"type": "object", "required": ["name"], "properties": properties}
+
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": "Synthetic API", "version": "1.0.0"},
+        "paths": {
+            f"/resources{i}/{{id}}": {
+                "post": {
+                    "parameters": [{"name": "id", "in": "path", "required": True, "schema": {"type": "integer"}}],
+                    "requestBody": {
+                        "content": {"application/json": {"schema": {"$ref": f"#/components/schemas/Resource{i}_0"}}}
+                    },
+                }
+            }
+            for i in range(n_paths)
+        },
+        "components": {"schemas": schemas},
+    }
+
+
+def synthetic_app(n_routes: int) -> Any:
+    """FastAPI app with `n_routes` POST routes, each with its own request and response models."""
+    from fastapi import FastAPI
+    from pydantic import create_model
+
+    app = FastAPI()
+    for i in range(n_routes):
+        child = create_model(f"Child{i}", name=(str, ...), size=(float, 0.0))
+        body = create_model(f"Body{i}", name=(str, ...), tags=(list[str], []), child=(child | None, None))
+        response = create_model(f"Response{i}", id=(int, ...), score=(float, ...))
+
+        # Only the signatures are extracted, the routes are never called
+        def endpoint(item_id: int, payload: body) -> response:
+            raise NotImplementedError
+
+        app.post(f"/resources{i}/{{item_id}}")(endpoint)
+    return app
+
+
+def synthetic_cases(n_cases: int, rows_per_case: int, n_features: int, seed: int = 0) -> list[TestCase]:
+    """Test cases with `rows_per_case` input rows of `n_features` numeric features each."""
+    rng = np.random.default_rng(seed)
+    names = [f"feature_{j}" for j in range(n_features)]
+    return [
+        TestCase(
+            name=f"case {i}",
+            description="",
+            path="/predict",
+            method="POST",
+            input_json=[dict(zip(names, row)) for row in rng.normal(size=(rows_per_case, n_features)).tolist()],
+            expected_output_prompt=None,
+            expected_output_json={"class": 1},
+            preconditions=None,
+        )
+        for i in range(n_cases)
+    ]
+
+
+class LinearModel:
+    """Logistic model over all the features, cheap enough for the executor overhead to dominate."""
+
+    def __init__(self, n_features: int, seed: int = 0):
+        self.weights = np.random.default_rng(seed).normal(size=n_features)
+
+    def predict_proba(self, x: np.ndarray) -> np.ndarray:
+        p = 1 / (1 + np.exp(-x @ self.weights))
+        return np.column_stack([1 - p, p])
+
+    def predict(self, x: np.ndarray) -> np.ndarray:
+        return (x @ self.weights > 0).astype(int)
+
+
+class Benchmark:
+    """A timed operation on inputs built once, with an optional untimed per-run setup.
+
+    Args:
+        name: Benchmark name, e.g. `swagger.parse_spec[paths=5000]`.
+        fn: The timed operation, given the result of `setup`.
+        setup: Builds the state of every run, e.g. a fresh extractor so that no cache is reused. Without
+            it, fast operations are looped until a run lasts `MIN_RUN_SECONDS`, like `timeit`.
+        ops: Number of units processed per call (endpoints, references, rows), for the throughput.
+    """
+
+    def __init__(self, name: str, fn: Callable[[Any], Any], setup: Callable[[], Any] | None = None, ops: int = 1):
+        self.name = name
+        self.fn = fn
+        self.setup = setup
+        self.ops = ops
+
+    def _time(self, number: int) -> float:
+        state = self.setup() if self.setup is not None else None
+        # Like timeit, collections triggered by the garbage of previous runs are kept out of the timings
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            for _ in range(number):
+                self.fn(state)
+            return (time.perf_counter() - start) / number
+        finally:
+            gc.enable()
+
+    def run(self, repeat: int) -> dict[str, Any]:
+        number = 1
+        if self.setup is None:
+            first = self._time(1)
+            number = max(1, min(MAX_LOOPS, int(MIN_RUN_SECONDS / max(first, 1e-9))))
+        times = [self._time(number) for _ in range(repeat)]
+        best = min(times)
+        return {
+            "seconds": best,
+            "median_seconds": statistics.median(times),
+            "ops": self.ops,
+            "ops_per_second": self.ops / best if best else None,
+            "repeat": repeat,
+            "number": number,
+        }
+
+
+def _loaded_extractor(spec: dict[str, Any]) -> SwaggerExtractor:
+    extractor = SwaggerExtractor()
+    extractor._spec = spec
+    return extractor
+
+
+def swagger_benchmarks(tmp: Path, n_paths: int, ref_depth: int) -> list[Benchmark]:
+    """`_parse_spec`, `_resolve_reference` and local JSON/YAML extraction of a synthetic spec."""
+    spec = synthetic_spec(n_paths)
+    deep_spec = synthetic_spec(max(n_paths // ref_depth, 1), ref_depth)
+    deep_heads = [f"#/components/schemas/Resource{i}_0" for i in range(len(deep_spec["paths"]))]
+
+    json_path, yaml_path = tmp / "openapi.json", tmp / "openapi.yaml"
+    json_path.write_text(json.dumps(spec))
+    yaml_path.write_text(yaml.dump(spec, Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper)))
+
+    def resolve_all(extractor: SwaggerExtractor) -> None:
+        for ref in deep_heads:
+            extractor._resolve_reference(ref)
+
+    def extract_file(path: Path) -> Callable[[SwaggerExtractor], Any]:
+        return lambda extractor: asyncio.run(extractor.extract_endpoints(str(path)))
+
+    one_path = [f"/resources{n_paths // 2}/{{id}}"]
+    return [
+        Benchmark(
+            f"swagger.parse_spec[paths={n_paths}]",
+            lambda extractor: extractor._parse_spec(),
+            lambda: _loaded_extractor(spec),
+            n_paths,
+        ),
+        Benchmark(
+            f"swagger.parse_spec_selection[paths={n_paths}]",
+            lambda extractor: extractor._parse_spec(one_path),
+            lambda: _loaded_extractor(spec),
+        ),
+        Benchmark(
+            f"swagger.parse_spec[paths={len(deep_heads)},ref_depth={ref_depth}]",
+            lambda extractor: extractor._parse_spec(),
+            lambda: _loaded_extractor(deep_spec),
+            len(deep_heads),
+        ),
+        Benchmark(
+            f"swagger.resolve_reference[refs={len(deep_heads)},ref_depth={ref_depth}]",
+            resolve_all,
+            lambda: _loaded_extractor(deep_spec),
+            len(deep_heads) * ref_depth,
+        ),
+        Benchmark(f"swagger.extract_json_file[paths={n_paths}]", extract_file(json_path), SwaggerExtractor, n_paths),
+        Benchmark(f"swagger.extract_yaml_file[paths={n_paths}]", extract_file(yaml_path), SwaggerExtractor, n_paths),
+    ]
+
+
+def fastapi_benchmarks(n_routes: int) -> list[Benchmark]:
+    """`extract_specs` of a large app, cold, warm (cached document) and in `routes` mode."""
+    app = synthetic_app(n_routes)
+    one_path = [f"/resources{n_routes // 2}/{{item_id}}"]
+    openapi = FastAPISpecsExtractor()
+    return [
+        Benchmark(
+            f"fastapi.extract_specs_cold[routes={n_routes}]",
+            lambda fresh_app: openapi.extract_specs(fresh_app),
+            lambda: synthetic_app(n_routes),
+            n_routes,
+        ),
+        Benchmark(f"fastapi.extract_specs_warm[routes={n_routes}]", lambda _: openapi.extract_specs(app), ops=n_routes),
+        Benchmark(
+            f"fastapi.extract_specs_routes_mode[routes={n_routes}]",
+            lambda _: FastAPISpecsExtractor(mode="routes").extract_specs(app),
+            ops=n_routes,
+        ),
+        Benchmark(
+            f"fastapi.extract_specs_routes_selection[routes={n_routes}]",
+            lambda _: FastAPISpecsExtractor(mode="routes").extract_specs(app, one_path),
+        ),
+    ]
+
+
+def executor_benchmarks(n_cases: int, rows_per_case: int, batch_sizes: list[int]) -> list[Benchmark]:
+    """`Executor.execute_batch` and `Executor.compare` throughput at several batch sizes."""
+    n_features = 8
+    cases = synthetic_cases(n_cases, rows_per_case, n_features)
+    model, challenger = LinearModel(n_features, seed=0), LinearModel(n_features, seed=1)
+    executor = Executor()
+    n_rows = n_cases * rows_per_case
+
+    benchmarks = [
+        Benchmark(
+            f"executor.execute_batch[rows={n_rows},batch={batch_size}]",
+            lambda _, batch_size=batch_size: executor.execute_batch(
+                cases, model, predict_proba=True, batch_size=batch_size
+            ),
+            ops=n_rows,
+        )
+        for batch_size in batch_sizes
+    ]
+    benchmarks.append(
+        Benchmark(
+            f"executor.compare[rows={n_rows},models=2]",
+            lambda _: executor.compare(cases, {"champion": model, "challenger": challenger}, predict_proba=True),
+            ops=n_rows,
+        )
+    )
+    return benchmarks
+
+
+def build_suite(quick: bool, tmp: Path) -> list[Benchmark]:
+    """Every benchmark, on inputs sized for a release check or, with `quick`, for a smoke test."""
+    if quick:
+        return [
+            *swagger_benchmarks(tmp, n_paths=500, ref_depth=5),
+            *fastapi_benchmarks(n_routes=50),
+            *executor_benchmarks(n_cases=500, rows_per_case=10, batch_sizes=[100, 5_000]),
+        ]
+    return [
+        *swagger_benchmarks(tmp, n_paths=5_000, ref_depth=20),
+        *fastapi_benchmarks(n_routes=500),
+        *executor_benchmarks(n_cases=10_000, rows_per_case=10, batch_sizes=[1_000, 10_000, 100_000]),
+    ]
+
+
+def environment() -> dict[str, Any]:
+    """The context the results are only comparable within."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "numpy": np.__version__,
+        "commit": commit,
+    }
+
+
+def run(output: Path | None, repeat: int, quick: bool, patterns: list[str] | None) -> dict[str, Any]:
+    """Run the benchmarks whose name matches one of `patterns`, and write the results to `output`."""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for benchmark in build_suite(quick, Path(tmp)):
+            if patterns and not any(fnmatch.fnmatch(benchmark.name, f"*{pattern}*") for pattern in patterns):
+                continue
+            results[benchmark.name] = benchmark.run(repeat)
+            result = results[benchmark.name]
+            throughput = f"{result['ops_per_second']:>14,.0f} ops/s" if result["ops"] > 1 else ""
+            print(f"{benchmark.name:<70} {result['seconds'] * 1000:>10.2f} ms {throughput}")
+
+    document = {
+        "schema_version": SCHEMA_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "quick": quick,
+        "environment": environment(),
+        "results": results,
+    }
+    if output is not None:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(document, indent=2))
+        print(f"Results written to {output}")
+    return document
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any], tolerance: float) -> list[str]:
+    """Print the relative time change of every benchmark and return the names of the regressed ones."""
+    if baseline.get("quick") != current.get("quick"):
+        raise ValueError("Quick and full results are not comparable")
+    for key in ("python", "machine"):
+        if baseline["environment"].get(key) != current["environment"].get(key):
+            print(f"Warning: {key} differs, {baseline['environment'].get(key)} vs {current['environment'].get(key)}")
+
+    regressions = []
+    for name, result in current["results"].items():
+        reference = baseline["results"].get(name)
+        if reference is None:
+            print(f"{name:<70} {'new':>10}")
+            continue
+        change = result["seconds"] / reference["seconds"] - 1
+        status = ""
+        if change > tolerance:
+            status = "REGRESSION"
+            regressions.append(name)
+        elif change < -tolerance:
+            status = "improvement"
+        print(f"{name:<70} {change:>+10.1%} {status}")
+    for name in sorted(baseline["results"].keys() - current["results"].keys()):
+        print(f"{name:<70} {'missing':>10}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the spec extractors and the executor")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the benchmarks and write their results")
+    run_parser.add_argument("--output", type=Path, default=None, help="JSON file the results are written to")
+    run_parser.add_argument("--repeat", type=int, default=5, help="Runs per benchmark, the best one is compared")
+    run_parser.add_argument("--quick", action="store_true", help="Small inputs, e.g. for a smoke test in CI")
+    run_parser.add_argument(
+        "--filter", action="append", dest="patterns", help="Only the benchmarks containing this, can be repeated"
+    )
+
+    compare_parser = commands.add_parser("compare", help="Compare results with a baseline")
+    compare_parser.add_argument("baseline", type=Path, help="JSON results of the reference, e.g. the last release")
+    compare_parser.add_argument("current", type=Path, help="JSON results to check")
+    compare_parser.add_argument(
+        "--tolerance", type=float, default=0.15, help="Relative slowdown above which a benchmark regressed"
+    )
+    args = parser.parse_args()
+
+    if args.command == "run":
+        configure_logging(level="WARNING")
+        run(args.output, args.repeat, args.quick, args.patterns)
+    else:
+        regressed = compare(json.loads(args.baseline.read_text()), json.loads(args.current.read_text()), args.tolerance)
+        if regressed:
+            sys.exit(f"{len(regressed)} benchmarks regressed by more than {args.tolerance:.0%}: {', '.join(regressed)}")
@@ -0,0 +1,95 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from aiounittest import AsyncTestCase
+
+from ai_api_testing.agents.api_specs_agents.browser_pool import BrowserPool
+from ai_api_testing.agents.api_specs_agents.swagger_extractor import SwaggerExtractor
+
+# Stand-in for Swagger UI: the spec lands in the store some time after the page loaded
+SWAGGER_UI_PAGE = """
+<html><body>
+<div id="swagger-ui" class="swagger-ui"></div>
+<script>
+setTimeout(() => {
+    const spec = {paths: {"/pets": {get: {}}, "/pets/{petId}": {delete: {}}}};
+    const json = {size: 1, toJS: () => spec};
+    const specState = {get: (key) => (key === "json" ? json : "success")};
+    window.ui = {getState: () => ({get: (key) => (key === "spec" ? specState : null)})};
+}, 300);
+</script>
+</body></html>
+"""
+
+
+def fake_browser(state: dict[str, int]) -> MagicMock:
+    """Browser mock whose pages record how many of them are loading at once."""
+
+    async def wait_for_function(*args, **kwargs):
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        await asyncio.sleep(0.05)
+        state["active"] -= 1
+        handle = MagicMock()
+        handle.json_value = AsyncMock(return_value={"spec": {"paths": {"/pets": {"get": {}}}}})
+        return handle
+
+    page = MagicMock()
+    page.goto = AsyncMock()
+    page.wait_for_function = wait_for_function
+    context = MagicMock()
+    context.new_page = AsyncMock(return_value=page)
+    context.close = AsyncMock()
+    browser = MagicMock()
+    browser.is_connected.return_value = True
+    browser.new_context = AsyncMock(return_value=context)
+    browser.close = AsyncMock()
+    return browser
+
+
+class TestBrowserPool(AsyncTestCase):
+    """Test BrowserPool class."""
+
+    async def test_browser_is_reused_under_page_limit(self):
+        """Test a single browser serves all the scrapes, never more than `max_pages` at once."""
+        state = {"active": 0, "peak": 0}
+        browser = fake_browser(state)
+        pool = BrowserPool(max_pages=2)
+
+        with patch.object(BrowserPool, "_launch", AsyncMock(return_value=browser)) as launch:
+            specs = await asyncio.gather(*(pool.scrape_swagger_ui_spec(f"http://docs/{i}") for i in range(6)))
+            await pool.close()
+
+        self.assertEqual(launch.call_count, 1)
+        self.assertEqual(state["peak"], 2)
+        self.assertEqual(browser.new_context.call_count, 6)
+        self.assertTrue(all(spec == {"paths": {"/pets": {"get": {}}}} for spec in specs))
+        browser.close.assert_awaited_once()
+
+    async def test_scrape_local_swagger_ui(self):
+        """Test scraping waits for the spec to be in the Swagger UI store, against a local page."""
+        pool = BrowserPool(max_pages=2, ready_timeout=10)
+        try:
+            await pool._get_browser()
+        except Exception as e:  # noqa: BLE001
+            await pool.close()
+            pytest.skip(f"Chromium is not available: {e}")
+
+        async def swagger_ui(request: web.Request) -> web.Response:
+            return web.Response(text=SWAGGER_UI_PAGE, content_type="text/html")
+
+        app = web.Application()
+        app.router.add_get("/docs", swagger_ui)
+        async with TestServer(app) as server, pool:
+            url = str(server.make_url("/docs"))
+            extractor = SwaggerExtractor(browser_pool=pool)
+            results = await asyncio.gather(*(extractor._scrape_and_parse_spec(url) for _ in range(3)))
+
+        for endpoints in results:
+            self.assertEqual(
+                [(endpoint.method, endpoint.path) for endpoint in endpoints],
+                [("GET", "/pets"), ("DELETE", "/pets/{petId}")],
+            )
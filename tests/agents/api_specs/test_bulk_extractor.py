@@ -0,0 +1,94 @@
+import asyncio
+import io
+import json
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import yaml
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from aiounittest import AsyncTestCase
+
+from ai_api_testing.agents.api_specs_agents.bulk_extractor import extract_many, read_sources
+
+
+def make_spec(n_paths: int) -> dict:
+    """OpenAPI spec with `n_paths` GET operations."""
+    return {"openapi": "3.0.0", "paths": {f"/items{i}": {"get": {}} for i in range(n_paths)}}
+
+
+class TestBulkExtractor(AsyncTestCase):
+    """Test the bulk extraction of many services."""
+
+    async def test_extract_many_streams_endpoints_and_reports_failures(self):
+        """Test remote and local specs are extracted concurrently, one failure not stopping the others."""
+        in_flight = {"now": 0, "peak": 0}
+
+        async def openapi(request: web.Request) -> web.Response:
+            in_flight["now"] += 1
+            in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+            await asyncio.sleep(0.05)
+            in_flight["now"] -= 1
+            return web.json_response(make_spec(int(request.match_info["n"])))
+
+        app = web.Application()
+        app.router.add_get("/{n}/openapi.json", openapi)
+
+        async with TestServer(app) as server:
+            with tempfile.TemporaryDirectory() as tmp:
+                local_spec = Path(tmp) / "local.yaml"
+                local_spec.write_text(yaml.safe_dump(make_spec(3)))
+                broken_spec = Path(tmp) / "broken.yaml"
+                broken_spec.write_text("just a string")
+                sources = [str(server.make_url(f"/{n}")) for n in (1, 2, 4, 5)] + [str(local_spec), str(broken_spec)]
+
+                output = io.StringIO()
+                reports = await extract_many(sources, output, concurrency=2, timeout=10)
+
+        self.assertEqual([report.source for report in reports], sources)
+        self.assertEqual([report.endpoints for report in reports], [1, 2, 4, 5, 3, 0])
+        self.assertEqual([report.ok for report in reports], [True] * 5 + [False])
+        self.assertIn("ValueError", reports[-1].error)
+        self.assertLessEqual(in_flight["peak"], 2)
+
+        lines = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(len(lines), 15)
+        self.assertEqual({line["service"] for line in lines}, set(sources[:5]))
+        self.assertEqual(lines[0].keys(), {"service", "path", "method", "request_body", "response_schema"})
+
+    async def test_local_specs_are_loaded_off_the_event_loop(self):
+        """Test a slow local spec does not block the other extractions."""
+        ticks = []
+
+        async def tick():
+            for _ in range(5):
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.01)
+
+        def slow_load(source, lazy_threshold):
+            time.sleep(0.2)
+            return make_spec(2)
+
+        with (
+            patch("ai_api_testing.agents.api_specs_agents.swagger_extractor.load_spec_source", slow_load),
+            tempfile.TemporaryDirectory() as tmp,
+        ):
+            local_spec = Path(tmp) / "local.yaml"
+            local_spec.touch()
+            reports, _ = await asyncio.gather(extract_many([str(local_spec)], io.StringIO()), tick())
+
+        self.assertEqual(reports[0].endpoints, 2)
+        self.assertLess(ticks[-1] - ticks[0], 0.15)
+
+
+def test_read_sources(tmp_path):
+    """Test blank lines, comments and duplicates are skipped."""
+    sources = tmp_path / "services.txt"
+    sources.write_text(
+        "# internal services\nhttp://a.internal\n\nhttp://b.internal  # legacy\nhttp://a.internal\n"
+        "http://c.internal/docs#/pets\t# fragment\n"
+    )
+
+    assert read_sources(sources) == ["http://a.internal", "http://b.internal", "http://c.internal/docs#/pets"]
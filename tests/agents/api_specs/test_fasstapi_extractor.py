@@ -3,6 +3,7 @@ from fastapi import FastAPI
 from fastapi.testclient import TestClient
 from pydantic import BaseModel, Field, ValidationError
 
+from ai_api_testing.agents.api_specs_agents import fastapi_extractor
 from ai_api_testing.agents.api_specs_agents.fastapi_extractor import FastAPISpecsExtractor
 
 app = FastAPI()
@@ -109,3 +110,81 @@ def test_discover_endpoint_response_schema():
     assert len(endpoints) == 1
     assert endpoints[0].request_body is not None
     assert endpoints[0].response_schema is not None
+
+
+class Address(BaseModel):
+    """Address model."""
+
+    city: str
+
+
+class Owner(BaseModel):
+    """Owner model, nesting another model."""
+
+    name: str
+    address: Address
+
+
+def test_extract_specs_snapshot_is_cached_and_invalidated(mocker):
+    """Test the OpenAPI schema is generated once per route set, with nested references resolved."""
+    owners_app = FastAPI()
+
+    @owners_app.post("/owners")
+    async def create_owner(owner: Owner) -> Owner:
+        return owner
+
+    openapi = mocker.spy(owners_app, "openapi")
+    extractor = FastAPISpecsExtractor()
+
+    endpoints = extractor.extract_specs(app=owners_app)
+    assert endpoints[0].request_body["properties"]["address"]["properties"] == {
+        "city": {"title": "City", "type": "string"}
+    }
+    assert endpoints[0].response_schema["properties"]["address"]["title"] == "Address"
+    assert FastAPISpecsExtractor().extract_specs(app=owners_app) == endpoints
+    assert openapi.call_count == 1
+
+    @owners_app.get("/owners/{owner_id}")
+    async def get_owner(owner_id: int) -> Owner:
+        return Owner(name="", address=Address(city=""))
+
+    assert [(endpoint.method, endpoint.path) for endpoint in extractor.extract_specs(app=owners_app)] == [
+        ("POST", "/owners"),
+        ("GET", "/owners/{owner_id}"),
+    ]
+    assert openapi.call_count == 2
+
+
+def test_extract_specs_from_routes(mocker):
+    """Test the routes mode matches the OpenAPI one, without generating the OpenAPI document."""
+    owners_app = FastAPI()
+
+    @owners_app.post("/owners")
+    async def create_owner(owner: Owner) -> Owner:
+        return owner
+
+    @owners_app.put("/owners/{owner_id}")
+    async def update_owner(owner_id: int, owner: Owner) -> Owner:
+        return owner
+
+    @owners_app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    expected = FastAPISpecsExtractor().extract_specs(app=owners_app)
+    openapi = mocker.spy(owners_app, "openapi")
+    fastapi_extractor._cached_model_schema.cache_clear()
+
+    endpoints = FastAPISpecsExtractor(mode="routes").extract_specs(app=owners_app)
+
+    assert openapi.call_count == 0
+    assert [(endpoint.method, endpoint.path) for endpoint in endpoints] == [
+        (endpoint.method, endpoint.path) for endpoint in expected
+    ]
+    assert endpoints[0].request_body == expected[0].request_body
+    assert endpoints[2].response_schema == {}
+    # Owner is generated once per schema mode, whatever the number of routes using it
+    assert fastapi_extractor._cached_model_schema.cache_info()[:2] == (2, 2)
+
+    selected = FastAPISpecsExtractor(mode="routes").extract_specs(app=owners_app, endpoint_list=["/owners/7"])
+    assert [(endpoint.method, endpoint.path) for endpoint in selected] == [("PUT", "/owners/{owner_id}")]
@@ -0,0 +1,92 @@
+import json
+import mmap
+import tracemalloc
+
+import pytest
+
+from ai_api_testing.agents.api_specs_agents.lazy_spec import load_lazy_json, load_lazy_json_file
+from ai_api_testing.agents.api_specs_agents.swagger_extractor import SwaggerExtractor
+
+
+@pytest.fixture
+def large_spec():
+    """Spec with many paths, each referencing its own component."""
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": 'Large "API" ✓', "version": "1"},
+        "paths": {
+            f"/items/{i}": {
+                "post": {
+                    "requestBody": {
+                        "content": {"application/json": {"schema": {"$ref": f"#/components/schemas/Item{i}"}}}
+                    }
+                }
+            }
+            for i in range(200)
+        },
+        "components": {
+            "schemas": {
+                f"Item{i}": {"type": "object", "properties": {"id": {"type": "integer"}, "tags": [1, {"a": "}"}]}}
+                for i in range(200)
+            }
+        },
+    }
+
+
+def test_lazy_json_matches_eager_decoding(large_spec):
+    """Test the lazy document decodes to the same values as json.loads."""
+    text = json.dumps(large_spec, indent=2, ensure_ascii=False)
+
+    spec = load_lazy_json(text)
+
+    assert spec == json.loads(text)
+    assert list(spec["paths"]) == list(large_spec["paths"])
+    with pytest.raises(ValueError):
+        load_lazy_json(text[:-10])
+    with pytest.raises(ValueError):
+        load_lazy_json("[1, 2]")
+
+
+def test_parse_spec_only_materializes_selected_endpoints(large_spec):
+    """Test selecting endpoints only decodes their operations and referenced components."""
+    extractor = SwaggerExtractor()
+    extractor._spec = load_lazy_json(json.dumps(large_spec))
+
+    endpoints = extractor._parse_spec(endpoint_list=["/items/3", "/items/150"])
+
+    assert [endpoint.path for endpoint in endpoints] == ["/items/3", "/items/150"]
+    assert endpoints[0].request_body == large_spec["components"]["schemas"]["Item3"]
+    assert extractor._spec["paths"].materialized == 2
+    assert extractor._spec["components"].materialized == 2
+
+
+def test_lazy_json_file_reuses_persisted_index(large_spec, tmp_path):
+    """Test the offset index is persisted and reused while the file is unchanged."""
+    spec_path = tmp_path / "openapi.json"
+    index_path = tmp_path / "openapi.index.json"
+    spec_path.write_text(json.dumps(large_spec))
+
+    first = load_lazy_json_file(spec_path, index_path=index_path)
+    stored_index = json.loads(index_path.read_text())
+    second = load_lazy_json_file(spec_path, index_path=index_path)
+
+    assert stored_index["entries"]["paths"]["entries"]["/items/0"][0] > 0
+    assert first["paths"]["/items/7"] == second["paths"]["/items/7"] == large_spec["paths"]["/items/7"]
+
+
+def test_lazy_json_file_only_reads_selected_members(large_spec, tmp_path):
+    """Test a mapped spec is indexed and read without copying the whole document into memory."""
+    for i in range(200, 5000):
+        large_spec["paths"][f"/items/{i}"] = {"get": {"description": "x" * 1000}}
+    spec_path = tmp_path / "openapi.json"
+    spec_path.write_text(json.dumps(large_spec))
+
+    tracemalloc.start()
+    spec = load_lazy_json_file(spec_path)
+    operation = spec["paths"]["/items/7"]
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert isinstance(spec.source, mmap.mmap)
+    assert operation == large_spec["paths"]["/items/7"]
+    assert peak < spec_path.stat().st_size / 4
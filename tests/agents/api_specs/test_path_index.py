@@ -0,0 +1,83 @@
+import pytest
+
+from ai_api_testing.agents.api_specs_agents.base_extractor import APIEndpoint
+from ai_api_testing.agents.api_specs_agents.path_index import PathIndex
+from ai_api_testing.agents.api_specs_agents.swagger_extractor import SwaggerExtractor
+
+
+@pytest.fixture
+def endpoints():
+    """Endpoints of a small pet store, with literal, parameter and mixed segments."""
+    return [
+        APIEndpoint(path="/pets", method="GET"),
+        APIEndpoint(path="/pets", method="POST"),
+        APIEndpoint(path="/pets/mine", method="GET"),
+        APIEndpoint(path="/pets/{petId}", method="GET"),
+        APIEndpoint(path="/pets/{petId}", method="DELETE"),
+        APIEndpoint(path="/pets/{petId}/photos/{name}.{ext}", method="GET"),
+        APIEndpoint(path="/stores/{storeId}/pets/{petId}", method="PUT"),
+    ]
+
+
+def test_match_concrete_paths(endpoints):
+    """Test concrete paths and URLs match their template, literal segments first."""
+    index = PathIndex.from_endpoints(endpoints)
+
+    found = index.match("https://api.example.com/pets/42?verbose=1", "get")
+    assert (found.template, found.params, found.value) == ("/pets/{petId}", {"petId": "42"}, endpoints[3])
+    assert index.match("/pets/mine").template == "/pets/mine"
+    assert index.match("/pets/mine", "DELETE").template == "/pets/{petId}"
+    assert index.match("/pets/7/photos/cat.png").params == {"petId": "7", "name": "cat", "ext": "png"}
+    assert index.match("/pets/").template == "/pets"
+    assert index.match("/pets/42", "POST") is None
+    assert index.match("/owners/1") is None
+
+
+def test_select_globs_and_prefixes(endpoints):
+    """Test selection by template, concrete path and globs, in spec order."""
+    index = PathIndex.from_endpoints(endpoints)
+
+    assert index.select("/pets/{petId}") == ["/pets/{petId}"]
+    assert index.select("/pets/42") == ["/pets/{petId}"]
+    assert index.select("/pets/**") == [
+        "/pets",
+        "/pets/mine",
+        "/pets/{petId}",
+        "/pets/{petId}/photos/{name}.{ext}",
+    ]
+    assert index.select("/*/{petId}") == ["/pets/{petId}"]
+    assert index.select("/**/pets/*") == ["/pets/mine", "/pets/{petId}", "/stores/{storeId}/pets/{petId}"]
+    assert index.select_many(["/stores/**", "/owners"]) == (["/stores/{storeId}/pets/{petId}"], ["/owners"])
+
+
+def test_coverage(endpoints):
+    """Test executed requests are accounted to their operations."""
+    index = PathIndex.from_endpoints(endpoints)
+
+    coverage = index.coverage([("GET", "/pets"), ("get", "/pets/1"), ("GET", "/pets/2"), ("PATCH", "/pets/1")])
+
+    assert coverage.hits["GET /pets/{petId}"] == 2
+    assert coverage.covered == ["GET /pets", "GET /pets/{petId}"]
+    assert "PUT /stores/{storeId}/pets/{petId}" in coverage.uncovered
+    assert coverage.unmatched == ["PATCH /pets/1"]
+    assert coverage.ratio == pytest.approx(2 / 7)
+
+
+def test_swagger_extractor_selects_with_patterns():
+    """Test the extractor endpoint list accepts globs and concrete paths."""
+    extractor = SwaggerExtractor()
+    extractor._spec = {
+        "paths": {
+            "/pets": {"get": {}},
+            "/pets/{petId}": {"get": {}, "delete": {}},
+            "/stores": {"get": {}},
+        }
+    }
+
+    endpoints = extractor._parse_spec(["/pets/7", "/stores*", "/missing"])
+
+    assert [(endpoint.method, endpoint.path) for endpoint in endpoints] == [
+        ("GET", "/pets/{petId}"),
+        ("DELETE", "/pets/{petId}"),
+        ("GET", "/stores"),
+    ]
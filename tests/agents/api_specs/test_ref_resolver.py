@@ -0,0 +1,127 @@
+import json
+
+import pytest
+
+from ai_api_testing.agents.api_specs_agents.ref_resolver import RefResolver
+from ai_api_testing.agents.api_specs_agents.swagger_extractor import SwaggerExtractor
+
+
+@pytest.fixture
+def spec_with_refs():
+    """OpenAPI 3 spec with reused, nested and self-referencing components."""
+    return {
+        "paths": {
+            "/trees": {
+                "post": {
+                    "requestBody": {
+                        "content": {"application/json": {"schema": {"$ref": "#/components/schemas/Tree"}}},
+                    }
+                }
+            },
+            "/owners": {
+                "post": {
+                    "requestBody": {
+                        "content": {
+                            "application/json": {
+                                "schema": {
+                                    "type": "object",
+                                    "properties": {"address": {"$ref": "#/components/schemas/Address"}},
+                                }
+                            }
+                        },
+                    }
+                }
+            },
+        },
+        "components": {
+            "schemas": {
+                "Address": {"type": "object", "properties": {"city": {"type": "string"}}},
+                "Tree": {
+                    "type": "object",
+                    "properties": {
+                        "address": {"$ref": "#/components/schemas/Address"},
+                        "children": {"type": "array", "items": {"$ref": "#/components/schemas/Tree"}},
+                    },
+                },
+                "a/b": {"type": "integer"},
+            }
+        },
+    }
+
+
+def test_resolve_ref_is_memoized_and_cycle_safe(spec_with_refs):
+    """Test references are resolved once and self references are left in place."""
+    resolver = RefResolver(spec_with_refs)
+
+    tree = resolver.resolve_ref("#/components/schemas/Tree")
+
+    assert tree["properties"]["address"] == {"type": "object", "properties": {"city": {"type": "string"}}}
+    assert tree["properties"]["children"]["items"] == {"$ref": "#/components/schemas/Tree"}
+    assert resolver.resolve_ref("#/components/schemas/Tree") is tree
+    assert resolver.resolve_ref("#/components/schemas/Address") is tree["properties"]["address"]
+
+
+def test_resolve_deep_and_escaped_pointers(spec_with_refs):
+    """Test pointers of any depth with JSON pointer escapes."""
+    resolver = RefResolver(spec_with_refs)
+
+    address = resolver.resolve_ref(
+        "#/paths/~1owners/post/requestBody/content/application~1json/schema/properties/address"
+    )
+    assert address is resolver.resolve_ref("#/components/schemas/Address")
+    assert resolver.resolve_ref("#/components/schemas/a~1b") == {"type": "integer"}
+    with pytest.raises(ValueError):
+        resolver.resolve_ref("#/components/schemas/Missing")
+
+
+def test_resolve_external_file_refs(tmp_path):
+    """Test references into other local documents, relative to the referencing document."""
+    (tmp_path / "common.json").write_text(
+        json.dumps({"Pet": {"type": "object", "properties": {"tag": {"$ref": "#/Tag"}}}, "Tag": {"type": "string"}})
+    )
+    root_uri = (tmp_path / "openapi.json").as_uri()
+    resolver = RefResolver({"schema": {"$ref": "common.json#/Pet"}}, base_uri=root_uri)
+
+    assert resolver.resolve({"$ref": "common.json#/Pet"}) == {
+        "type": "object",
+        "properties": {"tag": {"type": "string"}},
+    }
+
+
+def test_swagger_extractor_resolves_components(spec_with_refs):
+    """Test the extractor resolves OpenAPI 3 component references, including nested ones."""
+    extractor = SwaggerExtractor()
+    extractor._spec = spec_with_refs
+
+    endpoints = {endpoint.path: endpoint for endpoint in extractor._parse_spec()}
+
+    assert endpoints["/trees"].request_body["properties"]["address"]["properties"] == {"city": {"type": "string"}}
+    assert endpoints["/owners"].request_body["properties"]["address"]["type"] == "object"
+
+
+def test_mutual_references_do_not_depend_on_resolution_order(tmp_path):
+    """Test a reference resolved inside a cycle is not memoized with the placeholder of the enclosing one."""
+    spec = {
+        "components": {
+            "schemas": {
+                "A": {"type": "object", "properties": {"b": {"$ref": "#/components/schemas/B"}}},
+                "B": {"type": "object", "properties": {"a": {"$ref": "#/components/schemas/A"}}},
+            }
+        }
+    }
+    a_first = RefResolver(spec)
+    a_first.resolve_ref("#/components/schemas/A")
+
+    b = a_first.resolve_ref("#/components/schemas/B")
+
+    assert b == RefResolver(spec).resolve_ref("#/components/schemas/B")
+    assert b["properties"]["a"]["properties"]["b"] == {"$ref": "#/components/schemas/B"}
+
+    # Placeholders into other documents are absolute, so they can still be looked up
+    (tmp_path / "common.json").write_text(
+        json.dumps({"Node": {"type": "object", "properties": {"next": {"$ref": "#/Node"}}}})
+    )
+    resolver = RefResolver({}, base_uri=(tmp_path / "openapi.json").as_uri())
+    placeholder = resolver.resolve_ref("common.json#/Node")["properties"]["next"]["$ref"]
+    assert placeholder == f"{(tmp_path / 'common.json').as_uri()}#/Node"
+    assert resolver.lookup(placeholder)["type"] == "object"
@@ -0,0 +1,119 @@
+import json
+import tempfile
+from pathlib import Path
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from aiounittest import AsyncTestCase
+
+from ai_api_testing.agents.api_specs_agents.spec_cache import SpecCache
+from ai_api_testing.agents.api_specs_agents.swagger_extractor import SwaggerExtractor
+
+SPEC = {
+    "openapi": "3.0.0",
+    "paths": {
+        "/pets": {
+            "post": {
+                "requestBody": {
+                    "content": {
+                        "application/json": {"schema": {"type": "object", "properties": {"name": {"type": "string"}}}}
+                    },
+                }
+            }
+        }
+    },
+}
+
+
+class SpecServer:
+    """Local stand-in for an API gateway serving its spec with an ETag."""
+
+    def __init__(self):
+        self.spec = SPEC
+        self.version = 1
+        self.spec_requests: list[int] = []
+
+    async def openapi(self, request: web.Request) -> web.Response:
+        etag = f'"v{self.version}"'
+        if request.headers.get("If-None-Match") == etag:
+            self.spec_requests.append(304)
+            return web.Response(status=304, headers={"ETag": etag})
+        self.spec_requests.append(200)
+        return web.json_response(self.spec, headers={"ETag": etag, "Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"})
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/openapi.json", self.openapi)
+        return app
+
+
+class TestSpecCache(AsyncTestCase):
+    """Test the persistent spec cache of the SwaggerExtractor."""
+
+    async def test_revalidates_with_conditional_get(self):
+        """Test repeated extractions cost a single 304 and are served from the cache."""
+        stand_in = SpecServer()
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = SpecCache(directory=Path(cache_dir))
+            async with TestServer(stand_in.app()) as server:
+                url = str(server.make_url(""))
+
+                first = await SwaggerExtractor(cache=cache).extract_endpoints(url)
+                second = await SwaggerExtractor(cache=cache).extract_endpoints(url)
+
+            self.assertEqual(stand_in.spec_requests, [200, 304])
+            self.assertEqual(first, second)
+            self.assertEqual(second[0].request_body["properties"], {"name": {"type": "string"}})
+
+            entry = cache.load(url)
+            self.assertEqual(entry.spec_url, f"{url}/openapi.json")
+            self.assertEqual(entry.etag, '"v1"')
+            self.assertEqual(json.loads(cache.raw(url)), SPEC)
+
+    async def test_refreshes_changed_spec(self):
+        """Test a changed spec is downloaded again and the cached endpoints are replaced."""
+        stand_in = SpecServer()
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = SpecCache(directory=Path(cache_dir))
+            async with TestServer(stand_in.app()) as server:
+                url = str(server.make_url(""))
+                await SwaggerExtractor(cache=cache).extract_endpoints(url)
+
+                stand_in.version = 2
+                stand_in.spec = {"openapi": "3.0.0", "paths": {"/owners": {"get": {}}}}
+                endpoints = await SwaggerExtractor(cache=cache).extract_endpoints(url)
+
+            self.assertEqual(stand_in.spec_requests, [200, 200])
+            self.assertEqual([(e.method, e.path) for e in endpoints], [("GET", "/owners")])
+            self.assertEqual(cache.load(url).etag, '"v2"')
+
+    async def test_caches_endpoints_per_selection(self):
+        """Test a new endpoint selection is parsed from the cached document without downloading it."""
+        stand_in = SpecServer()
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = SpecCache(directory=Path(cache_dir))
+            async with TestServer(stand_in.app()) as server:
+                url = str(server.make_url(""))
+                await SwaggerExtractor(cache=cache).extract_endpoints(url, endpoint_list=["/pets"])
+                endpoints = await SwaggerExtractor(cache=cache).extract_endpoints(url, endpoint_list=["/missing"])
+
+            self.assertEqual(stand_in.spec_requests, [200, 304])
+            self.assertEqual(endpoints, [])
+            self.assertEqual(cache.endpoints(url, ["/missing"]), [])
+
+    async def test_missing_document_is_a_cache_miss(self):
+        """Test an entry whose document was removed is downloaded again instead of failing."""
+        stand_in = SpecServer()
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = SpecCache(directory=Path(cache_dir))
+            async with TestServer(stand_in.app()) as server:
+                url = str(server.make_url(""))
+                await SwaggerExtractor(cache=cache).extract_endpoints(url, endpoint_list=["/pets"])
+                next(Path(cache_dir).glob("*.spec")).unlink()
+
+                self.assertIsNone(cache.load(url))
+                endpoints = await SwaggerExtractor(cache=cache).extract_endpoints(url, endpoint_list=["/pets"])
+
+            self.assertEqual(stand_in.spec_requests, [200, 200])
+            self.assertEqual([(e.method, e.path) for e in endpoints], [("POST", "/pets")])
+            self.assertEqual(list(Path(cache_dir).glob("*.tmp")), [])
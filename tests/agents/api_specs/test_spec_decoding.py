@@ -0,0 +1,124 @@
+import asyncio
+import io
+import json
+
+import pytest
+import yaml
+
+from ai_api_testing.agents.api_specs_agents.lazy_spec import LazyJSONObject
+from ai_api_testing.agents.api_specs_agents.spec_decoding import (
+    decode_spec,
+    is_local_source,
+    load_document_source,
+    load_spec_source,
+    sniff_format,
+)
+from ai_api_testing.agents.api_specs_agents.swagger_extractor import SwaggerExtractor
+
+
+@pytest.fixture
+def petstore_spec():
+    """Small OpenAPI spec with a POST endpoint."""
+    return {
+        "openapi": "3.0.0",
+        "paths": {
+            "/pets": {
+                "post": {
+                    "requestBody": {
+                        "content": {
+                            "application/json": {
+                                "schema": {"type": "object", "properties": {"name": {"type": "string"}}}
+                            }
+                        }
+                    }
+                }
+            }
+        },
+    }
+
+
+def test_sniff_format():
+    """Test the format is guessed from the body, whatever the content type."""
+    assert sniff_format(b'\xef\xbb\xbf  {"openapi": "3.0.0"}') == "json"
+    assert sniff_format("\n  {}") == "json"
+    assert sniff_format(b"openapi: 3.0.0\npaths: {}\n") == "yaml"
+
+
+def test_decode_spec(petstore_spec):
+    """Test JSON and YAML documents decode to the same spec, and non-specs are rejected."""
+    as_json = json.dumps(petstore_spec).encode()
+
+    assert decode_spec(as_json) == petstore_spec
+    assert decode_spec(yaml.safe_dump(petstore_spec)) == petstore_spec
+    assert isinstance(decode_spec(as_json, lazy=True), LazyJSONObject)
+    assert decode_spec(as_json, lazy=True) == petstore_spec
+    for invalid in (b"Invalid YAML content", b"{not json", b"key: [unclosed", b'{"error": "Not found"}', b"paths: {}"):
+        with pytest.raises(ValueError):
+            decode_spec(invalid)
+    with pytest.raises(ValueError, match="not an OpenAPI/Swagger specification"):
+        decode_spec(b'{"detail": "Not found"}', lazy=True)
+
+
+def test_load_document_source(tmp_path):
+    """Test documents that are not whole specs, e.g. the targets of external refs, still load."""
+    path = tmp_path / "schemas.yaml"
+    path.write_text(yaml.safe_dump({"Pet": {"type": "object"}}))
+
+    assert load_document_source(path) == {"Pet": {"type": "object"}}
+    with pytest.raises(ValueError, match="not an OpenAPI/Swagger specification"):
+        load_spec_source(path)
+
+
+def test_load_spec_source_local_files(tmp_path, petstore_spec, monkeypatch):
+    """Test local paths, file:// URIs and stdin, with large JSON files indexed lazily."""
+    json_path = tmp_path / "openapi.json"
+    json_path.write_text(json.dumps(petstore_spec))
+    yaml_path = tmp_path / "open api.yaml"
+    yaml_path.write_text(yaml.safe_dump(petstore_spec))
+
+    assert load_spec_source(json_path) == petstore_spec
+    assert not isinstance(load_spec_source(json_path), LazyJSONObject)
+    assert isinstance(load_spec_source(json_path, lazy_threshold=10), LazyJSONObject)
+    assert load_spec_source(yaml_path.as_uri()) == petstore_spec
+
+    monkeypatch.setattr("sys.stdin", io.TextIOWrapper(io.BytesIO(yaml_path.read_bytes())))
+    assert load_spec_source("-") == petstore_spec
+
+    (tmp_path / "empty.json").write_bytes(b"")
+    with pytest.raises(ValueError):
+        load_spec_source(tmp_path / "empty.json")
+
+
+def test_extract_endpoints_from_local_spec(tmp_path, petstore_spec):
+    """Test the extractor reads local specs without any network access."""
+    spec_path = tmp_path / "openapi.yaml"
+    spec_path.write_text(yaml.safe_dump(petstore_spec))
+    assert is_local_source(str(spec_path))
+    assert not is_local_source("https://petstore.swagger.io")
+
+    endpoints = asyncio.run(SwaggerExtractor().extract_endpoints(str(spec_path)))
+
+    assert [(endpoint.method, endpoint.path) for endpoint in endpoints] == [("POST", "/pets")]
+    assert endpoints[0].request_body["properties"] == {"name": {"type": "string"}}
+
+
+def test_local_spec_refs_resolve_next_to_the_spec(tmp_path, monkeypatch):
+    """Test relative refs of a local spec resolve against its directory, and a broken one only skips its body."""
+    specs = tmp_path / "specs"
+    specs.mkdir()
+    (specs / "common.json").write_text(json.dumps({"Pet": {"type": "object", "required": ["name"]}}))
+    spec = {
+        "openapi": "3.0.0",
+        "paths": {
+            path: {"post": {"requestBody": {"content": {"application/json": {"schema": {"$ref": ref}}}}}}
+            for path, ref in (("/pets", "common.json#/Pet"), ("/owners", "missing.json#/Owner"))
+        },
+    }
+    (specs / "openapi.json").write_text(json.dumps(spec))
+    (tmp_path / "elsewhere").mkdir()
+    monkeypatch.chdir(tmp_path / "elsewhere")
+
+    endpoints = asyncio.run(SwaggerExtractor().extract_endpoints("../specs/openapi.json"))
+
+    bodies = {endpoint.path: endpoint.request_body for endpoint in endpoints}
+    assert bodies == {"/pets": {"type": "object", "required": ["name"]}, "/owners": None}
@@ -1,8 +1,11 @@
+import asyncio
 import json
+import time
 from unittest.mock import AsyncMock, patch
 
 import pytest
-import yaml
+from aiohttp import web
+from aiohttp.test_utils import TestServer
 from aiounittest import AsyncTestCase
 
 from ai_api_testing.agents.api_specs_agents.swagger_extractor import SwaggerExtractor
@@ -12,6 +15,7 @@ from ai_api_testing.agents.api_specs_agents.swagger_extractor import SwaggerExtr
 def simple_openapi_spec():
     """Simple OpenAPI spec with a GET and POST endpoint."""
     return {
+        "swagger": "2.0",
         "paths": {
             "/pets": {
                 "get": {
@@ -40,7 +44,7 @@ def simple_openapi_spec():
                     }
                 },
             }
-        }
+        },
     }
 
 
@@ -105,13 +109,13 @@ class TestSwaggerExtractor(AsyncTestCase):
     @pytest.mark.filterwarnings("ignore::RuntimeWarning")
     async def test_try_direct_spec_access(self):
         """Test direct access to OpenAPI spec with different response scenarios."""
-        simple_openapi_spec = {"paths": {"/test": {"get": {}}}}  # Simple mock spec
+        simple_openapi_spec = {"swagger": "2.0", "paths": {"/test": {"get": {}}}}  # Simple mock spec
         extractor = SwaggerExtractor()
 
         # Create a mock response
         mock_response = AsyncMock()
         mock_response.status = 200
-        mock_response.json = AsyncMock(return_value=simple_openapi_spec)
+        mock_response.read = AsyncMock(return_value=json.dumps(simple_openapi_spec).encode())
         mock_response.__aenter__ = AsyncMock(return_value=mock_response)
         mock_response.__aexit__ = AsyncMock(return_value=None)
         mock_response.content_type = "application/json"
@@ -135,9 +139,7 @@ class TestSwaggerExtractor(AsyncTestCase):
         # Create a mock response that will fail JSON parsing
         mock_response = AsyncMock()
         mock_response.status = 200
-        json_error = json.JSONDecodeError("Expecting value", "<string>", 0)
-        mock_response.json.side_effect = json_error
-        mock_response.text = AsyncMock(return_value="Invalid YAML content")
+        mock_response.read = AsyncMock(return_value=b"Invalid YAML content")
         mock_response.close = AsyncMock(return_value=None)
 
         # Create a mock session with context manager methods
@@ -146,10 +148,7 @@ class TestSwaggerExtractor(AsyncTestCase):
         mock_session.__aenter__ = AsyncMock(return_value=mock_session)
         mock_session.__aexit__ = AsyncMock(return_value=None)
 
-        with (
-            patch("aiohttp.ClientSession", return_value=mock_session),
-            patch("yaml.safe_load", side_effect=yaml.YAMLError("Invalid YAML")),
-        ):
+        with patch("aiohttp.ClientSession", return_value=mock_session):
             result = await extractor._try_direct_spec_access("http://api.example.com")
 
             # Verify not available to parse JSON nor YAML
@@ -170,3 +169,100 @@ class TestSwaggerExtractor(AsyncTestCase):
             self.assertEqual(mock_session.get.call_count, expected_calls)
 
             self.assertEqual(mock_response.close.call_count, expected_calls)
+
+    async def test_try_direct_spec_access_hanging_candidate(self):
+        """Test a hanging earlier candidate path only delays discovery until its probe times out."""
+        spec = {"openapi": "3.0.0", "paths": {"/test": {"get": {}}}}
+        release = asyncio.Event()
+
+        async def hanging(request):
+            await release.wait()
+            return web.json_response({})
+
+        async def openapi(request):
+            return web.json_response(spec)
+
+        app = web.Application()
+        app.router.add_get("/", hanging)
+        app.router.add_get("/openapi.json", openapi)
+
+        async with TestServer(app) as server:
+            extractor = SwaggerExtractor(probe_timeout=0.3, discovery_timeout=5)
+            start = time.perf_counter()
+            result = await extractor._try_direct_spec_access(str(server.make_url("")))
+            elapsed = time.perf_counter() - start
+            release.set()
+
+        self.assertTrue(result)
+        self.assertEqual(extractor._spec, spec)
+        self.assertLess(elapsed, 2)
+
+    async def test_try_direct_spec_access_earliest_candidate_wins(self):
+        """Test a slower spec at an earlier candidate path wins over a faster later one."""
+        root_spec = {"openapi": "3.0.0", "paths": {"/root": {"get": {}}}}
+
+        async def slow_root(request):
+            await asyncio.sleep(0.2)
+            return web.json_response(root_spec)
+
+        async def swagger(request):
+            return web.json_response({"swagger": "2.0", "paths": {"/swagger": {"get": {}}}})
+
+        app = web.Application()
+        app.router.add_get("/", slow_root)
+        app.router.add_get("/swagger.json", swagger)
+
+        async with TestServer(app) as server:
+            extractor = SwaggerExtractor(probe_timeout=5, discovery_timeout=5)
+            result = await extractor._try_direct_spec_access(str(server.make_url("")))
+
+        self.assertTrue(result)
+        self.assertEqual(extractor._spec, root_spec)
+
+    async def test_try_direct_spec_access_timeout(self):
+        """Test discovery gives up after the probe timeout when every path hangs."""
+        release = asyncio.Event()
+
+        async def hanging(request):
+            await release.wait()
+            return web.json_response({})
+
+        app = web.Application()
+        app.router.add_get("/{tail:.*}", hanging)
+
+        async with TestServer(app) as server:
+            extractor = SwaggerExtractor(probe_timeout=0.2, discovery_timeout=5)
+            start = time.perf_counter()
+            result = await extractor._try_direct_spec_access(str(server.make_url("")))
+            elapsed = time.perf_counter() - start
+            release.set()
+
+        self.assertFalse(result)
+        self.assertLess(elapsed, 2)
+
+    async def test_concurrent_extractions_without_entering_use_their_own_session(self):
+        """Test an extraction finishing first does not close the session of a concurrent one."""
+        fast_spec = {"openapi": "3.0.0", "paths": {"/fast": {"get": {}}}}
+        slow_spec = {"openapi": "3.0.0", "paths": {"/slow": {"get": {}}}}
+
+        async def fast(request):
+            return web.json_response(fast_spec)
+
+        async def slow(request):
+            await asyncio.sleep(0.3)
+            return web.json_response(slow_spec)
+
+        app = web.Application()
+        app.router.add_get("/fast", fast)
+        app.router.add_get("/slow", slow)
+
+        async with TestServer(app) as server:
+            extractor = SwaggerExtractor(probe_timeout=5, discovery_timeout=5)
+            fast_endpoints, slow_endpoints = await asyncio.gather(
+                extractor.extract_endpoints(str(server.make_url("/fast"))),
+                extractor.extract_endpoints(str(server.make_url("/slow"))),
+            )
+
+        self.assertEqual([endpoint.path for endpoint in slow_endpoints], ["/slow"])
+        self.assertEqual([endpoint.path for endpoint in fast_endpoints], ["/fast"])
+        self.assertIsNone(extractor._session)
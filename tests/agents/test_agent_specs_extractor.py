@@ -0,0 +1,18 @@
+import pytest
+
+from ai_api_testing.agents import agent_specs_extractor as module
+
+
+def test_agent_specs_extractor_is_still_importable(monkeypatch):
+    """Test the former module-level agent resolves to the lazily built one."""
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    module.get_settings.cache_clear()
+    module.get_agent_specs_extractor.cache_clear()
+
+    from ai_api_testing.agents.agent_specs_extractor import agent_specs_extractor
+
+    assert agent_specs_extractor is module.get_agent_specs_extractor()
+    with pytest.raises(AttributeError):
+        module.missing  # noqa: B018
+    module.get_settings.cache_clear()
+    module.get_agent_specs_extractor.cache_clear()
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from ai_api_testing.agents.test_generator_agents.assertions import compile_assertions
+from ai_api_testing.agents.test_generator_agents.executor import Executor
+
+
+class ThresholdModel:
+    """Class 1 when `x` is above 5, the probability growing linearly with `x`."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def predict(self, x):
+        self.calls += 1
+        return (x[:, 0] > 5).astype(int)
+
+    def predict_proba(self, x):
+        p = np.clip(x[:, 0] / 10, 0, 1)
+        return np.column_stack([1 - p, p])
+
+
+@pytest.fixture
+def cases(make_test_case):
+    """Cases with class, probability, range and monotonicity expectations, and a free form one."""
+    return [
+        make_test_case({"x": 8.0, "y": 0.0}, "high", expected_output_json={"class": 1, "min_probability": 0.7}),
+        make_test_case({"x": 2.0, "y": 0.0}, "low", expected_output_json={"class": 1}),
+        make_test_case(
+            [{"x": 9.0, "y": 1.0}, {"x": 1.0, "y": 1.0}], "batch", expected_output_json=[{"min": 1}, {"max": 0}]
+        ),
+        make_test_case(
+            {"x": 4.0, "y": 0.0},
+            "higher",
+            expected_output_json={"greater_than_case": "high", "max_probability": 0.5},
+        ),
+        make_test_case({"x": 3.0, "y": 0.0}, "free form", expected_output_json={"message": "anything"}),
+    ]
+
+
+def test_execute_batch_grades_every_row(cases):
+    """Test the batch is predicted in chunks and graded into pass/fail columns."""
+    model = ThresholdModel()
+
+    results = Executor().execute_batch(cases, model, predict_proba=True, batch_size=4)
+
+    assert model.calls == 2
+    assert results["case"].tolist() == ["high", "low", "batch", "batch", "higher", "free form"]
+    assert results["prediction"].tolist() == [1, 0, 1, 0, 0, 0]
+    assert results["class_passed"].tolist() == [True, False, True, True, True, True]
+    assert results["monotonic_passed"].tolist() == [True, True, True, True, False, True]
+    assert results["passed"].tolist() == [True, False, True, True, False, True]
+    assert results["probability"].shape == (6, 2)
+
+
+def test_probability_checks_need_probabilities(cases):
+    """Test probability bounds are only graded with predict_proba outputs."""
+    assertions = compile_assertions(cases[:1])
+    predictions = np.array([1])
+
+    assert assertions.evaluate(predictions)["passed"].tolist() == [True]
+    assert assertions.evaluate(predictions, np.array([[0.4, 0.6]]))["probability_passed"].tolist() == [False]
+
+
+def test_execute_with_assertion(cases):
+    """Test a single execution raises when its assertion fails."""
+    executor = Executor()
+
+    assert executor.execute(cases[0], ThresholdModel(), assertion=True).tolist() == [1]
+    with pytest.raises(AssertionError, match="class"):
+        executor.execute(cases[1], ThresholdModel(), assertion=True)
+    with pytest.raises(AssertionError, match="probability"):
+        executor.execute(cases[0], ThresholdModel(), predict_proba=True, assertion={"max_probability": 0.5})
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from ai_api_testing.agents.test_generator_agents.assertions import compile_assertions
+from ai_api_testing.agents.test_generator_agents.boundary_search import BoundarySearch
+
+FEATURES = ["income", "debt"]
+RANGES = {"income": (0.0, 100.0), "debt": (0.0, 50.0)}
+
+
+class CreditModel:
+    """Approves when income exceeds twice the debt plus 10."""
+
+    def predict(self, x):
+        return (x[:, 0] - 2 * x[:, 1] > 10).astype(int)
+
+    def predict_proba(self, x):
+        p = 1 / (1 + np.exp(-(x[:, 0] - 2 * x[:, 1] - 10)))
+        return np.column_stack([1 - p, p])
+
+
+def _anchors(n: int) -> np.ndarray:
+    rng = np.random.default_rng(1)
+    return np.column_stack([rng.uniform(0, 100, n), rng.uniform(0, 50, n)])
+
+
+def test_scan_finds_the_boundary_in_few_calls():
+    """Test the crossings of hundreds of anchors are bisected together, one call per round."""
+    search = BoundarySearch(CreditModel(), FEATURES)
+
+    result = search.scan(_anchors(300), RANGES, grid=16, rounds=30, tol=1e-6)
+
+    assert len(result) > 300
+    assert result.calls <= 31
+    margin = result.points[:, 0] - 2 * result.points[:, 1] - 10
+    assert np.abs(margin).max() < 1e-5
+    assert (result.label_lower != result.label_upper).all()
+    assert set(result.feature.tolist()) == {0, 1}
+
+
+def test_explore_along_random_directions():
+    """Test multi-feature directions find more crossings around known boundary points."""
+    search = BoundarySearch(CreditModel(), FEATURES, seed=0)
+    found = search.scan(_anchors(20), RANGES, features=["income"], rounds=25)
+
+    explored = search.explore(found.points, RANGES, directions=16, radius=0.05, rounds=25)
+
+    assert len(explored) > len(found)
+    assert (explored.feature == -1).all()
+    assert np.abs(explored.points[:, 0] - 2 * explored.points[:, 1] - 10).max() < 1e-3
+
+
+def test_constant_model_has_no_boundary():
+    """Test a model without any decision change yields empty results instead of failing."""
+
+    class ConstantModel:
+        def predict(self, x):
+            return np.ones(len(x), dtype=int)
+
+    search = BoundarySearch(ConstantModel(), FEATURES, seed=0)
+    found = search.scan(_anchors(10), RANGES)
+
+    explored = search.explore(found.points, RANGES)
+
+    assert len(found) == 0
+    assert len(explored) == 0
+    assert explored.points.shape == (0, len(FEATURES))
+    assert explored.calls == 0
+    assert list(search.iter_test_cases(explored)) == []
+
+
+def test_boundary_test_cases_are_graded_by_their_side():
+    """Test boundary test cases expect the score side they lie on."""
+    model = CreditModel()
+    search = BoundarySearch(model, FEATURES, predict_proba=True, threshold=0.5)
+    result = search.scan(_anchors(5), RANGES, features=["debt"], rounds=25)
+
+    cases = list(search.iter_test_cases(result))
+
+    assert len(cases) == 2 * len(result)
+    assert cases[0].expected_output_json in ({"min_probability": 0.5}, {"max_probability": 0.5})
+    x = np.array([[case.input_json[name] for name in FEATURES] for case in cases])
+    graded = compile_assertions(cases).evaluate(model.predict(x), model.predict_proba(x))
+    assert graded["passed"].all()
+    with pytest.raises(ValueError, match="threshold"):
+        BoundarySearch(model, FEATURES, predict_proba=True)
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from ai_api_testing.agents.test_generator_agents.drift import DriftSketch
+from ai_api_testing.agents.test_generator_agents.sampler import FeatureSpec, PopulationSampler
+
+TRAINING_STATS = {
+    "petal length (cm)": {"mean": 3.76, "std": 1.76, "min": 1.0, "25%": 1.6, "50%": 4.35, "75%": 5.1, "max": 6.9},
+    "petal width (cm)": {"min": 0.1, "max": 2.5},
+}
+
+
+def test_training_like_inputs_do_not_drift():
+    """Test inputs sampled from the training statistics cover them without drift."""
+    sketch = DriftSketch.from_stats(TRAINING_STATS)
+    sketch.update(PopulationSampler.from_stats(TRAINING_STATS, seed=0).sample(50_000, design="random"))
+
+    for report in sketch.report():
+        assert report.psi < 0.01
+        assert report.ks < 0.02
+        assert report.out_of_range == 0
+        assert report.bin_coverage == 1
+        assert not report.drifted
+
+
+def test_shifted_inputs_drift():
+    """Test inputs concentrated in a narrow region, partly out of range, are flagged."""
+    sketch = DriftSketch.from_stats(TRAINING_STATS)
+    rng = np.random.default_rng(0)
+    sketch.update(np.column_stack([rng.uniform(6, 8, 10_000), rng.uniform(0.1, 2.5, 10_000)]))
+
+    length, width = sketch.report()
+
+    assert length.drifted and length.psi > 1
+    assert length.out_of_range == pytest.approx(0.55, abs=0.02)
+    assert length.bin_coverage < 0.2
+    assert not width.drifted
+
+
+def test_shards_merge_like_a_single_pass():
+    """Test sketches of shards merge into the sketch of the whole stream."""
+    x = PopulationSampler.from_stats(TRAINING_STATS, seed=1).sample(9_000, design="random")
+    whole, first, second = (DriftSketch.from_stats(TRAINING_STATS) for _ in range(3))
+    whole.update(x)
+    first.update(x[:4_000])
+    second.update(x[4_000:])
+
+    merged = first.merge(second)
+
+    for name, sketch in merged.sketches.items():
+        assert sketch.counts.tolist() == whole.sketches[name].counts.tolist()
+    assert [r.psi for r in merged.report()] == pytest.approx([r.psi for r in whole.report()])
+    assert merged.sketches["petal width (cm)"].quantile(0.5) == pytest.approx(np.median(x[:, 1]), abs=0.1)
+    with pytest.raises(ValueError, match="same features"):
+        merged.merge(DriftSketch([FeatureSpec(name="other", low=0, high=1)]))
+
+
+def test_update_from_test_case_stream(make_test_case):
+    """Test test case inputs are sketched in chunks, missing features counted apart."""
+    cases = (make_test_case({"petal length (cm)": 1.0 + i % 6}, f"case {i}") for i in range(25))
+    sketch = DriftSketch.from_stats(TRAINING_STATS, bins=10)
+    sketch.update_cases(cases, chunk_size=10)
+
+    length, width = sketch.report()
+
+    assert (length.n, length.missing, length.min, length.max) == (25, 0, 1.0, 6.0)
+    assert (width.n, width.missing) == (0, 25)
+
+
+def test_integer_features():
+    """Test integer features are binned between the integers."""
+    feature = FeatureSpec(name="children", low=0, high=4, integer=True)
+    sketch = DriftSketch([feature])
+    sketch.update(PopulationSampler([feature], seed=0).sample(20_000, design="random"))
+
+    (report,) = sketch.report()
+
+    assert report.psi < 0.01
+    assert sketch.sketches["children"].edges.tolist() == [-0.5, 0.5, 1.5, 2.5, 3.5, 4.5]
@@ -0,0 +1,131 @@
+from ai_api_testing.agents.api_specs_agents.base_extractor import APIEndpoint
+from ai_api_testing.agents.test_generator_agents.fuzzer import SchemaFuzzer, compile_generator, fuzz_test_cases
+
+PET_SCHEMA = {
+    "type": "object",
+    "required": ["name", "age"],
+    "additionalProperties": False,
+    "properties": {
+        "name": {"type": "string", "minLength": 1, "maxLength": 20},
+        "age": {"type": "integer", "minimum": 0, "exclusiveMaximum": 30},
+        "kind": {"enum": ["cat", "dog"]},
+        "tags": {"type": "array", "items": {"type": "string"}, "maxItems": 3},
+        "owner": {"$ref": "#/components/schemas/Owner"},
+    },
+}
+ROOT = {
+    "components": {
+        "schemas": {
+            "Owner": {
+                "type": "object",
+                "required": ["email"],
+                "properties": {
+                    "email": {"type": "string", "format": "email"},
+                    "referrer": {"$ref": "#/components/schemas/Owner"},
+                },
+            }
+        }
+    }
+}
+
+
+def test_same_seed_same_payloads():
+    """Test the payload stream is reproducible from its seed."""
+    first = [p.payload for p in SchemaFuzzer(PET_SCHEMA, ROOT, seed=3).payloads(200)]
+    second = [p.payload for p in SchemaFuzzer(PET_SCHEMA, ROOT, seed=3).payloads(200)]
+    third = [p.payload for p in SchemaFuzzer(PET_SCHEMA, ROOT, seed=4).payloads(200)]
+
+    assert first == second
+    assert first != third
+
+
+def test_valid_and_boundary_payloads_match_the_schema():
+    """Test generated valid and boundary payloads pass the compiled validator."""
+    fuzzer = SchemaFuzzer(PET_SCHEMA, ROOT, seed=0)
+
+    for kind in ("valid", "boundary"):
+        payloads = [fuzzer.generate(kind) for _ in range(300)]
+        assert all(p.valid for p in payloads), [p.errors for p in payloads if not p.valid][:3]
+    assert {0, 29} <= {fuzzer.generate("boundary").payload["age"] for _ in range(100)}
+
+
+def test_invalid_payloads_apply_mutations():
+    """Test invalid payloads are mostly rejected and cover the mutation kinds."""
+    payloads = list(SchemaFuzzer(PET_SCHEMA, ROOT, seed=1).payloads(1000, {"invalid": 1.0}))
+
+    mutations = {p.mutation for p in payloads if not p.valid}
+    assert {"missing_required", "type_confusion", "extreme_number", "out_of_enum", "unexpected_field"} <= mutations
+    assert sum(p.valid for p in payloads) / len(payloads) < 0.2
+    assert any("missing required field" in error for p in payloads for error in p.errors)
+
+
+def test_exclusive_bounds_by_kind():
+    """Test exclusive bounds step by a relative epsilon for numbers and to the next integer for integers."""
+    schema = {
+        "type": "object",
+        "required": ["ratio", "count"],
+        "properties": {
+            "ratio": {"type": "number", "exclusiveMinimum": 0, "maximum": 1},
+            "count": {"type": "integer", "exclusiveMinimum": 0.5, "exclusiveMaximum": 4},
+        },
+    }
+    fuzzer = SchemaFuzzer(schema, seed=5)
+
+    payloads = [fuzzer.generate("boundary") for _ in range(200)]
+
+    assert all(p.valid for p in payloads)
+    assert 0 < min(p.payload["ratio"] for p in payloads) < 1e-6
+    assert {p.payload["count"] for p in payloads} == {1, 3}
+
+
+def test_unresolvable_refs_generate_any_value():
+    """Test references to other documents or missing components are not looked up but still generate values."""
+    for ref in ("common.yaml#/components/schemas/Pet", "#/components/schemas/Missing"):
+        fuzzer = SchemaFuzzer({"type": "object", "required": ["pet"], "properties": {"pet": {"$ref": ref}}}, seed=6)
+        assert all("pet" in p.payload and p.valid for p in fuzzer.payloads(20, {"valid": 1.0}))
+
+
+def test_generator_is_compiled_once_per_schema():
+    """Test identical schemas share the compiled generator."""
+    assert compile_generator(dict(PET_SCHEMA), ROOT) is compile_generator(PET_SCHEMA, ROOT)
+
+
+def test_fuzz_test_cases_mutate_the_corpus(make_test_case):
+    """Test fuzzed test cases target the endpoint and reuse the corpus inputs."""
+    endpoint = APIEndpoint(path="/pets", method="POST", request_body=PET_SCHEMA)
+    corpus = [make_test_case({"name": "Garfield", "age": 12, "kind": "cat"}, "llm case", path="/pets")]
+
+    cases = list(fuzz_test_cases(endpoint, 300, seed=5, corpus=corpus, root=ROOT, mix={"invalid": 1.0}))
+
+    assert cases and all((case.path, case.method) == ("/pets", "POST") for case in cases)
+    assert all(case.name.startswith("fuzz invalid") for case in cases)
+    assert any(isinstance(case.input_json, dict) and case.input_json.get("name") == "Garfield" for case in cases)
+    assert any("4xx" in case.expected_output_prompt for case in cases)
+
+
+def test_fuzz_test_cases_match_corpus_paths_to_the_template(make_test_case):
+    """Test corpus cases stored with a concrete path seed the mutations of their templated endpoint."""
+    endpoint = APIEndpoint(path="/pets/{petId}", method="PUT", request_body=PET_SCHEMA)
+    corpus = [make_test_case({"name": "Garfield", "age": 12}, "llm case", path="/pets/42", method="put")]
+
+    cases = list(fuzz_test_cases(endpoint, 100, seed=7, corpus=corpus, root=ROOT, mix={"invalid": 1.0}))
+
+    assert any(isinstance(case.input_json, dict) and case.input_json.get("name") == "Garfield" for case in cases)
+
+
+def test_unsatisfiable_bounds_only_generate_invalid_edges():
+    """Test an integer schema without any valid value generates its invalid edges instead of failing."""
+    schema = {
+        "type": "object",
+        "required": ["count", "size"],
+        "properties": {
+            "count": {"type": "integer", "exclusiveMinimum": 0, "exclusiveMaximum": 1},
+            "size": {"type": ["integer", "string"], "minimum": 5, "maximum": 4},
+        },
+    }
+
+    payloads = list(SchemaFuzzer(schema, seed=8).payloads(200))
+
+    assert {p.payload["count"] for p in payloads if p.mutation is None} <= {0, 1}
+    assert all(isinstance(p.payload["size"], str) for p in payloads if p.kind != "invalid")
+    assert not any(p.valid for p in payloads)
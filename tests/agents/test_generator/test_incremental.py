@@ -0,0 +1,107 @@
+import json
+
+from aiounittest import AsyncTestCase
+
+from ai_api_testing.agents.api_specs_agents.base_extractor import APIEndpoint
+from ai_api_testing.agents.test_generator_agents.incremental import GeneratedCorpus, diff_endpoints, regenerate
+from ai_api_testing.core import models
+from pydantic_ai import Agent
+from pydantic_ai.messages import ModelResponse, ToolCallPart
+from pydantic_ai.models.function import FunctionModel
+
+SPEC_PREFIX = "Generate test cases for API spec: "
+
+
+def _case_generator_agent(prompts: list[str], skip: tuple[str, ...] = ()) -> Agent:
+    """Agent generating one case per endpoint of its prompt, on a concrete path, except for the `skip` paths."""
+
+    def generate(messages, agent_info):
+        prompt = messages[-1].parts[-1].content
+        prompts.append(prompt)
+        endpoints = json.loads(prompt.removeprefix(SPEC_PREFIX))
+        cases = [
+            {
+                "name": f"{endpoint['method']} {endpoint['path']}",
+                "description": "",
+                "path": endpoint["path"].replace("{petId}", "7"),
+                "method": endpoint["method"],
+                "input_json": None,
+                "expected_output_prompt": None,
+                "expected_output_json": None,
+                "preconditions": None,
+            }
+            for endpoint in endpoints
+            if endpoint["path"] not in skip
+        ]
+        return ModelResponse(
+            parts=[ToolCallPart.from_raw_args(agent_info.result_tools[0].name, json.dumps({"response": cases}))]
+        )
+
+    return Agent(FunctionModel(generate), name="cases", result_type=list[models.TestCase])
+
+
+def _endpoints(pet_schema: dict) -> list[APIEndpoint]:
+    return [
+        APIEndpoint(path="/pets", method="GET"),
+        APIEndpoint(path="/pets", method="POST", request_body=pet_schema),
+        APIEndpoint(path="/pets/{petId}", method="GET"),
+    ]
+
+
+def test_content_hash_ignores_key_order():
+    """Test the endpoint hash only depends on its content."""
+    first = APIEndpoint(path="/pets", method="post", request_body={"type": "object", "required": ["name"]})
+    second = APIEndpoint(path="/pets", method="POST", request_body={"required": ["name"], "type": "object"})
+
+    assert first.content_hash() == second.content_hash()
+    assert first.content_hash() != APIEndpoint(path="/pets", method="POST").content_hash()
+
+
+class TestIncrementalRegeneration(AsyncTestCase):
+    """Test only the added and changed endpoints go through the agents."""
+
+    async def test_regenerate_only_changed_endpoints(self):
+        """Test a second run reuses the cases of unchanged endpoints."""
+        prompts: list[str] = []
+        agents = [(_case_generator_agent(prompts), {"user_prompt": SPEC_PREFIX})]
+
+        corpus, diff = await regenerate(agents, _endpoints({"type": "object"}))
+        self.assertEqual(len(diff.added), 3)
+        self.assertEqual(corpus.cases["GET /pets/{petId}"][0].path, "/pets/7")
+
+        corpus = GeneratedCorpus.model_validate_json(corpus.model_dump_json())
+        new_endpoints = _endpoints({"type": "object", "required": ["name"]})[1:] + [
+            APIEndpoint(path="/owners", method="GET")
+        ]
+        updated, diff = await regenerate(agents, new_endpoints, corpus)
+
+        self.assertEqual(diff, diff_endpoints(corpus, new_endpoints))
+        self.assertEqual((diff.added, diff.changed), (["GET /owners"], ["POST /pets"]))
+        self.assertEqual((diff.removed, diff.unchanged), (["GET /pets"], ["GET /pets/{petId}"]))
+        self.assertEqual(len(prompts), 2)
+        self.assertEqual(
+            [endpoint["path"] for endpoint in json.loads(prompts[1][len(SPEC_PREFIX) :])], ["/pets", "/owners"]
+        )
+        self.assertEqual(updated.cases["GET /pets/{petId}"], corpus.cases["GET /pets/{petId}"])
+        self.assertEqual(sorted(updated.cases), ["GET /owners", "GET /pets/{petId}", "POST /pets"])
+
+        _, diff = await regenerate(agents, new_endpoints, updated)
+        self.assertEqual(diff.to_generate, [])
+        self.assertEqual(len(prompts), 2)
+
+    async def test_endpoints_without_cases_are_generated_again(self):
+        """Test a regenerated endpoint the agents produced no case for is not recorded as generated."""
+        prompts: list[str] = []
+        corpus, _ = await regenerate([(_case_generator_agent(prompts), {"user_prompt": SPEC_PREFIX})], _endpoints({}))
+
+        agents = [(_case_generator_agent(prompts, skip=("/pets", "/owners")), {"user_prompt": SPEC_PREFIX})]
+        new_endpoints = _endpoints({"type": "object"}) + [APIEndpoint(path="/owners", method="GET")]
+        updated, diff = await regenerate(agents, new_endpoints, corpus)
+
+        self.assertEqual((diff.added, diff.changed), (["GET /owners"], ["POST /pets"]))
+        self.assertNotIn("GET /owners", updated.endpoint_hashes)
+        self.assertEqual(updated.endpoint_hashes["POST /pets"], corpus.endpoint_hashes["POST /pets"])
+        self.assertEqual(updated.cases["POST /pets"], corpus.cases["POST /pets"])
+
+        diff = diff_endpoints(updated, new_endpoints)
+        self.assertEqual((diff.added, diff.changed), (["GET /owners"], ["POST /pets"]))
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from ai_api_testing.agents.test_generator_agents.executor import encode_inputs
+from ai_api_testing.agents.test_generator_agents.metamorphic import MetamorphicRelation, MetamorphicTester
+
+FEATURES = ["income", "age", "gender"]
+
+
+class ScoringModel:
+    """Score increasing with income, biased on gender for older applicants only."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def predict(self, x):
+        self.calls += 1
+        return 0.01 * x[:, 0] + 0.5 * x[:, 2] * (x[:, 1] > 60)
+
+    def predict_proba(self, x):
+        score = 1 / (1 + np.exp(-self.predict(x)))
+        return np.column_stack([1 - score, score])
+
+
+def _population(n: int) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    return np.column_stack([rng.uniform(0, 100, n), rng.integers(18, 81, n), rng.integers(0, 2, n)]).astype(float)
+
+
+def test_relations_violation_rates():
+    """Test the invariance and monotonicity violations are counted per relation in one call per chunk."""
+    model = ScoringModel()
+    tester = MetamorphicTester(model, FEATURES, batch_size=50_000)
+    x = _population(200_000)
+    relations = [
+        MetamorphicRelation(name="gender fairness", feature="gender", tolerance=1e-6),
+        MetamorphicRelation(name="income monotone", feature="income", transform="shift", value=10, expect="increasing"),
+        MetamorphicRelation(
+            name="income not decreasing", feature="income", transform="scale", value=2, expect="decreasing"
+        ),
+    ]
+
+    fairness, monotone, decreasing = tester.run(x, relations)
+
+    assert model.calls == 4
+    assert fairness.n_pairs == monotone.n_pairs == len(x)
+    assert fairness.violation_rate == pytest.approx((x[:, 1] > 60).mean())
+    assert fairness.max_abs_change == pytest.approx(0.5)
+    assert all(x[i, 1] > 60 for i in fairness.examples)
+    assert monotone.violations == 0
+    # Doubling a zero income leaves the score unchanged, every other row increases
+    assert decreasing.violations == np.count_nonzero(x[:, 0])
+
+
+def test_run_test_cases_with_probabilities(make_test_case):
+    """Test relations run on test case inputs, comparing the positive class probability."""
+    cases = [
+        make_test_case({"gender": gender, "age": age, "income": 50.0}, f"case {i}")
+        for i, (age, gender) in enumerate([(30, 0), (70, 1), (70, 0)])
+    ]
+    tester = MetamorphicTester(ScoringModel(), FEATURES, predict_proba=True)
+
+    (report,) = tester.run_test_cases(cases, [MetamorphicRelation(name="fair", feature="gender", tolerance=0.01)])
+
+    assert (report.n_pairs, report.violations, report.examples) == (3, 2, [1, 2])
+    assert encode_inputs(cases, FEATURES)[1][1].tolist() == [50.0, 70.0, 1.0]
+
+
+def test_invalid_relations():
+    """Test relations on unknown features or without their transform value are rejected."""
+    tester = MetamorphicTester(ScoringModel(), FEATURES)
+
+    with pytest.raises(ValueError, match="unknown feature"):
+        tester.run(_population(10), [MetamorphicRelation(name="r", feature="zip")])
+    with pytest.raises(ValueError, match="needs a value"):
+        tester.run(_population(10), [MetamorphicRelation(name="r", feature="age", transform="shift")])
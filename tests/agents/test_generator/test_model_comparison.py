@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from ai_api_testing.agents.test_generator_agents.executor import Executor
+from ai_api_testing.agents.test_generator_agents.orchestrator import AgentResult, AgentStatus
+
+
+class ThresholdModel:
+    """Class 1 above `cut`, recording the calls and the inputs it receives."""
+
+    def __init__(self, cut: float):
+        self.cut = cut
+        self.inputs = []
+
+    def predict(self, x):
+        self.inputs.append(x)
+        return (x[:, 0] > self.cut).astype(int)
+
+    def predict_proba(self, x):
+        p = np.clip(x[:, 0] / 10, 0, 1)
+        p = np.where(x[:, 0] > self.cut, np.maximum(p, 0.5), p)
+        return np.column_stack([1 - p, p])
+
+
+@pytest.fixture
+def make_case(make_test_case):
+    """Case with one input row per value of `x`."""
+    return lambda name, values: make_test_case([{"x": value} for value in values], name)
+
+
+def test_compare_champion_and_challengers(make_case):
+    """Test every model runs on the same matrix and the divergence is reported per row and family."""
+    champion, challenger, identical = ThresholdModel(5), ThresholdModel(3), ThresholdModel(5)
+    results = {
+        "young": AgentResult(status=AgentStatus.COMPLETED, data=[make_case("a", [1, 4]), make_case("b", [8])]),
+        "old": [make_case("c", [2, 9, 4.5])],
+    }
+
+    report = Executor().compare(
+        results, {"prod": champion, "candidate": challenger, "copy": identical}, predict_proba=True, batch_size=3
+    )
+
+    assert len(champion.inputs) == len(challenger.inputs) == 2
+    assert np.array_equal(np.concatenate(champion.inputs), np.concatenate(challenger.inputs))
+    assert report.rows["family"].tolist() == ["young", "young", "young", "old", "old", "old"]
+    assert report.rows["disagrees_candidate"].tolist() == [False, True, False, False, False, True]
+    assert report.disagreement_rate("candidate") == pytest.approx(2 / 6)
+    assert report.disagreement_rate("copy") == 0
+    assert report.rows["probability_delta_candidate"][1] == pytest.approx(0.1)
+
+    families = report.families
+    assert families["model"].tolist() == ["candidate", "candidate", "copy", "copy"]
+    assert families["family"].tolist() == ["old", "young", "old", "young"]
+    assert families["disagreement_rate"].tolist() == pytest.approx([1 / 3, 1 / 3, 0, 0])
+    assert families["max_abs_probability_delta"][:2].tolist() == pytest.approx([0.05, 0.1])
+
+
+def test_compare_unknown_baseline(make_case):
+    """Test the baseline must be one of the compared models."""
+    with pytest.raises(ValueError, match="Baseline"):
+        Executor().compare([make_case("a", [1])], {"prod": ThresholdModel(5)}, baseline="other")
@@ -0,0 +1,90 @@
+import asyncio
+import json
+
+from aiounittest import AsyncTestCase
+from pydantic import BaseModel
+
+from ai_api_testing.agents.test_generator_agents.orchestrator import AgentOrchestrator, AgentStatus
+from pydantic_ai import Agent
+from pydantic_ai.models.function import DeltaToolCall, FunctionModel
+
+
+class Item(BaseModel):
+    """Minimal structured item streamed by the fake agents."""
+
+    name: str
+
+
+def _streaming_agent(name: str, items: list[str], events: list[str]) -> Agent:
+    """Agent whose model streams a list result in small JSON chunks."""
+
+    async def stream_function(messages, agent_info):
+        payload = json.dumps({"response": [{"name": item} for item in items]})
+        chunk_size = 8
+        events.append(f"{name}:start")
+        yield {0: DeltaToolCall(name=agent_info.result_tools[0].name)}
+        for i in range(0, len(payload), chunk_size):
+            yield {0: DeltaToolCall(json_args=payload[i : i + chunk_size])}
+            await asyncio.sleep(0)
+        events.append(f"{name}:end")
+
+    return Agent(FunctionModel(stream_function=stream_function), name=name, result_type=list[Item])
+
+
+class TestAgentOrchestratorStreaming(AsyncTestCase):
+    """Test the streaming execution of the orchestrator."""
+
+    async def test_run_streaming_schedules_downstream_per_element(self):
+        """Test downstream agents start before the upstream stream is complete."""
+        events: list[str] = []
+        families = _streaming_agent("families", ["first family", "second family", "third family"], events)
+        cases = _streaming_agent("cases", ["case"], events)
+
+        orchestrator = AgentOrchestrator(
+            [(families, {"user_prompt": "families"}), (cases, {"user_prompt": "cases for: "})],
+            stream_debounce=None,
+        )
+        results = await orchestrator.run_streaming()
+
+        assert events.index("cases:start") < events.index("families:end")
+        assert [item.name for item in results["families"]["families_level_0_task_0"].data] == [
+            "first family",
+            "second family",
+            "third family",
+        ]
+        assert sorted(results["cases"]) == [f"families_level_1_task_0_subtask_{i}" for i in range(3)]
+        assert all(result.status == AgentStatus.COMPLETED for result in results["cases"].values())
+
+    async def test_run_streaming_cancels_downstream_on_upstream_failure(self):
+        """Test the downstream tasks already scheduled are cancelled and awaited when the upstream agent fails."""
+        events: list[str] = []
+
+        async def failing_stream(messages, agent_info):
+            yield {0: DeltaToolCall(name=agent_info.result_tools[0].name)}
+            yield {0: DeltaToolCall(json_args='{"response": [{"name": "first"}, {"name": "sec')}
+            # Let the downstream task of the first item start
+            for _ in range(10):
+                await asyncio.sleep(0)
+            raise RuntimeError("upstream failed")
+
+        async def hanging_stream(messages, agent_info):
+            events.append("cases:start")
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                events.append("cases:cancelled")
+                raise
+            yield {}
+
+        families = Agent(FunctionModel(stream_function=failing_stream), name="families", result_type=list[Item])
+        cases = Agent(FunctionModel(stream_function=hanging_stream), name="cases", result_type=list[Item])
+        orchestrator = AgentOrchestrator(
+            [(families, {"user_prompt": "families"}), (cases, {"user_prompt": "cases for: "})],
+            stream_debounce=None,
+        )
+
+        with self.assertRaises(RuntimeError):
+            await orchestrator.run_streaming()
+
+        self.assertEqual(events, ["cases:start", "cases:cancelled"])
+        self.assertEqual(asyncio.all_tasks() - {asyncio.current_task()}, set())
@@ -0,0 +1,124 @@
+import math
+from statistics import NormalDist
+
+import numpy as np
+import pytest
+
+from ai_api_testing.agents.test_generator_agents.sampler import FeatureSpec, PopulationSampler, norm_cdf, norm_ppf
+from ai_api_testing.core import models
+
+# Statistics in the format of a polars `describe()`, and a plain range like `get_feature_ranges`
+FEATURE_STATS = {
+    "petal length (cm)": {
+        "count": 150,
+        "mean": 3.76,
+        "std": 1.76,
+        "min": 1.0,
+        "25%": 1.6,
+        "50%": 4.35,
+        "75%": 5.1,
+        "max": 6.9,
+    },
+    "petal width (cm)": {"min": 0.1, "max": 2.5},
+    "species": {"count": 150, "min": "setosa", "max": "virginica"},
+}
+
+
+def test_normal_approximations():
+    """Test the vectorized normal CDF and inverse CDF against the standard library."""
+    x = np.linspace(-6, 6, 101)
+    p = np.array([1e-12, 1e-6, 0.01, 0.3, 0.5, 0.9, 0.999999])
+
+    assert np.allclose(norm_cdf(x), [0.5 * (1 + math.erf(v / math.sqrt(2))) for v in x], atol=2e-7)
+    assert np.allclose(norm_ppf(p), [NormalDist().inv_cdf(v) for v in p], rtol=1e-8)
+
+
+def test_latin_hypercube_and_marginals():
+    """Test each feature has one sample per equal-probability bin and stays within its range."""
+    sampler = PopulationSampler.from_stats(FEATURE_STATS, seed=0)
+    n = 10_000
+
+    x = sampler.sample(n, design="lhs")
+
+    assert sampler.names == ["petal length (cm)", "petal width (cm)"]
+    assert x.shape == (n, 2)
+    width = x[:, 1]
+    assert (width >= 0.1).all() and (width <= 2.5).all()
+    assert np.array_equal(np.sort(np.floor((width - 0.1) / 2.4 * n)), np.arange(n))
+    # Quantiles of the described feature are reproduced
+    assert np.quantile(x[:, 0], [0.25, 0.5, 0.75]) == pytest.approx([1.6, 4.35, 5.1], abs=0.01)
+
+
+def test_stratified_and_boundary_designs():
+    """Test the stratified design balances the bins and the boundary one concentrates on the edges."""
+    sampler = PopulationSampler.from_stats({"x": {"min": 0, "max": 100}}, seed=1)
+
+    stratified = sampler.sample(1000, design="stratified", strata=4)
+    assert np.bincount((stratified[:, 0] // 25).astype(int), minlength=4).tolist() == [250] * 4
+
+    boundary = sampler.sample(10_000, design="boundary", boundary_fraction=0.8, margin=0.01)[:, 0]
+    assert ((boundary <= 1) | (boundary >= 99)).mean() == pytest.approx(0.8 + 0.2 * 0.02, abs=0.02)
+
+
+def test_gaussian_copula_correlation():
+    """Test the target correlation is imposed while keeping the marginals."""
+    sampler = PopulationSampler.from_stats(
+        {"a": {"min": 0, "max": 1}, "b": {"min": 0, "max": 1}}, correlation={("a", "b"): 0.8}, seed=2
+    )
+
+    x = sampler.sample(20_000, design="lhs")
+
+    ranks = x.argsort(axis=0).argsort(axis=0)
+    assert np.corrcoef(ranks.T)[0, 1] == pytest.approx(0.79, abs=0.03)
+    assert np.histogram(x[:, 0], bins=10, range=(0, 1))[0] == pytest.approx([2000] * 10, rel=0.1)
+    with pytest.raises(ValueError):
+        PopulationSampler.from_stats(
+            {"a": {"min": 0, "max": 1}, "b": {"min": 0, "max": 1}}, correlation=[[1, 2], [2, 1]]
+        )
+
+
+def test_sample_family():
+    """Test the sampling parameters of an LLM generated family drive the sampler."""
+    family = models.TestCaseFami(
+        name="Short petals",
+        description="Flowers with short petals",
+        test_case_type="edge",
+        test_variations=[],
+        sampling=models.SamplingParams(design="random", n_samples=50, feature_ranges={"petal length (cm)": (1.0, 1.5)}),
+    )
+    sampler = PopulationSampler.from_stats(FEATURE_STATS, seed=3)
+
+    x = sampler.sample_family(family)
+    cases = list(sampler.iter_test_cases(x, family))
+
+    assert x.shape == (50, 2)
+    assert (x[:, 0] <= 1.5).all()
+    assert cases[0].input_json == dict(zip(sampler.names, x[0].tolist()))
+
+
+def test_narrowed_range_is_a_truncated_normal():
+    """Test narrowing a normal feature samples the normal within the new range, not its clipped edges."""
+    feature = FeatureSpec(name="x", low=0.0, high=10.0, mean=5.0, std=1.0)
+    sampler = PopulationSampler([feature], seed=4)
+
+    x = sampler.sample(10_000, design="random", feature_ranges={"x": (6.0, 6.5)})[:, 0]
+
+    assert (x >= 6.0).all() and (x <= 6.5).all()
+    assert (x == 6.5).mean() == 0
+    normal = NormalDist(5.0, 1.0)
+    expected = (normal.cdf(6.25) - normal.cdf(6.0)) / (normal.cdf(6.5) - normal.cdf(6.0))
+    assert (x < 6.25).mean() == pytest.approx(expected, abs=0.02)
+    narrowed = feature.model_copy(update={"low": 6.0, "high": 6.5})
+    assert narrowed.cdf(narrowed.ppf(np.array([0.1, 0.5, 0.9]))) == pytest.approx([0.1, 0.5, 0.9], abs=1e-6)
+
+
+def test_integer_features_from_dtype():
+    """Test features with an integer dtype are sampled as integers."""
+    sampler = PopulationSampler.from_stats(
+        {"children": {"min": 0, "max": 4, "dtype": "Int64"}, "income": {"min": 0, "max": 4, "dtype": "Float64"}}, seed=5
+    )
+
+    x = sampler.sample(100)
+
+    assert [feature.integer for feature in sampler.features] == [True, False]
+    assert np.array_equal(x[:, 0], np.rint(x[:, 0])) and not np.array_equal(x[:, 1], np.rint(x[:, 1]))
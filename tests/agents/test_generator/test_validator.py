@@ -0,0 +1,185 @@
+import pytest
+
+from ai_api_testing.agents.api_specs_agents.base_extractor import APIEndpoint
+from ai_api_testing.agents.api_specs_agents.lazy_spec import load_lazy_json
+from ai_api_testing.agents.api_specs_agents.swagger_extractor import SwaggerExtractor
+from ai_api_testing.agents.test_generator_agents import validator
+from ai_api_testing.agents.test_generator_agents.validator import CaseValidator, LRUCache, compile_schema
+
+
+@pytest.fixture
+def pet_endpoint():
+    """Endpoint with required fields, nested objects and enums."""
+    return APIEndpoint(
+        path="/pets",
+        method="POST",
+        request_body={
+            "type": "object",
+            "required": ["name", "age"],
+            "properties": {
+                "name": {"type": "string", "minLength": 1},
+                "age": {"type": "integer", "minimum": 0},
+                "status": {"type": "string", "enum": ["available", "sold"]},
+                "owner": {"$ref": "#/components/schemas/Owner"},
+            },
+        },
+    )
+
+
+@pytest.fixture
+def root_spec():
+    """Spec holding the components referenced by the endpoint."""
+    return {
+        "components": {
+            "schemas": {
+                "Owner": {
+                    "type": "object",
+                    "required": ["email"],
+                    "properties": {
+                        "email": {"type": "string"},
+                        "friends": {"type": "array", "items": {"$ref": "#/components/schemas/Owner"}},
+                    },
+                }
+            }
+        }
+    }
+
+
+@pytest.fixture
+def make_case(make_test_case):
+    """Case targeting the pet endpoint by default."""
+    return lambda input_json, path="/pets", method="POST": make_test_case(input_json, path=path, method=method)
+
+
+def test_compile_schema_is_cached_by_content():
+    """Test that identical schemas share a single compiled validator."""
+    first = compile_schema({"type": "object", "properties": {"a": {"type": "integer"}}})
+    second = compile_schema({"properties": {"a": {"type": "integer"}}, "type": "object"})
+
+    assert first is second
+    assert first.is_valid({"a": 1})
+    assert not first.is_valid({"a": "1"})
+    assert not first.is_valid({"a": True})
+
+
+def test_compile_schema_is_cached_by_root_content():
+    """Test lazily loaded roots are keyed by their content, and the cache stays bounded."""
+    schema = {"$ref": "#/components/schemas/A"}
+    as_int = load_lazy_json('{"components": {"schemas": {"A": {"type": "integer"}}}}')
+    as_str = load_lazy_json('{"components": {"schemas": {"A": {"type": "string"}}}}')
+
+    assert compile_schema(schema, as_int).is_valid(1)
+    assert compile_schema(schema, as_str).is_valid("1")
+    assert compile_schema(schema, as_int) is compile_schema(schema, load_lazy_json(as_int.source))
+
+    cache = LRUCache(maxsize=2)
+    for key in "abc":
+        cache.put(key, key)
+    assert len(cache) == 2 and cache.get("a") is None and cache.get("c") == "c"
+
+
+def test_case_validator_hashes_the_root_once(monkeypatch, pet_endpoint, root_spec):
+    """Test the root document is hashed once for all the endpoints of a validator."""
+    calls = []
+    document_hash = validator.document_hash
+    monkeypatch.setattr(validator, "document_hash", lambda root: calls.append(root) or document_hash(root))
+
+    CaseValidator(endpoints=[pet_endpoint, pet_endpoint.model_copy(update={"path": "/other"})], root_spec=root_spec)
+
+    assert len(calls) == 1
+
+
+def test_validator_tags_invalid_cases(pet_endpoint, root_spec, make_case):
+    """Test required fields, types, bounds, enums and resolved references."""
+    validator = CaseValidator(endpoints=[pet_endpoint], root_spec=root_spec)
+
+    valid = validator.check(
+        make_case({"name": "Rex", "age": 3, "owner": {"email": "a@b.c", "friends": [{"email": "x"}]}})
+    )
+    assert valid.valid
+    assert valid.errors == []
+
+    invalid = validator.check(make_case({"name": "", "age": -1, "status": "lost", "owner": {"friends": [{}]}}))
+    assert not invalid.valid
+    assert "$.name: length 0 is below the minimum 1" in invalid.errors
+    assert "$.age: value -1 is below the minimum 0" in invalid.errors
+    assert any(e.startswith("$.status:") for e in invalid.errors)
+    assert "$.owner: missing required field 'email'" in invalid.errors
+    assert "$.owner.friends[0]: missing required field 'email'" in invalid.errors
+
+    missing = validator.check(make_case({"name": "Rex"}))
+    assert missing.errors == ["$: missing required field 'age'"]
+
+
+def test_validator_handles_unknown_endpoints_and_swagger_params(make_case):
+    """Test unknown endpoints are rejected and per-property `required` flags are honoured."""
+    endpoint = APIEndpoint(
+        path="/pets",
+        method="GET",
+        request_body={
+            "type": "object",
+            "properties": {"status": {"type": "string", "description": "", "required": True}},
+        },
+    )
+    validator = CaseValidator(endpoints=[endpoint])
+
+    assert validator.check(make_case({"status": "sold"}, method="get")).valid
+    assert not validator.check(make_case({}, method="GET")).valid
+    assert not validator.check(make_case({"status": "sold"}, path="/owners", method="GET")).valid
+
+
+def test_filter_valid_streams(pet_endpoint, root_spec, make_case):
+    """Test filtering a stream of test cases lazily."""
+    validator = CaseValidator(endpoints=[pet_endpoint], root_spec=root_spec)
+    cases = (make_case({"name": "Rex", "age": i - 1}) for i in range(3))
+
+    valid = list(validator.filter_valid(cases))
+
+    assert [case.input_json["age"] for case in valid] == [0, 1]
+
+
+def test_validator_matches_path_templates(make_case):
+    """Test cases targeting concrete paths are validated against their path template."""
+    endpoint = APIEndpoint(
+        path="/pets/{petId}",
+        method="PUT",
+        request_body={"type": "object", "required": ["name"], "properties": {"name": {"type": "string"}}},
+    )
+    validator = CaseValidator(endpoints=[endpoint])
+
+    assert validator.check(make_case({"name": "Rex"}, path="/pets/42", method="PUT")).valid
+    assert validator.check(make_case({}, path="/pets/42", method="PUT")).errors == ["$: missing required field 'name'"]
+    assert not validator.check(make_case({"name": "Rex"}, path="/pets/42", method="GET")).valid
+    assert list(validator.filter_valid([make_case({"name": "Rex"}, path="/pets/7", method="PUT")]))
+
+
+def test_validator_from_extracted_recursive_schema(make_case):
+    """Test the bodies extracted from a self-referencing schema compile without the spec they came from."""
+    extractor = SwaggerExtractor()
+    extractor._spec = {
+        "openapi": "3.0.0",
+        "paths": {
+            "/trees": {
+                "post": {
+                    "requestBody": {"content": {"application/json": {"schema": {"$ref": "#/components/schemas/Tree"}}}}
+                }
+            }
+        },
+        "components": {
+            "schemas": {
+                "Tree": {
+                    "type": "object",
+                    "required": ["name"],
+                    "properties": {
+                        "name": {"type": "string"},
+                        "children": {"type": "array", "items": {"$ref": "#/components/schemas/Tree"}},
+                    },
+                }
+            }
+        },
+    }
+
+    validator = CaseValidator(endpoints=extractor._parse_spec())
+
+    assert validator.check(make_case({"name": "root", "children": [{"name": "leaf"}]}, path="/trees")).valid
+    assert not validator.check(make_case({"children": []}, path="/trees")).valid
@@ -0,0 +1,45 @@
+import json
+import os
+import subprocess
+import sys
+
+import yaml
+from typer.testing import CliRunner
+
+from ai_api_testing.cli.main import app
+
+runner = CliRunner()
+
+
+def test_specs_bulk_command(tmp_path, monkeypatch):
+    """Test the bulk command extracts local specs without any LLM credentials."""
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    spec_path = tmp_path / "openapi.yaml"
+    spec_path.write_text(yaml.safe_dump({"openapi": "3.0.0", "paths": {"/pets": {"get": {}, "post": {}}}}))
+    sources = tmp_path / "services.txt"
+    sources.write_text(f"{spec_path}\n")
+    output = tmp_path / "endpoints.jsonl"
+    report = tmp_path / "report.json"
+
+    result = runner.invoke(
+        app, ["specs", "bulk", str(sources), "--output", str(output), "--report", str(report), "--no-cache"]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert [json.loads(line)["method"] for line in output.read_text().splitlines()] == ["GET", "POST"]
+    assert json.loads(report.read_text())[0]["endpoints"] == 2
+
+
+def test_imports_stay_light():
+    """Test the CLI and executor modules import without credentials nor the heavy dependencies."""
+    code = (
+        "import json, sys;"
+        "import ai_api_testing.cli.main, ai_api_testing.agents.test_generator_agents.executor;"
+        "print(json.dumps(sorted(m for m in ('pydantic_ai', 'fastapi', 'aiohttp', 'openai', 'playwright') "
+        "if m in sys.modules)))"
+    )
+    env = {key: value for key, value in os.environ.items() if key != "OPENAI_API_KEY"}
+
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env, check=True)
+
+    assert json.loads(result.stdout) == []
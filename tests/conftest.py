@@ -0,0 +1,31 @@
+from typing import Any
+
+import pytest
+
+from ai_api_testing.core import models
+
+
+def _make_test_case(
+    input_json: dict[str, Any] | list[dict[str, Any]] | None = None,
+    name: str = "case",
+    path: str = "/predict",
+    method: str = "POST",
+    expected_output_json: dict[str, Any] | list[dict[str, Any]] | None = None,
+    expected_output_prompt: str | None = None,
+) -> models.TestCase:
+    return models.TestCase(
+        name=name,
+        description="",
+        path=path,
+        method=method,
+        input_json=input_json,
+        expected_output_prompt=expected_output_prompt,
+        expected_output_json=expected_output_json,
+        preconditions=None,
+    )
+
+
+@pytest.fixture
+def make_test_case():
+    """Factory of test cases, only the fields a test cares about need to be given."""
+    return _make_test_case
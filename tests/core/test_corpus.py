@@ -0,0 +1,64 @@
+import pytest
+
+from ai_api_testing.core import corpus
+
+
+@pytest.fixture
+def make_case(make_test_case):
+    """Case `i`, expecting the class `i % 2`."""
+    return lambda i, path="/predict", method="POST": make_test_case(
+        {"x": i}, f"case {i}", path, method, expected_output_json={"class": i % 2}
+    )
+
+
+def test_append_reopen_and_select(tmp_path, make_case):
+    """Test appended cases are read back lazily and selected by endpoint, family and persona."""
+    with corpus.TestCaseCorpus(tmp_path / "corpus", mode="a") as writer:
+        writer.extend((make_case(i) for i in range(5)), family="young", persona="analyst", flush_every=2)
+        writer.extend([make_case(5, "/health", "get"), make_case(6)], family="old")
+        assert writer.append(make_case(7), persona="analyst") == 7
+
+    reader = corpus.TestCaseCorpus(tmp_path / "corpus")
+
+    assert len(reader) == 8
+    assert reader[5].path == "/health" and reader[-1].name == "case 7"
+    assert reader.raw(0).startswith(b'{"name":"case 0"')
+    assert [case.name for case in reader.iter_cases(reader.select(family="old"))] == ["case 5", "case 6"]
+    assert reader.select(method="GET").tolist() == [5]
+    assert reader.select(path="/predict", persona="analyst").tolist() == [0, 1, 2, 3, 4, 7]
+    assert reader.select(family="missing").tolist() == []
+    assert reader.counts("family") == {"young": 5, "old": 2, None: 1}
+    assert reader.keys(5) == {"endpoint": "GET /health", "family": "old", "persona": None}
+    with pytest.raises(IndexError):
+        reader.raw(8)
+    with pytest.raises(ValueError, match="not open for appending"):
+        reader.append(make_case(8))
+
+
+def test_reader_refresh_and_interrupted_write(tmp_path, make_case):
+    """Test readers see later flushes after a refresh and trailing partial writes are dropped."""
+    writer = corpus.TestCaseCorpus(tmp_path, mode="a")
+    writer.extend(make_case(i) for i in range(3))
+    writer.flush()
+    reader = corpus.TestCaseCorpus(tmp_path)
+    writer.extend([make_case(3, "/other")], family="new")
+    writer.close()
+
+    assert len(reader) == 3
+    reader.refresh()
+    assert len(reader) == 4 and reader.select(family="new").tolist() == [3]
+
+    # A record written without its offset, as after a crash
+    with open(tmp_path / corpus.RECORDS_FILE, "ab") as f:
+        f.write(b'{"name": "partial')
+    with corpus.TestCaseCorpus(tmp_path, mode="a") as appender:
+        appender.append(make_case(4))
+
+    reopened = corpus.TestCaseCorpus(tmp_path)
+    assert [case.name for case in reopened] == ["case 0", "case 1", "case 2", "case 3", "case 4"]
+
+
+def test_missing_corpus(tmp_path):
+    """Test opening a directory without a corpus for reading fails."""
+    with pytest.raises(ValueError, match="No test case corpus"):
+        corpus.TestCaseCorpus(tmp_path)
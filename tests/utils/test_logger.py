@@ -1,6 +1,9 @@
+import io
+import json
+
 from loguru import logger
 
-from ai_api_testing.utils.logger import app_logger
+from ai_api_testing.utils.logger import RecordFilter, app_logger, configure_logging, logging_options_from_env
 
 
 def test_logger():
@@ -17,3 +20,57 @@ def test_logger():
 
     assert len(log_messages) == 4
     assert "Last debug message" in log_messages[-1]
+
+
+def test_module_levels_and_sampling():
+    """Test records are gated by their module level and per call site sampling."""
+    record_filter = RecordFilter(
+        "INFO", {"ai_api_testing.agents": "WARNING", "ai_api_testing.agents.executor": "DEBUG"}, sample_every=3
+    )
+
+    def record(name: str, level: str, line: int = 1) -> dict:
+        return {"name": name, "level": logger.level(level), "line": line}
+
+    assert not record_filter(record("ai_api_testing.agents.orchestrator", "INFO"))
+    assert record_filter(record("ai_api_testing.agents.orchestrator", "ERROR"))
+    assert record_filter(record("ai_api_testing.agents.executor", "DEBUG"))
+    assert not record_filter(record("ai_api_testing.cli", "DEBUG"))
+    assert record_filter.min_level_no == logger.level("DEBUG").no
+
+    kept = [record_filter(record("ai_api_testing.cli", "INFO", line=7)) for _ in range(7)]
+    assert kept == [True, False, False, True, False, False, True]
+    assert all(record_filter(record("ai_api_testing.cli", "WARNING", line=8)) for _ in range(3))
+
+
+def test_json_enqueued_logging():
+    """Test the structured mode writes JSON records from a background thread."""
+    stream = io.StringIO()
+    try:
+        configure_logging(serialize=True, enqueue=True, sink=stream)
+        logger.info("Completed task: {}", "task_0")
+        logger.debug("Hidden")
+        logger.complete()
+    finally:
+        configure_logging()
+
+    records = [json.loads(line)["record"] for line in stream.getvalue().splitlines()]
+    assert [r["message"] for r in records] == ["Completed task: task_0"]
+    assert records[0]["level"]["name"] == "INFO"
+
+
+def test_logging_options_from_env():
+    """Test the logging mode is read from environment variables."""
+    environ = {
+        "AI_API_TESTING_LOG_LEVEL": "debug",
+        "AI_API_TESTING_LOG_JSON": "1",
+        "AI_API_TESTING_LOG_SAMPLE_EVERY": "100",
+        "AI_API_TESTING_LOG_MODULES": "ai_api_testing.agents=warning, ai_api_testing.cli=ERROR",
+    }
+
+    assert logging_options_from_env(environ) == {
+        "level": "DEBUG",
+        "serialize": True,
+        "sample_every": 100,
+        "module_levels": {"ai_api_testing.agents": "WARNING", "ai_api_testing.cli": "ERROR"},
+    }
+    assert logging_options_from_env({}) == {}
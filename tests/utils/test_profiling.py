@@ -0,0 +1,79 @@
+import asyncio
+import json
+import tracemalloc
+
+import pytest
+from typer.testing import CliRunner
+
+from ai_api_testing.cli.main import app
+from ai_api_testing.utils import profiling
+from ai_api_testing.utils.profiling import Profiler, profile_region
+
+
+@profile_region("sync")
+def _work(n: int) -> int:
+    return sum(range(n))
+
+
+@profile_region("async")
+async def _async_work() -> int:
+    await asyncio.sleep(0.01)
+    return _work(10)
+
+
+async def _main() -> list[int]:
+    return await asyncio.gather(_async_work(), _async_work())
+
+
+def test_regions_are_only_recorded_while_profiling(tmp_path):
+    """Test annotated regions are timed under a profiler and left alone otherwise."""
+    _work(10)
+    assert profiling._regions is None
+
+    profiler = Profiler(tmp_path / "run.prof", top=5)
+    profiler.start()
+    with profile_region("block"):
+        _work(1000)
+    assert asyncio.run(_main()) == [45, 45]
+    report = profiler.stop()
+
+    counts = {region["name"]: region["count"] for region in report["regions"]}
+    assert counts == {"block": 1, "sync": 3, "async": 2}
+    assert {task["name"] for task in report["tasks"]} >= {"_main", "_async_work"}
+    assert report["peak_memory_mb"] > 0 and report["traced_memory_mb"] is None
+    assert len(report["functions"]) == 5
+    assert (tmp_path / "run.prof").exists()
+    assert json.loads((tmp_path / "run.json").read_text())["regions"] == report["regions"]
+    assert profiling._regions is None and profiling._tasks is None
+
+
+def test_traced_memory_is_opt_in(tmp_path):
+    """Test the Python allocations are only traced on request."""
+    profiler = Profiler(tmp_path / "run.prof", trace_memory=True)
+    profiler.start()
+    assert tracemalloc.is_tracing()
+    blocks = [bytes(2**20) for _ in range(4)]
+    report = profiler.stop()
+
+    assert len(blocks) == 4 and report["traced_memory_mb"] >= 4
+    assert not tracemalloc.is_tracing()
+
+
+def test_decorated_functions_skip_the_region_without_profiler(monkeypatch):
+    """Test decorated functions do not even enter their region when no profiler runs."""
+    monkeypatch.setattr(profiling._Region, "__enter__", lambda self: pytest.fail("region entered"))
+
+    assert _work(10) == 45
+    assert asyncio.run(_async_work()) == 45
+
+
+def test_cli_profile_option(tmp_path):
+    """Test the global --profile option writes the profile and the report of the command."""
+    output = tmp_path / "ping.prof"
+
+    result = CliRunner().invoke(app, ["--profile", str(output), "--profile-top", "3", "--profile-memory", "ping"])
+
+    assert result.exit_code == 0, result.output
+    assert output.exists()
+    report = json.loads(output.with_suffix(".json").read_text())
+    assert len(report["functions"]) == 3 and report["traced_memory_mb"] is not None